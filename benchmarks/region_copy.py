@@ -0,0 +1,71 @@
+import time
+
+import numpy as np
+
+from d3dshot.capture_output import CaptureOutput, CaptureOutputs
+
+WIDTH = 3840
+HEIGHT = 2160
+PITCH = (WIDTH + 64) * 4
+
+REGIONS = [
+    (0, 0, 300, 200),
+    (1000, 500, 1640, 980),
+    (0, 0, 1920, 1080),
+    (0, 0, WIDTH, HEIGHT),
+]
+
+ITERATIONS = 100
+
+
+def full_copy_then_crop(capture_output):
+    # Previous behavior: convert the whole surface, then crop the region out of it
+    def process(pointer, pitch, size, width, height, region, rotation):
+        image = capture_output.process(
+            pointer, pitch, size, width, height, (0, 0, width, height), rotation
+        )
+
+        if isinstance(image, np.ndarray):
+            return image[region[1] : region[3], region[0] : region[2], :]
+
+        return image.crop(region)
+
+    return process
+
+
+def measure(process_func, pointer, region):
+    start_time = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        process_func(pointer, PITCH, PITCH * HEIGHT, WIDTH, HEIGHT, region, 0)
+
+    return (time.perf_counter() - start_time) / ITERATIONS * 1000
+
+
+def main():
+    surface = np.random.randint(0, 256, size=(PITCH * HEIGHT,), dtype=np.uint8)
+    pointer = surface.ctypes.data
+
+    print(f"Surface: {WIDTH}x{HEIGHT} (pitch: {PITCH} bytes)")
+    print("")
+
+    for capture_output_name in ["numpy", "pil"]:
+        capture_output = CaptureOutput(
+            backend=getattr(CaptureOutputs, capture_output_name.upper())
+        )
+
+        for region in REGIONS:
+            full_copy_time = measure(full_copy_then_crop(capture_output), pointer, region)
+            region_copy_time = measure(capture_output.process, pointer, region)
+
+            print(
+                f"{capture_output_name:<6} {region[2] - region[0]:>4}x{region[3] - region[1]:<4} "
+                f"full copy: {full_copy_time:8.3f} ms  region copy: {region_copy_time:8.3f} ms  "
+                f"({full_copy_time / region_copy_time:.1f}x)"
+            )
+
+        print("")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+
+from PIL import Image
+
+from d3dshot.capture_output import CaptureOutput, CaptureOutputs
+from d3dshot.resize import Resize
+
+WIDTH = 3840
+HEIGHT = 2160
+PITCH = (WIDTH + 64) * 4
+
+RESIZES = [
+    Resize(scale=0.5, method="nearest"),
+    Resize(scale=0.5, method="area"),
+    Resize(scale=0.5, method="bilinear"),
+    Resize(size=(224, 224), method="area"),
+]
+
+ITERATIONS = 20
+
+
+def full_resolution_then_resize(capture_output, resize):
+    # Previous behavior: convert the whole region at native resolution, then resize in user code
+    resample = {"nearest": Image.NEAREST, "area": Image.BOX, "bilinear": Image.BILINEAR}
+
+    def process(pointer, pitch, size, width, height, region, rotation):
+        image = capture_output.process(pointer, pitch, size, width, height, region, rotation)
+
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+
+        return image.resize(
+            resize.get_size(image.width, image.height), resample=resample[resize.method]
+        )
+
+    return process
+
+
+def measure(process_func, pointer):
+    start_time = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        process_func(pointer, PITCH, PITCH * HEIGHT, WIDTH, HEIGHT, (0, 0, WIDTH, HEIGHT), 0)
+
+    return (time.perf_counter() - start_time) / ITERATIONS * 1000
+
+
+def main():
+    surface = np.random.randint(0, 256, size=(PITCH * HEIGHT,), dtype=np.uint8)
+    pointer = surface.ctypes.data
+
+    print(f"Surface: {WIDTH}x{HEIGHT} (pitch: {PITCH} bytes)")
+    print("")
+
+    for capture_output_name in ["numpy", "pil"]:
+        backend = getattr(CaptureOutputs, capture_output_name.upper())
+
+        capture_output = CaptureOutput(backend=backend)
+        native_time = measure(capture_output.process, pointer)
+
+        print(f"{capture_output_name:<6} native resolution: {native_time:8.3f} ms")
+
+        for resize in RESIZES:
+            resizing_capture_output = CaptureOutput(backend=backend, resize=resize)
+
+            resize_after_time = measure(
+                full_resolution_then_resize(capture_output, resize), pointer
+            )
+            resize_on_capture_time = measure(resizing_capture_output.process, pointer)
+
+            print(
+                f"{capture_output_name:<6} {str(resize):<36} "
+                f"resize after: {resize_after_time:8.3f} ms  on capture: {resize_on_capture_time:8.3f} ms  "
+                f"({resize_after_time / resize_on_capture_time:.1f}x)"
+            )
+
+        print("")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import ctypes
+import time
+
+import numpy as np
+
+from d3dshot.capture_output import CaptureOutput, CaptureOutputs
+from d3dshot.surface import get_address, get_surface_span
+
+# Unrotated surface; Displays rotated by 90 or 270 degrees are HEIGHT x WIDTH
+WIDTH = 3840
+HEIGHT = 2160
+PITCH = (WIDTH + 64) * 4
+
+ROTATIONS = [0, 90, 180, 270]
+
+ITERATIONS = 20
+
+
+def copy_then_rotate():
+    # Previous PyTorch behavior: copy the rows, fancy-index the channel swap, then copy again
+    # through np.rot90 for rotated displays
+    import torch
+
+    def process(pointer, pitch, size, width, height, region, rotation, out=None):
+        span = get_surface_span(pitch, width, height, region, rotation)
+
+        image = np.empty((span.size,), dtype=np.uint8)
+        ctypes.memmove(image.ctypes.data, get_address(pointer) + span.offset, span.size)
+
+        image = np.reshape(image, (span.rows, pitch // 4, 4))
+        image = image[:, span.column : span.column + span.columns, [2, 1, 0]]
+
+        if rotation == 90:
+            image = np.rot90(image, axes=(1, 0)).copy()
+        elif rotation == 180:
+            image = np.rot90(image, k=2, axes=(0, 1)).copy()
+        elif rotation == 270:
+            image = np.rot90(image, axes=(0, 1)).copy()
+
+        return torch.from_numpy(image)
+
+    return process
+
+
+def measure(process_func, pointer, rotation):
+    if rotation in (0, 180):
+        width, height = WIDTH, HEIGHT
+    else:
+        width, height = HEIGHT, WIDTH
+
+    region = (0, 0, width, height)
+
+    # Frame buffer slot the capture outputs write into
+    out = process_func(pointer, PITCH, PITCH * HEIGHT, width, height, region, rotation)
+
+    if not hasattr(out, "shape"):
+        out = None
+
+    start_time = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        if out is None:
+            process_func(pointer, PITCH, PITCH * HEIGHT, width, height, region, rotation)
+        else:
+            process_func(pointer, PITCH, PITCH * HEIGHT, width, height, region, rotation, out=out)
+
+    return (time.perf_counter() - start_time) / ITERATIONS * 1000
+
+
+def main():
+    surface = np.random.randint(0, 256, size=(PITCH * HEIGHT,), dtype=np.uint8)
+    pointer = surface.ctypes.data
+
+    print(f"Surface: {WIDTH}x{HEIGHT} (pitch: {PITCH} bytes)")
+    print("")
+
+    for capture_output_name in ["numpy", "pil", "pytorch"]:
+        try:
+            capture_output = CaptureOutput(
+                backend=getattr(CaptureOutputs, capture_output_name.upper())
+            )
+        except ImportError:
+            print(f"{capture_output_name:<7} not available")
+            print("")
+            continue
+
+        landscape_time = measure(capture_output.process, pointer, 0)
+
+        for rotation in ROTATIONS:
+            rotation_time = measure(capture_output.process, pointer, rotation)
+
+            line = (
+                f"{capture_output_name:<7} {rotation:>3} degrees: {rotation_time:8.3f} ms  "
+                f"({rotation_time / landscape_time:.2f}x landscape)"
+            )
+
+            if capture_output_name == "pytorch":
+                previous_time = measure(copy_then_rotate(), pointer, rotation)
+                line += f"  copy then rotate: {previous_time:8.3f} ms"
+
+            print(line)
+
+        print("")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,10 @@ import importlib.util
 
 from d3dshot.d3dshot import D3DShot
 from d3dshot.capture_output import CaptureOutputs
+from d3dshot.layout import Layout
+from d3dshot.memory_policy import MemoryPolicy
+from d3dshot.normalization import Normalization
+from d3dshot.resize import Resize
 
 
 pil_is_available = importlib.util.find_spec("PIL") is not None
@@ -27,6 +31,9 @@ capture_output_mapping = {
     "pytorch_float": CaptureOutputs.PYTORCH_FLOAT,
     "pytorch_gpu": CaptureOutputs.PYTORCH_GPU,
     "pytorch_float_gpu": CaptureOutputs.PYTORCH_FLOAT_GPU,
+    "pil_gray": CaptureOutputs.PIL_GRAY,
+    "numpy_gray": CaptureOutputs.NUMPY_GRAY,
+    "pytorch_gray": CaptureOutputs.PYTORCH_GRAY,
 }
 
 capture_outputs = [
@@ -37,6 +44,9 @@ capture_outputs = [
     "pytorch_float",
     "pytorch_gpu",
     "pytorch_float_gpu",
+    "pil_gray",
+    "numpy_gray",
+    "pytorch_gray",
 ]
 
 
@@ -49,10 +59,16 @@ def determine_available_capture_outputs():
     if numpy_is_available:
         available_capture_outputs.append(CaptureOutputs.NUMPY)
         available_capture_outputs.append(CaptureOutputs.NUMPY_FLOAT)
+        available_capture_outputs.append(CaptureOutputs.NUMPY_GRAY)
+
+        # Luma is computed by the NumPy kernel
+        if pil_is_available:
+            available_capture_outputs.append(CaptureOutputs.PIL_GRAY)
 
     if pytorch_is_available:
         available_capture_outputs.append(CaptureOutputs.PYTORCH)
         available_capture_outputs.append(CaptureOutputs.PYTORCH_FLOAT)
+        available_capture_outputs.append(CaptureOutputs.PYTORCH_GRAY)
 
     if pytorch_gpu_is_available:
         available_capture_outputs.append(CaptureOutputs.PYTORCH_GPU)
@@ -61,13 +77,32 @@ def determine_available_capture_outputs():
     return available_capture_outputs
 
 
-def create(capture_output="pil", frame_buffer_size=60):
+def create(
+    capture_output="pil",
+    frame_buffer_size=60,
+    resize=None,
+    scale=None,
+    resize_method="area",
+    float_dtype="float32",
+    mean=None,
+    std=None,
+    layout="hwc",
+    gray_dtype="uint8",
+):
     capture_output = _validate_capture_output(capture_output)
     frame_buffer_size = _validate_frame_buffer_size(frame_buffer_size)
+    resize = _validate_resize(resize, scale, resize_method)
+    normalization = _validate_normalization(capture_output, float_dtype, mean, std)
+    layout = _validate_layout(capture_output, layout)
+    gray_dtype = _validate_gray_dtype(capture_output, gray_dtype)
 
     d3dshot = D3DShot(
         capture_output=capture_output,
         frame_buffer_size=frame_buffer_size,
+        resize=resize,
+        normalization=normalization,
+        layout=layout,
+        gray_dtype=gray_dtype,
         pil_is_available=pil_is_available,
         numpy_is_available=numpy_is_available,
         pytorch_is_available=pytorch_is_available,
@@ -99,3 +134,70 @@ def _validate_frame_buffer_size(frame_buffer_size):
         raise AttributeError(f"'frame_buffer_size' should be an int greater than 0")
 
     return frame_buffer_size
+
+
+def _validate_resize(resize, scale, resize_method):
+    if isinstance(resize, Resize):
+        return resize
+
+    if resize is None and scale is None:
+        return None
+
+    return Resize(size=resize, scale=scale, method=resize_method)
+
+
+def _validate_normalization(capture_output, float_dtype, mean, std):
+    float_capture_outputs = [
+        CaptureOutputs.NUMPY_FLOAT,
+        CaptureOutputs.PYTORCH_FLOAT,
+        CaptureOutputs.PYTORCH_FLOAT_GPU,
+    ]
+
+    if capture_output not in float_capture_outputs:
+        if float_dtype != "float32" or mean is not None or std is not None:
+            raise AttributeError(
+                "'float_dtype', 'mean' and 'std' are only supported by the float capture outputs"
+            )
+
+        return None
+
+    return Normalization(dtype=float_dtype, mean=mean, std=std)
+
+
+def _validate_layout(capture_output, layout):
+    if not isinstance(layout, Layout):
+        layout = Layout(layout)
+
+    channel_capture_outputs = [
+        CaptureOutputs.NUMPY,
+        CaptureOutputs.NUMPY_FLOAT,
+        CaptureOutputs.PYTORCH,
+        CaptureOutputs.PYTORCH_FLOAT,
+        CaptureOutputs.PYTORCH_GPU,
+        CaptureOutputs.PYTORCH_FLOAT_GPU,
+    ]
+
+    if capture_output not in channel_capture_outputs and layout.name != "hwc":
+        raise AttributeError(
+            "'layout' is only supported by the NumPy and PyTorch RGB capture outputs"
+        )
+
+    return layout
+
+
+def _validate_gray_dtype(capture_output, gray_dtype):
+    gray_dtypes = ["uint8", "float32"]
+
+    if gray_dtype not in gray_dtypes:
+        raise AttributeError(
+            f"Invalid Gray Dtype '{gray_dtype}'. Available Options: {', '.join(gray_dtypes)}"
+        )
+
+    gray_capture_outputs = [CaptureOutputs.NUMPY_GRAY, CaptureOutputs.PYTORCH_GRAY]
+
+    if capture_output not in gray_capture_outputs and gray_dtype != "uint8":
+        raise AttributeError(
+            "'gray_dtype' is only supported by the NumPy and PyTorch gray capture outputs"
+        )
+
+    return gray_dtype
@@ -1,5 +1,8 @@
 import enum
 
+from d3dshot.layout import Layout
+from d3dshot.surface import intersect_rects
+
 
 class CaptureOutputs(enum.Enum):
     PIL = 0
@@ -9,6 +12,9 @@ class CaptureOutputs(enum.Enum):
     PYTORCH_FLOAT = 4
     PYTORCH_GPU = 5
     PYTORCH_FLOAT_GPU = 6
+    PIL_GRAY = 7
+    NUMPY_GRAY = 8
+    PYTORCH_GRAY = 9
 
 
 class CaptureOutputError(BaseException):
@@ -16,11 +22,62 @@ class CaptureOutputError(BaseException):
 
 
 class CaptureOutput:
-    def __init__(self, backend=CaptureOutputs.PIL):
+    def __init__(
+        self,
+        backend=CaptureOutputs.PIL,
+        resize=None,
+        normalization=None,
+        layout=None,
+        gray_dtype=None,
+    ):
+        # Resize instance applied to every frame by the backend, if any
+        self.resize = resize
+
+        # Normalization instance of the float backends. Their default one if None
+        self.normalization = normalization
+
+        # Layout instance of the frames of the NumPy and PyTorch RGB backends
+        self.layout = layout or Layout()
+
+        # Dtype of the frames of the NumPy and PyTorch gray backends; "uint8" or "float32"
+        self.gray_dtype = gray_dtype or "uint8"
+
         self.backend = self._initialize_backend(backend)
 
-    def process(self, pointer, pitch, size, width, height, region, rotation):
-        return self.backend.process(pointer, pitch, size, width, height, region, rotation)
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        return self.backend.process(pointer, pitch, size, width, height, region, rotation, out=out)
+
+    def process_regions(
+        self, regions, pointer, pitch, size, width, height, region, rotation, out=None
+    ):
+        # All regions are extracted from the same mapped surface. 'region' is their bounding
+        # box, cleaned up by the display; Regions are clipped to it
+        frames = dict()
+
+        for frame_region in regions:
+            clean_region = intersect_rects(frame_region, region)
+
+            if clean_region is None:
+                frames[frame_region] = None
+                continue
+
+            frames[frame_region] = self.backend.process(
+                pointer,
+                pitch,
+                size,
+                width,
+                height,
+                clean_region,
+                rotation,
+                out=out.get(frame_region) if out is not None else None,
+            )
+
+        # Every region was written in place; The frame buffer recognizes its own slot
+        if out is not None and out.keys() == frames.keys():
+            if all(frames[key] is out[key] for key in frames):
+                return out
+
+        return frames
 
     def to_pil(self, frame):
         return self.backend.to_pil(frame)
@@ -28,38 +85,76 @@ class CaptureOutput:
     def stack(self, frames, stack_dimension):
         return self.backend.stack(frames, stack_dimension)
 
+    def allocate(self, count, frame):
+        return self.backend.allocate(count, frame)
+
+    def gather(self, storage, slots, stack_dimension):
+        return self.backend.gather(storage, slots, stack_dimension)
+
+    def allocate_canvas(self, frame, width, height):
+        return self.backend.allocate_canvas(frame, width, height)
+
+    def get_canvas_view(self, canvas, rect):
+        return self.backend.get_canvas_view(canvas, rect)
+
+    def paste(self, canvas, frame, left, top):
+        return self.backend.paste(canvas, frame, left, top)
+
+    def crop(self, canvas, rect):
+        return self.backend.crop(canvas, rect)
+
     def _initialize_backend(self, backend):
         if backend == CaptureOutputs.PIL:
             from d3dshot.capture_outputs.pil_capture_output import PILCaptureOutput
 
-            return PILCaptureOutput()
+            return PILCaptureOutput(resize=self.resize)
         elif backend == CaptureOutputs.NUMPY:
             from d3dshot.capture_outputs.numpy_capture_output import NumpyCaptureOutput
 
-            return NumpyCaptureOutput()
+            return NumpyCaptureOutput(resize=self.resize, layout=self.layout)
         elif backend == CaptureOutputs.NUMPY_FLOAT:
             from d3dshot.capture_outputs.numpy_float_capture_output import NumpyFloatCaptureOutput
 
-            return NumpyFloatCaptureOutput()
+            return NumpyFloatCaptureOutput(
+                resize=self.resize, normalization=self.normalization, layout=self.layout
+            )
         elif backend == CaptureOutputs.PYTORCH:
             from d3dshot.capture_outputs.pytorch_capture_output import PytorchCaptureOutput
 
-            return PytorchCaptureOutput()
+            return PytorchCaptureOutput(resize=self.resize, layout=self.layout)
         elif backend == CaptureOutputs.PYTORCH_FLOAT:
             from d3dshot.capture_outputs.pytorch_float_capture_output import (
                 PytorchFloatCaptureOutput,
             )
 
-            return PytorchFloatCaptureOutput()
+            return PytorchFloatCaptureOutput(
+                resize=self.resize, normalization=self.normalization, layout=self.layout
+            )
         elif backend == CaptureOutputs.PYTORCH_GPU:
             from d3dshot.capture_outputs.pytorch_gpu_capture_output import PytorchGPUCaptureOutput
 
-            return PytorchGPUCaptureOutput()
+            return PytorchGPUCaptureOutput(resize=self.resize, layout=self.layout)
         elif backend == CaptureOutputs.PYTORCH_FLOAT_GPU:
             from d3dshot.capture_outputs.pytorch_float_gpu_capture_output import (
                 PytorchFloatGPUCaptureOutput,
             )
 
-            return PytorchFloatGPUCaptureOutput()
+            return PytorchFloatGPUCaptureOutput(
+                resize=self.resize, normalization=self.normalization, layout=self.layout
+            )
+        elif backend == CaptureOutputs.PIL_GRAY:
+            from d3dshot.capture_outputs.pil_gray_capture_output import PILGrayCaptureOutput
+
+            return PILGrayCaptureOutput(resize=self.resize)
+        elif backend == CaptureOutputs.NUMPY_GRAY:
+            from d3dshot.capture_outputs.numpy_gray_capture_output import NumpyGrayCaptureOutput
+
+            return NumpyGrayCaptureOutput(resize=self.resize, dtype=self.gray_dtype)
+        elif backend == CaptureOutputs.PYTORCH_GRAY:
+            from d3dshot.capture_outputs.pytorch_gray_capture_output import (
+                PytorchGrayCaptureOutput,
+            )
+
+            return PytorchGrayCaptureOutput(resize=self.resize, dtype=self.gray_dtype)
         else:
             raise CaptureOutputError("The specified backend is invalid!")
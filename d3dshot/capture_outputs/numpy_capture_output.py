@@ -1,53 +1,84 @@
-import ctypes
-
 import numpy as np
 
 from PIL import Image
 
 from d3dshot.capture_output import CaptureOutput
+from d3dshot.conversion import bgra_to_rgb
+from d3dshot.layout import Layout
 
 
 class NumpyCaptureOutput(CaptureOutput):
-    def __init__(self):
-        pass
-
-    def process(self, pointer, pitch, size, width, height, region, rotation):
-        image = np.empty((size,), dtype=np.uint8)
-        ctypes.memmove(image.ctypes.data, pointer, size)
-
-        pitch_per_channel = pitch // 4
-
-        if rotation == 0:
-            image = np.reshape(image, (height, pitch_per_channel, 4))[..., [2, 1, 0]]
-        elif rotation == 90:
-            image = np.reshape(image, (width, pitch_per_channel, 4))[..., [2, 1, 0]]
-            image = np.rot90(image, axes=(1, 0))
-        elif rotation == 180:
-            image = np.reshape(image, (height, pitch_per_channel, 4))[..., [2, 1, 0]]
-            image = np.rot90(image, k=2, axes=(0, 1))
-        elif rotation == 270:
-            image = np.reshape(image, (width, pitch_per_channel, 4))[..., [2, 1, 0]]
-            image = np.rot90(image, axes=(0, 1))
-
-        # Trim pitch padding
-        if rotation in (0, 180) and pitch_per_channel != width:
-            image = image[:, :width, :]
-        elif rotation in (90, 270) and pitch_per_channel != height:
-            image = image[:height, :, :]
-
-        # Region slicing
-        if region[2] - region[0] != width or region[3] - region[1] != height:
-            image = image[region[1] : region[3], region[0] : region[2], :]
-
-        return image
+    def __init__(self, resize=None, layout=None):
+        self.resize = resize
+        self.layout = layout or Layout()
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        out = self._get_frame(out, region, np.uint8)
+
+        # Only the region is read from the mapped surface and it is written, channel-swapped,
+        # straight into 'out' (usually a frame buffer slot) in the frame layout
+        bgra_to_rgb(
+            pointer,
+            pitch,
+            width,
+            height,
+            region,
+            rotation,
+            out=self.layout.to_channels_last(out),
+            resize=self.resize,
+        )
+
+        return out
 
     def to_pil(self, frame):
-        return Image.fromarray(frame)
+        return Image.fromarray(self.layout.to_channels_last(frame))
 
     def stack(self, frames, stack_dimension):
+        if self.layout.is_batched:
+            # Batches of 1 frame are joined into a single batch
+            frames = np.concatenate(frames, axis=0)
+            return frames if stack_dimension == "first" else np.moveaxis(frames, 0, -1)
+
         if stack_dimension == "first":
             dimension = 0
         elif stack_dimension == "last":
             dimension = -1
 
         return np.stack(frames, axis=dimension)
+
+    def allocate(self, count, frame):
+        return np.empty((count, *frame.shape), dtype=frame.dtype)
+
+    def gather(self, storage, slots, stack_dimension):
+        frames = np.take(storage, slots, axis=0)
+
+        # (N, 1, C, H, W) slots gathered into a single, contiguous (N, C, H, W) batch
+        if self.layout.is_batched:
+            frames = frames.reshape((-1, *frames.shape[2:]))
+
+        if stack_dimension == "last":
+            frames = np.moveaxis(frames, 0, -1)
+
+        return frames
+
+    def allocate_canvas(self, frame, width, height):
+        return np.zeros((height, width, *frame.shape[2:]), dtype=frame.dtype)
+
+    def get_canvas_view(self, canvas, rect):
+        return canvas[rect[1] : rect[3], rect[0] : rect[2]]
+
+    def paste(self, canvas, frame, left, top):
+        canvas[top : top + frame.shape[0], left : left + frame.shape[1]] = frame
+        return canvas
+
+    def crop(self, canvas, rect):
+        return canvas[rect[1] : rect[3], rect[0] : rect[2]]
+
+    def _get_frame(self, out, region, dtype):
+        # 'out' when the frame fits in it, a new frame in the layout otherwise
+        shape = self.layout.get_shape(region, resize=self.resize)
+
+        if out is None or out.shape != shape or out.dtype != dtype:
+            out = np.empty(shape, dtype=dtype)
+
+        return out
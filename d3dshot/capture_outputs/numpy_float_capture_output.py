@@ -3,12 +3,36 @@ import numpy as np
 from PIL import Image
 
 from d3dshot.capture_outputs.numpy_capture_output import NumpyCaptureOutput
+from d3dshot.conversion import bgra_to_normalized
+from d3dshot.normalization import Normalization
 
 
 class NumpyFloatCaptureOutput(NumpyCaptureOutput):
-    def process(self, pointer, pitch, size, width, height, region, rotation):
-        image = super().process(pointer, pitch, size, width, height, region, rotation)
-        return np.divide(image, 255.0)
+    def __init__(self, resize=None, normalization=None, layout=None):
+        super().__init__(resize=resize, layout=layout)
+
+        self.normalization = normalization or Normalization()
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        out = self._get_frame(out, region, self.normalization.dtype)
+
+        bgra_to_normalized(
+            pointer,
+            pitch,
+            width,
+            height,
+            region,
+            rotation,
+            self.normalization.coefficients,
+            out=self.layout.to_channels_last(out),
+            dtype=self.normalization.dtype,
+            resize=self.resize,
+        )
+
+        return out
 
     def to_pil(self, frame):
-        return Image.fromarray(np.array(frame * 255.0, dtype=np.uint8))
+        frame = self.layout.to_channels_last(frame)
+        frame = frame * np.array(self.normalization.std) + np.array(self.normalization.mean)
+
+        return Image.fromarray(np.array(np.clip(frame, 0.0, 1.0) * 255.0, dtype=np.uint8))
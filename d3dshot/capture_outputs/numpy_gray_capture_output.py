@@ -0,0 +1,34 @@
+import numpy as np
+
+from PIL import Image
+
+from d3dshot.capture_outputs.numpy_capture_output import NumpyCaptureOutput
+from d3dshot.conversion import bgra_to_gray
+
+
+class NumpyGrayCaptureOutput(NumpyCaptureOutput):
+    def __init__(self, resize=None, dtype="uint8"):
+        super().__init__(resize=resize)
+
+        # uint8 luma in [0, 255] or float32 luma normalized to [0.0, 1.0]
+        self.dtype = np.dtype(dtype)
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        # (height, width) luma frames, computed straight from the mapped surface
+        return bgra_to_gray(
+            pointer,
+            pitch,
+            width,
+            height,
+            region,
+            rotation,
+            out=out,
+            dtype=self.dtype,
+            resize=self.resize,
+        )
+
+    def to_pil(self, frame):
+        if frame.dtype != np.uint8:
+            frame = np.array(np.clip(frame, 0.0, 1.0) * 255.0, dtype=np.uint8)
+
+        return Image.fromarray(frame)
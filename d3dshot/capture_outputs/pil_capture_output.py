@@ -3,46 +3,99 @@ import ctypes
 from PIL import Image
 
 from d3dshot.capture_output import CaptureOutput
+from d3dshot.surface import get_address, get_surface_span
+
+resample_filters = {
+    "nearest": Image.NEAREST,
+    "bilinear": Image.BILINEAR,
+}
 
 
 class PILCaptureOutput(CaptureOutput):
-    def __init__(self):
-        pass
+    def __init__(self, resize=None):
+        self.resize = resize
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        return self._decode(pointer, pitch, width, height, region, rotation)
+
+    def to_pil(self, frame):
+        return frame
+
+    def stack(self, frames, stack_dimension):
+        return frames
+
+    def allocate(self, count, frame):
+        return None
+
+    def gather(self, storage, slots, stack_dimension):
+        return None
+
+    def allocate_canvas(self, frame, width, height):
+        return Image.new(frame.mode, (width, height))
+
+    def get_canvas_view(self, canvas, rect):
+        # Images can't be written into through views; Frames are pasted instead
+        return None
+
+    def paste(self, canvas, frame, left, top):
+        canvas.paste(frame, (left, top))
+        return canvas
 
-    def process(self, pointer, pitch, size, width, height, region, rotation):
-        raw_bytes = ctypes.string_at(pointer, size=size)
+    def crop(self, canvas, rect):
+        return canvas.crop(rect)
 
-        pitch_per_channel = pitch // 4
+    def _decode(self, pointer, pitch, width, height, region, rotation):
+        # "RGB" image of the region in display orientation, resized if needed
+        span = get_surface_span(pitch, width, height, region, rotation)
 
-        if rotation == 0:
-            image = Image.frombytes("RGBA", (pitch_per_channel, height), raw_bytes)
-        elif rotation == 90:
-            image = Image.frombytes("RGBA", (pitch_per_channel, width), raw_bytes)
+        # Zero-copy buffer starting at the first pixel of the region and ending at its last one
+        address = get_address(pointer) + span.offset + span.column * 4
+        length = (span.rows - 1) * pitch + span.columns * 4
+
+        buffer = (ctypes.c_ubyte * length).from_address(address)
+
+        # PIL's raw decoder crops (through the stride), drops the 4th byte and swaps channels in
+        # a single pass over the mapped surface
+        image = Image.frombuffer("RGB", (span.columns, span.rows), buffer, "raw", "BGRX", pitch, 1)
+
+        # Rotated before resizing so that the resize samples the same pixels as the other backends
+        if rotation == 90:
             image = image.transpose(Image.ROTATE_270)
         elif rotation == 180:
-            image = Image.frombytes("RGBA", (pitch_per_channel, height), raw_bytes)
             image = image.transpose(Image.ROTATE_180)
         elif rotation == 270:
-            image = Image.frombytes("RGBA", (pitch_per_channel, width), raw_bytes)
             image = image.transpose(Image.ROTATE_90)
 
-        b, g, r, _ = image.split()
-        image = Image.merge("RGB", (r, g, b))
+        if self.resize is not None:
+            image = self._resize(image)
 
-        # Trim pitch padding
-        if rotation in (0, 180) and pitch_per_channel != width:
-            image = image.crop((0, 0, width, height))
-        elif rotation in (90, 270) and pitch_per_channel != height:
-            image = image.crop((0, 0, width, height))
+        return image
 
-        # Region slicing
-        if region[2] - region[0] != width or region[3] - region[1] != height:
-            image = image.crop(region)
+    def _resize(self, image):
+        size = self.resize.get_size(image.width, image.height)
 
-        return image
+        if size == image.size:
+            return image
 
-    def to_pil(self, frame):
-        return frame
+        factors = (image.width // size[0], image.height // size[1])
 
-    def stack(self, frames, stack_dimension):
-        return frames
+        if self.resize.method == "area":
+            if image.width == size[0] * factors[0] and image.height == size[1] * factors[1]:
+                # Integer factor box downsampling
+                return image.reduce(factors)
+
+            # Unlike the NumPy and PyTorch backends, which average whole source pixels, PIL's box
+            # filter weighs the partially covered pixels of non-integer boxes. Frames differ
+            return image.resize(size, resample=Image.BOX)
+
+        # Affine transforms sample pixel centers without antialiasing, like the other backends.
+        # The scale is nudged up so that centers landing exactly on a pixel edge round the same
+        # way as the NumPy indices do
+        scale = (image.width / size[0] * (1 + 1e-9), image.height / size[1] * (1 + 1e-9))
+
+        return image.transform(
+            size,
+            Image.AFFINE,
+            (scale[0], 0, 0, 0, scale[1], 0),
+            resample=resample_filters[self.resize.method],
+        )
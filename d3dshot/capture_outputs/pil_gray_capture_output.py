@@ -0,0 +1,13 @@
+from PIL import Image
+
+from d3dshot.capture_outputs.pil_capture_output import PILCaptureOutput
+from d3dshot.conversion import bgra_to_gray
+
+
+class PILGrayCaptureOutput(PILCaptureOutput):
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        # Same luma kernel as the NumPy and PyTorch gray capture outputs, straight from the
+        # mapped surface. No RGB image is ever decoded
+        luma = bgra_to_gray(pointer, pitch, width, height, region, rotation, resize=self.resize)
+
+        return Image.fromarray(luma, "L")
@@ -1,56 +1,87 @@
-import ctypes
-
 import numpy as np
 import torch
 
 from PIL import Image
 
 from d3dshot.capture_output import CaptureOutput
+from d3dshot.conversion import bgra_to_rgb
+from d3dshot.layout import Layout
 
 
 class PytorchCaptureOutput(CaptureOutput):
-    def __init__(self):
-        pass
-
-    def process(self, pointer, pitch, size, width, height, region, rotation):
-        # We proxy through numpy's ctypes interface because making
-        # a PyTorch tensor from a bytearray is HORRIBLY slow...
-        image = np.empty((size,), dtype=np.uint8)
-        ctypes.memmove(image.ctypes.data, pointer, size)
-
-        pitch_per_channel = pitch // 4
-
-        if rotation == 0:
-            image = np.reshape(image, (height, pitch_per_channel, 4))[..., [2, 1, 0]]
-        elif rotation == 90:
-            image = np.reshape(image, (width, pitch_per_channel, 4))[..., [2, 1, 0]]
-            image = np.rot90(image, axes=(1, 0)).copy()
-        elif rotation == 180:
-            image = np.reshape(image, (height, pitch_per_channel, 4))[..., [2, 1, 0]]
-            image = np.rot90(image, k=2, axes=(0, 1)).copy()
-        elif rotation == 270:
-            image = np.reshape(image, (width, pitch_per_channel, 4))[..., [2, 1, 0]]
-            image = np.rot90(image, axes=(0, 1)).copy()
-
-        # Trim pitch padding
-        if rotation in (0, 180) and pitch_per_channel != width:
-            image = image[:, :width, :]
-        elif rotation in (90, 270) and pitch_per_channel != height:
-            image = image[:height, :, :]
-
-        # Region slicing
-        if region[2] - region[0] != width or region[3] - region[1] != height:
-            image = image[region[1] : region[3], region[0] : region[2], :]
-
-        return torch.from_numpy(image)
+    def __init__(self, resize=None, layout=None):
+        self.resize = resize
+        self.layout = layout or Layout()
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        out = self._get_frame(out, region, torch.uint8)
+
+        # Cropped, rotated, channel-swapped and resampled in a single pass straight from the
+        # mapped surface, into 'out' (usually a frame buffer slot) in the frame layout
+        bgra_to_rgb(
+            pointer,
+            pitch,
+            width,
+            height,
+            region,
+            rotation,
+            out=self.layout.to_channels_last(out.numpy()),
+            resize=self.resize,
+        )
+
+        return out
 
     def to_pil(self, frame):
-        return Image.fromarray(np.array(frame))
+        return Image.fromarray(self.layout.to_channels_last(np.array(frame)))
 
     def stack(self, frames, stack_dimension):
+        if self.layout.is_batched:
+            # Batches of 1 frame are joined into a single batch
+            frames = torch.cat(frames, dim=0)
+            return frames if stack_dimension == "first" else frames.permute(1, 2, 3, 0)
+
         if stack_dimension == "first":
             dimension = 0
         elif stack_dimension == "last":
             dimension = -1
 
         return torch.stack(frames, dim=dimension)
+
+    def allocate(self, count, frame):
+        return torch.empty((count, *frame.shape), dtype=frame.dtype, device=frame.device)
+
+    def gather(self, storage, slots, stack_dimension):
+        frames = storage[slots]
+
+        # (N, 1, C, H, W) slots gathered into a single, contiguous (N, C, H, W) batch
+        if self.layout.is_batched:
+            frames = frames.flatten(0, 1)
+
+        if stack_dimension == "last":
+            frames = frames.permute(*range(1, frames.dim()), 0)
+
+        return frames
+
+    def allocate_canvas(self, frame, width, height):
+        return torch.zeros(
+            (height, width, *frame.shape[2:]), dtype=frame.dtype, device=frame.device
+        )
+
+    def get_canvas_view(self, canvas, rect):
+        return canvas[rect[1] : rect[3], rect[0] : rect[2]]
+
+    def paste(self, canvas, frame, left, top):
+        canvas[top : top + frame.shape[0], left : left + frame.shape[1]] = frame
+        return canvas
+
+    def crop(self, canvas, rect):
+        return canvas[rect[1] : rect[3], rect[0] : rect[2]]
+
+    def _get_frame(self, out, region, dtype):
+        # 'out' when the frame fits in it, a new frame in the layout otherwise
+        shape = self.layout.get_shape(region, resize=self.resize)
+
+        if out is None or tuple(out.shape) != shape or out.dtype != dtype:
+            out = torch.empty(shape, dtype=dtype)
+
+        return out
@@ -1,14 +1,41 @@
 import numpy as np
+import torch
 
 from PIL import Image
 
 from d3dshot.capture_outputs.pytorch_capture_output import PytorchCaptureOutput
+from d3dshot.conversion import bgra_to_normalized
+from d3dshot.normalization import Normalization
 
 
 class PytorchFloatCaptureOutput(PytorchCaptureOutput):
-    def process(self, pointer, pitch, size, width, height, region, rotation):
-        image = super().process(pointer, pitch, size, width, height, region, rotation)
-        return image / 255.0
+    def __init__(self, resize=None, normalization=None, layout=None):
+        super().__init__(resize=resize, layout=layout)
+
+        self.normalization = normalization or Normalization()
+
+        self.dtype = getattr(torch, self.normalization.dtype)
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        out = self._get_frame(out, region, self.dtype)
+
+        bgra_to_normalized(
+            pointer,
+            pitch,
+            width,
+            height,
+            region,
+            rotation,
+            self.normalization.coefficients,
+            out=self.layout.to_channels_last(out.numpy()),
+            dtype=self.normalization.dtype,
+            resize=self.resize,
+        )
+
+        return out
 
     def to_pil(self, frame):
-        return Image.fromarray(np.array(frame * 255.0, dtype=np.uint8))
+        frame = self.layout.to_channels_last(np.array(frame, dtype=np.float32))
+        frame = frame * np.array(self.normalization.std) + np.array(self.normalization.mean)
+
+        return Image.fromarray(np.array(np.clip(frame, 0.0, 1.0) * 255.0, dtype=np.uint8))
@@ -4,12 +4,31 @@ import torch
 from PIL import Image
 
 from d3dshot.capture_outputs.pytorch_gpu_capture_output import PytorchGPUCaptureOutput
+from d3dshot.normalization import Normalization
 
 
 class PytorchFloatGPUCaptureOutput(PytorchGPUCaptureOutput):
-    def process(self, pointer, pitch, size, width, height, region, rotation):
-        image = super().process(pointer, pitch, size, width, height, region, rotation)
-        return image.type(torch.cuda.FloatTensor) / 255.0
+    def __init__(self, resize=None, normalization=None, layout=None, device="cuda"):
+        super().__init__(resize=resize, layout=layout, device=device)
+
+        self.normalization = normalization or Normalization()
+
+        # Bytes are uploaded as is and normalized on the device
+        coefficients = self.normalization.coefficients
+
+        self.dtype = getattr(torch, self.normalization.dtype)
+
+        self.scales = torch.tensor([c[0] for c in coefficients], device=self.device)
+        self.offsets = torch.tensor([c[1] for c in coefficients], device=self.device)
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        image = self._upload(pointer, pitch, width, height, region, rotation)
+        image = torch.addcmul(self.offsets, image, self.scales).to(self.dtype)
+
+        return self._to_frame(image, out=out)
 
     def to_pil(self, frame):
-        return Image.fromarray(np.array(frame.cpu() * 255.0, dtype=np.uint8))
+        frame = self.layout.to_channels_last(np.array(frame.cpu(), dtype=np.float32))
+        frame = frame * np.array(self.normalization.std) + np.array(self.normalization.mean)
+
+        return Image.fromarray(np.array(np.clip(frame, 0.0, 1.0) * 255.0, dtype=np.uint8))
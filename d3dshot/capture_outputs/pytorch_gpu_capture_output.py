@@ -4,16 +4,62 @@ import torch
 from PIL import Image
 
 from d3dshot.capture_outputs.pytorch_capture_output import PytorchCaptureOutput
+from d3dshot.conversion import bgra_to_rgb
+from d3dshot.surface import get_address, get_surface_span
+from d3dshot.upload import PinnedUploader
 
 
 class PytorchGPUCaptureOutput(PytorchCaptureOutput):
-    def __init__(self):
-        self.device = torch.device("cuda")
+    def __init__(self, resize=None, layout=None, device="cuda"):
+        super().__init__(resize=resize, layout=layout)
+
+        self.device = torch.device(device)
         torch.tensor([0], device=self.device)  # Warm up CUDA
 
-    def process(self, pointer, pitch, size, width, height, region, rotation):
-        image = super().process(pointer, pitch, size, width, height, region, rotation)
-        return image.to(self.device)
+        # Frames are staged in pinned host memory and uploaded asynchronously
+        self.uploader = PinnedUploader(self.device)
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        image = self._upload(pointer, pitch, width, height, region, rotation)
+
+        return self._to_frame(image, out=out)
 
     def to_pil(self, frame):
-        return Image.fromarray(np.array(frame.cpu()))
+        return Image.fromarray(self.layout.to_channels_last(np.array(frame.cpu())))
+
+    def _upload(self, pointer, pitch, width, height, region, rotation):
+        # (height, width, 3) RGB view of the region on the device
+        if self.resize is not None:
+            # Resampled on the CPU first; Only the resized frame is uploaded
+            image = bgra_to_rgb(
+                pointer, pitch, width, height, region, rotation, resize=self.resize
+            )
+
+            return self.uploader.upload_tensor(torch.from_numpy(image))
+
+        span = get_surface_span(pitch, width, height, region, rotation)
+
+        # The surface rows covering the region are uploaded as is. Cropping, channel swap
+        # and rotation happen on the device
+        image = self.uploader.upload(get_address(pointer) + span.offset, span.size)
+
+        image = image.view(span.rows, pitch // 4, 4)
+        image = image[:, span.column : span.column + span.columns, [2, 1, 0]]
+
+        if rotation == 90:
+            image = torch.rot90(image, dims=(1, 0))
+        elif rotation == 180:
+            image = torch.rot90(image, k=2, dims=(0, 1))
+        elif rotation == 270:
+            image = torch.rot90(image, dims=(0, 1))
+
+        return image
+
+    def _to_frame(self, image, out=None):
+        # The (height, width, 3) image in the frame layout, written into 'out' when it fits
+        image = self.layout.from_channels_last(image)
+
+        if out is not None and out.shape == image.shape and out.dtype == image.dtype:
+            return out.copy_(image)
+
+        return image.contiguous()
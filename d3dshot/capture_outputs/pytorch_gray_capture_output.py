@@ -0,0 +1,41 @@
+import numpy as np
+import torch
+
+from PIL import Image
+
+from d3dshot.capture_outputs.pytorch_capture_output import PytorchCaptureOutput
+from d3dshot.conversion import bgra_to_gray
+
+
+class PytorchGrayCaptureOutput(PytorchCaptureOutput):
+    def __init__(self, resize=None, dtype="uint8"):
+        super().__init__(resize=resize)
+
+        # uint8 luma in [0, 255] or float32 luma normalized to [0.0, 1.0]
+        self.dtype = np.dtype(dtype)
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        out_array = out.numpy() if out is not None else None
+
+        # (height, width) luma frames, computed straight from the mapped surface
+        image = bgra_to_gray(
+            pointer,
+            pitch,
+            width,
+            height,
+            region,
+            rotation,
+            out=out_array,
+            dtype=self.dtype,
+            resize=self.resize,
+        )
+
+        return out if image is out_array else torch.from_numpy(image)
+
+    def to_pil(self, frame):
+        frame = np.array(frame)
+
+        if frame.dtype != np.uint8:
+            frame = np.array(np.clip(frame, 0.0, 1.0) * 255.0, dtype=np.uint8)
+
+        return Image.fromarray(frame)
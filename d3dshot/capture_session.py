@@ -0,0 +1,148 @@
+import collections
+import time
+
+import d3dshot.dll.dxgi
+import d3dshot.dll.d3d
+
+
+class CaptureSession:
+    def __init__(self, dxgi_output_duplication, d3d_device, d3d_device_context, staging_depth=1):
+        self.dxgi_output_duplication = dxgi_output_duplication
+
+        self.d3d_device = d3d_device
+        self.d3d_device_context = d3d_device_context
+
+        # CPU readable copies of the desktop image and their IDXGISurface interfaces. They live
+        # for the whole session and are only recreated when the desktop image changes shape
+        self.staging_depth = staging_depth
+        self.staging_textures = list()
+
+        self.staging_texture_count = 0
+
+        # Frame k is copied to staging texture k mod staging_depth. Copies are read back
+        # oldest first, staging_depth - 1 frames later, so the GPU copy has landed by then
+        self._next_staging_texture = 0
+        self._pending_copies = collections.deque()
+
+        # time.perf_counter() time at which the frame last read back was acquired
+        self.acquired_time = None
+
+        self._texture_key = None
+        self._display_key = None
+
+    @property
+    def latency_frames(self):
+        return self.staging_depth - 1
+
+    def set_staging_depth(self, staging_depth):
+        if staging_depth != self.staging_depth:
+            self.staging_depth = staging_depth
+            self.invalidate()
+
+    def invalidate(self):
+        self.staging_textures = list()
+
+        self._next_staging_texture = 0
+        self._pending_copies.clear()
+
+        self._texture_key = None
+        self._display_key = None
+
+    def capture(
+        self, process_func, width, height, region, rotation, frame_metadata_func=None, timeout=0
+    ):
+        # Blocks for up to 'timeout' seconds waiting for a new frame
+        acquired_frame = d3dshot.dll.dxgi.acquire_dxgi_output_duplication_frame(
+            self.dxgi_output_duplication, int(timeout * 1000)
+        )
+
+        acquired_time = time.perf_counter()
+
+        should_process = False
+
+        if acquired_frame is not None:
+            dxgi_output_duplication_frame_information, dxgi_resource = acquired_frame
+
+            try:
+                should_process = dxgi_output_duplication_frame_information.LastPresentTime > 0
+
+                if should_process and frame_metadata_func is not None:
+                    # Lets the caller skip processing based on what changed in the frame
+                    should_process = frame_metadata_func(
+                        d3dshot.dll.dxgi.describe_dxgi_output_duplication_frame(
+                            self.dxgi_output_duplication,
+                            dxgi_output_duplication_frame_information,
+                        )
+                    )
+
+                if should_process:
+                    self._copy(dxgi_resource, width, height, region, rotation, acquired_time)
+            finally:
+                self.dxgi_output_duplication.ReleaseFrame()
+
+        # Copies still in flight are read right away when there is no new frame to overlap with
+        if len(self._pending_copies) >= self.staging_depth or (
+            not should_process and len(self._pending_copies)
+        ):
+            return self._read(process_func)
+
+        return None
+
+    def _copy(self, dxgi_resource, width, height, region, rotation, acquired_time):
+        d3d11_texture_2d = d3dshot.dll.dxgi.get_d3d11_texture_2d(dxgi_resource)
+
+        self._prepare_staging_textures(d3d11_texture_2d, (width, height, rotation))
+
+        index = self._next_staging_texture
+        self._next_staging_texture = (index + 1) % self.staging_depth
+
+        self.d3d_device_context.CopyResource(self.staging_textures[index][0], d3d11_texture_2d)
+
+        self._pending_copies.append((index, width, height, region, rotation, acquired_time))
+
+    def _read(self, process_func):
+        index, width, height, region, rotation, acquired_time = self._pending_copies.popleft()
+        staging_surface = self.staging_textures[index][1]
+
+        self.acquired_time = acquired_time
+
+        pointer, pitch = d3dshot.dll.dxgi.map_dxgi_surface(staging_surface)
+
+        try:
+            if rotation in (0, 180):
+                size = pitch * height
+            else:
+                size = pitch * width
+
+            return process_func(pointer, pitch, size, width, height, region, rotation)
+        finally:
+            staging_surface.Unmap()
+
+    def _prepare_staging_textures(self, d3d11_texture_2d, display_key):
+        # The desktop image is only described again when the display mode looks different
+        if len(self.staging_textures) and display_key == self._display_key:
+            return
+
+        d3d11_texture_2d_description = d3dshot.dll.d3d.describe_d3d11_texture_2d(d3d11_texture_2d)
+
+        texture_key = (
+            d3d11_texture_2d_description.Width,
+            d3d11_texture_2d_description.Height,
+            d3d11_texture_2d_description.Format,
+        )
+
+        if not len(self.staging_textures) or texture_key != self._texture_key:
+            self.invalidate()
+
+            for _ in range(self.staging_depth):
+                staging_texture = d3dshot.dll.d3d.create_d3d11_texture_2d_for_cpu(
+                    d3d11_texture_2d_description, self.d3d_device
+                )
+                staging_surface = d3dshot.dll.dxgi.get_dxgi_surface(staging_texture)
+
+                self.staging_textures.append((staging_texture, staging_surface))
+
+            self.staging_texture_count += self.staging_depth
+
+        self._texture_key = texture_key
+        self._display_key = display_key
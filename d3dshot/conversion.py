@@ -0,0 +1,369 @@
+import ctypes
+
+import numpy as np
+
+from d3dshot.surface import get_address, get_surface_span
+
+# ITU-R 601-2 luma weights of the B, G and R channels in 8 bit fixed point (they sum to 256)
+LUMA_WEIGHTS = (29, 150, 77)
+
+# Rows converted at once by the kernels; Keeps their intermediates in cache
+BLOCK_ROWS = 64
+
+# Side of the square tiles rotated regions are converted in; Keeps both the surface columns
+# being read and the output rows being written in cache
+TILE_SIZE = 128
+
+
+def map_surface(address, pitch, rows):
+    # Zero-copy (rows, pitch // 4, 4) view over mapped BGRA surface memory
+    surface = np.ctypeslib.as_array(
+        ctypes.cast(address, ctypes.POINTER(ctypes.c_uint8)), shape=(rows * pitch,)
+    )
+
+    return surface.reshape((rows, pitch // 4, 4))
+
+
+def orient(image, rotation):
+    # Views only. Turns an unrotated surface span into display orientation
+    if rotation == 0:
+        return image
+    elif rotation == 90:
+        return np.rot90(image, axes=(1, 0))
+    elif rotation == 180:
+        return image[::-1, ::-1]
+    elif rotation == 270:
+        return np.rot90(image, axes=(0, 1))
+
+
+def get_region_view(pointer, pitch, width, height, region, rotation):
+    span = get_surface_span(pitch, width, height, region, rotation)
+
+    # Only the rows covering the region are mapped and pitch padding is never part of the result
+    surface = map_surface(get_address(pointer) + span.offset, pitch, span.rows)
+
+    return orient(surface[:, span.column : span.column + span.columns], rotation)
+
+
+def bgra_to_rgb(
+    pointer, pitch, width, height, region, rotation, out=None, dtype=np.uint8, resize=None
+):
+    image = get_region_view(pointer, pitch, width, height, region, rotation)
+
+    if resize is not None:
+        size = resize.get_size(image.shape[1], image.shape[0])
+        return resize_bgra_to_rgb(image, size, resize.method, out=out, dtype=dtype)
+
+    if out is None or out.shape != (*image.shape[:2], 3) or out.dtype != dtype:
+        out = np.empty((*image.shape[:2], 3), dtype=dtype)
+
+    # Region pixels are read straight from the mapped surface and written cropped, rotated and
+    # channel-swapped in a single pass. One copy per channel is a lot faster than a single copy
+    # with a 3-wide innermost axis
+    for rows, columns in _get_blocks(image):
+        block = image[rows, columns]
+
+        for channel in range(3):
+            np.copyto(out[rows, columns, channel], block[..., 2 - channel])
+
+    return out
+
+
+def bgra_to_gray(
+    pointer, pitch, width, height, region, rotation, out=None, dtype=np.uint8, resize=None
+):
+    image = get_region_view(pointer, pitch, width, height, region, rotation)
+
+    if resize is not None:
+        size = resize.get_size(image.shape[1], image.shape[0])
+
+        # Luma is linear; The channels are resampled first so only output sized pixels are mixed
+        image = resize_bgra_to_rgb(image, size, resize.method, dtype=np.float32)[..., ::-1]
+
+    if out is None or out.shape != image.shape[:2] or out.dtype != dtype:
+        out = np.empty(image.shape[:2], dtype=dtype)
+
+    accumulator_dtype = np.uint16 if np.issubdtype(image.dtype, np.integer) else np.float32
+
+    # Float luma is normalized to [0.0, 1.0], like the float capture outputs
+    divisor = 256 if np.issubdtype(out.dtype, np.integer) else 256 * 255
+
+    luma = np.empty(_get_block_shape(image), accumulator_dtype)
+    weighted = np.empty_like(luma)
+
+    # The weighted sum is accumulated 1 channel at a time, straight from the mapped surface
+    for rows, columns in _get_blocks(image):
+        block = image[rows, columns]
+
+        block_luma = luma[: block.shape[0], : block.shape[1]]
+        block_weighted = weighted[: block.shape[0], : block.shape[1]]
+
+        np.multiply(block[..., 0], LUMA_WEIGHTS[0], out=block_luma, dtype=accumulator_dtype)
+
+        for channel in (1, 2):
+            np.multiply(
+                block[..., channel],
+                LUMA_WEIGHTS[channel],
+                out=block_weighted,
+                dtype=accumulator_dtype,
+            )
+            block_luma += block_weighted
+
+        _store(out[rows, columns], block_luma, divisor)
+
+    return out
+
+
+def bgra_to_normalized(
+    pointer,
+    pitch,
+    width,
+    height,
+    region,
+    rotation,
+    coefficients,
+    out=None,
+    dtype=np.float32,
+    resize=None,
+):
+    image = get_region_view(pointer, pitch, width, height, region, rotation)
+
+    if resize is not None:
+        size = resize.get_size(image.shape[1], image.shape[0])
+        image = resize_bgra_to_rgb(image, size, resize.method, dtype=np.float32)[..., ::-1]
+
+    if out is None or out.shape != (*image.shape[:2], 3) or out.dtype != dtype:
+        out = np.empty((*image.shape[:2], 3), dtype=dtype)
+
+    normalized = np.empty(_get_block_shape(image), dtype=np.float32)
+
+    # Type cast, channel swap and normalization happen in a single pass over the mapped surface
+    for rows, columns in _get_blocks(image):
+        block = image[rows, columns]
+        block_normalized = normalized[: block.shape[0], : block.shape[1]]
+
+        for channel, (scale, offset) in enumerate(coefficients):
+            np.multiply(block[..., 2 - channel], np.float32(scale), out=block_normalized)
+
+            if offset:
+                block_normalized += np.float32(offset)
+
+            np.copyto(out[rows, columns, channel], block_normalized)
+
+    return out
+
+
+def resize_bgra_to_rgb(image, size, method, out=None, dtype=np.uint8):
+    # 'image' is a BGRA view in display orientation, usually straight over the mapped surface.
+    # Resampling and the channel swap happen in the same pass, 1 channel at a time
+    width, height = size
+
+    if out is None or out.shape != (height, width, 3) or out.dtype != dtype:
+        out = np.empty((height, width, 3), dtype=dtype)
+
+    if method == "nearest":
+        _resize_nearest(image, out)
+    elif method == "area":
+        _resize_area(image, out)
+    elif method == "bilinear":
+        _resize_bilinear(image, out)
+
+    return out
+
+
+def _resize_nearest(image, out):
+    rows, columns = image.shape[:2]
+    height, width = out.shape[:2]
+
+    if rows % height == 0 and columns % width == 0:
+        # Integer factors are strided views; Only the sampled pixels are ever read
+        row_factor = rows // height
+        column_factor = columns // width
+
+        image = image[row_factor // 2 :: row_factor, column_factor // 2 :: column_factor]
+    else:
+        image = image[
+            _get_nearest_indices(rows, height)[:, None], _get_nearest_indices(columns, width)
+        ]
+
+    for channel in range(3):
+        np.copyto(out[..., channel], image[..., 2 - channel], casting="unsafe")
+
+
+def _resize_area(image, out):
+    rows, columns = image.shape[:2]
+    height, width = out.shape[:2]
+
+    if rows % height == 0 and columns % width == 0:
+        # Box sums of up to 256 pixels fit the 16 bit lanes of _resize_area_blocks
+        if (rows // height) * (columns // width) <= 256 and _resize_area_blocks(image, out):
+            return
+
+    row_starts = (np.arange(height) * rows) // height
+    column_starts = (np.arange(width) * columns) // width
+
+    # Upscaled pixels get a box of 1 source pixel
+    row_counts = np.maximum(np.diff(np.append(row_starts, rows)), 1)
+    column_counts = np.maximum(np.diff(np.append(column_starts, columns)), 1)
+
+    counts = row_counts[:, None] * column_counts
+
+    # The axis that is contiguous in the surface (columns, unless rotated) is reduced first
+    if abs(image.strides[1]) <= abs(image.strides[0]):
+        reductions = ((column_starts, 1), (row_starts, 0))
+    else:
+        reductions = ((row_starts, 0), (column_starts, 1))
+
+    for channel in range(3):
+        total = image[..., 2 - channel]
+
+        for starts, axis in reductions:
+            total = np.add.reduceat(total, starts, axis=axis, dtype=np.uint32)
+
+        _store(out[..., channel], total, counts)
+
+
+def _resize_area_blocks(image, out):
+    # Integer factor box averaging. Rows are summed first, all 4 channels at once, then the
+    # columns of the sums, each pixel being a uint64 of 4 uint16 lanes. Every pass runs along
+    # contiguous memory, 1 block of rows at a time. False if the surface isn't laid out for it
+
+    # Rotated views are walked in surface order; Boxes map the same way either way
+    if abs(image.strides[1]) > abs(image.strides[0]):
+        image = image.swapaxes(0, 1)
+        out = out.swapaxes(0, 1)
+
+    if image.strides[0] < 0:
+        image = image[::-1]
+        out = out[::-1]
+
+    if image.strides[1] < 0:
+        image = image[:, ::-1]
+        out = out[:, ::-1]
+
+    if image.strides[1:] != (4, 1):
+        return False
+
+    rows, columns = image.shape[:2]
+    height, width = out.shape[:2]
+
+    row_factor = rows // height
+    column_factor = columns // width
+    count = row_factor * column_factor
+
+    block_height = max(1, BLOCK_ROWS // row_factor)
+
+    row_sums = np.empty((block_height, columns, 4), dtype=np.uint16)
+    totals = np.empty((block_height, width), dtype=np.uint64)
+
+    is_integer = np.issubdtype(out.dtype, np.integer)
+
+    for row in range(0, height, block_height):
+        block_rows = min(block_height, height - row)
+        block = image[row * row_factor : (row + block_rows) * row_factor]
+
+        row_sum = _sum_strided(block, row_factor, 0, row_sums[:block_rows])
+
+        pixels = row_sum.view(np.uint64)[..., 0]
+        total = _sum_strided(pixels, column_factor, 1, totals[:block_rows])
+
+        lanes = total.view(np.uint16).reshape((block_rows, width, 4))
+        block_out = out[row : row + block_rows]
+
+        # Rounded in place, all lanes at once
+        if is_integer:
+            lanes += count // 2
+            lanes //= count
+
+        for channel in range(3):
+            if is_integer:
+                np.copyto(block_out[..., channel], lanes[..., 2 - channel], casting="unsafe")
+            else:
+                np.divide(lanes[..., 2 - channel], count, out=block_out[..., channel])
+
+    return True
+
+
+def _resize_bilinear(image, out):
+    rows, columns = image.shape[:2]
+    height, width = out.shape[:2]
+
+    top, bottom, row_weights = _get_linear_weights(rows, height)
+    left, right, column_weights = _get_linear_weights(columns, width)
+
+    row_weights = row_weights[:, None]
+
+    # Rows first; Only the 2 source rows around each output row are read
+    top_rows = np.take(image, top, axis=0)
+    bottom_rows = np.take(image, bottom, axis=0)
+
+    for channel in range(3):
+        interpolated = top_rows[..., 2 - channel].astype(np.float32)
+        interpolated += (bottom_rows[..., 2 - channel] - interpolated) * row_weights
+
+        pixels = np.take(interpolated, left, axis=1)
+        pixels += (np.take(interpolated, right, axis=1) - pixels) * column_weights
+
+        _store(out[..., channel], pixels)
+
+
+def _sum_strided(values, factor, axis, out):
+    # Sum of every 'factor' consecutive entries of 'values' along 'axis', into 'out'
+    def take(offset):
+        return values[offset::factor] if axis == 0 else values[:, offset::factor]
+
+    if factor == 1:
+        np.copyto(out, values, casting="unsafe")
+        return out
+
+    np.add(take(0), take(1), out=out, dtype=out.dtype)
+
+    for offset in range(2, factor):
+        out += take(offset)
+
+    return out
+
+
+def _get_block_shape(image):
+    rows, columns = image.shape[:2]
+
+    # Rotated views walk the surface 1 column at a time; They are converted in square tiles
+    if abs(image.strides[1]) > abs(image.strides[0]):
+        return (min(TILE_SIZE, rows), min(TILE_SIZE, columns))
+
+    return (min(BLOCK_ROWS, rows), columns)
+
+
+def _get_blocks(image):
+    # (rows, columns) slices of 'image' covering it in blocks of at most _get_block_shape
+    rows, columns = image.shape[:2]
+    block_rows, block_columns = _get_block_shape(image)
+
+    for row in range(0, rows, max(block_rows, 1)):
+        for column in range(0, columns, max(block_columns, 1)):
+            yield slice(row, row + block_rows), slice(column, column + block_columns)
+
+
+def _get_nearest_indices(source_size, size):
+    return np.minimum(
+        ((np.arange(size) + 0.5) * source_size / size).astype(np.intp), source_size - 1
+    )
+
+
+def _get_linear_weights(source_size, size):
+    positions = np.clip((np.arange(size) + 0.5) * source_size / size - 0.5, 0, source_size - 1)
+
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, source_size - 1)
+
+    return lower, upper, (positions - lower).astype(np.float32)
+
+
+def _store(out, values, divisor=1):
+    # Averages 'values' into 'out', rounding to the nearest integer for integer outputs
+    if not np.issubdtype(out.dtype, np.integer):
+        np.divide(values, divisor, out=out)
+    elif np.issubdtype(values.dtype, np.integer):
+        np.copyto(out, (values + divisor // 2) // divisor, casting="unsafe")
+    else:
+        np.copyto(out, np.rint(values / divisor), casting="unsafe")
@@ -1,12 +1,22 @@
 import threading
-import collections
+import functools
+import contextlib
+import asyncio
 
-import gc
 import os
 import time
 
-from d3dshot.display import Display
+from d3dshot.display import Display, DisplayAccessLostError
+from d3dshot.display_worker import DisplayWorker
 from d3dshot.capture_output import CaptureOutput, CaptureOutputs
+from d3dshot.frame_buffer import FrameBuffer
+from d3dshot.frame_pool import FramePool
+from d3dshot.frame_stream import FrameStream
+from d3dshot.memory_policy import MemoryPolicy
+from d3dshot.scheduler import FrameScheduler
+from d3dshot.pipeline import ConversionPipeline, LazyFrame, StagingPool
+from d3dshot.surface import get_bounding_rect
+from d3dshot.virtual_desktop import VirtualDesktop
 
 
 class Singleton(type):
@@ -28,6 +38,10 @@ class D3DShot(metaclass=Singleton):
         self,
         capture_output=CaptureOutputs.PIL,
         frame_buffer_size=60,
+        resize=None,
+        normalization=None,
+        layout=None,
+        gray_dtype=None,
         pil_is_available=True,
         numpy_is_available=False,
         pytorch_is_available=False,
@@ -43,10 +57,33 @@ class D3DShot(metaclass=Singleton):
                 self.display = display
                 break
 
-        self.capture_output = CaptureOutput(backend=capture_output)
+        self.capture_output = CaptureOutput(
+            backend=capture_output,
+            resize=resize,
+            normalization=normalization,
+            layout=layout,
+            gray_dtype=gray_dtype,
+        )
+
+        self.virtual_desktop = None
+
+        if len(self.displays) > 0:
+            self.virtual_desktop = VirtualDesktop(self.displays, self.capture_output)
 
         self.frame_buffer_size = frame_buffer_size
-        self.frame_buffer = collections.deque(list(), self.frame_buffer_size)
+        self.frame_buffer = FrameBuffer(self.frame_buffer_size, capture_output=self.capture_output)
+
+        self.frame_pool = FramePool()
+
+        self.memory_policy = MemoryPolicy()
+        self.scheduler = None
+        self.pipeline = None
+        self.staging_pool = None
+        self.incremental_frame = None
+        self.capture_timeout = 0
+
+        # 1 worker per display when capturing multiple displays at once
+        self.display_workers = list()
 
         self.previous_screenshot = None
 
@@ -64,6 +101,26 @@ class D3DShot(metaclass=Singleton):
     def is_capturing(self):
         return self._is_capturing
 
+    @property
+    def frame_number(self):
+        return self.display.frame_number
+
+    @property
+    def frame_metadata(self):
+        return self.display.frame_metadata
+
+    @property
+    def frame_buffers(self):
+        if not len(self.display_workers):
+            return [self.frame_buffer]
+
+        return [display_worker.frame_buffer for display_worker in self.display_workers]
+
+    def has_changed(self, since, region=None):
+        region = self._validate_region(region)
+
+        return self.display.has_changed(since, region=region)
+
     def get_latest_frame(self):
         return self.get_frame(0)
 
@@ -71,7 +128,12 @@ class D3DShot(metaclass=Singleton):
         if frame_index < 0 or (frame_index + 1) > len(self.frame_buffer):
             return None
 
-        return self.frame_buffer[frame_index]
+        frame = self.frame_buffer[frame_index]
+
+        if isinstance(frame, LazyFrame):
+            frame = frame.resolve(self.capture_output.process)
+
+        return frame
 
     def get_frames(self, frame_indices):
         frames = list()
@@ -84,34 +146,92 @@ class D3DShot(metaclass=Singleton):
 
         return frames
 
+    def get_synchronized_frames(self, max_skew=None):
+        frame_buffers = self.frame_buffers
+        latest_timestamps = [frame_buffer.get_valid_until(0) for frame_buffer in frame_buffers]
+
+        if None in latest_timestamps:
+            return None
+
+        # Frames are aligned on the latest time every display is known to be current at. A static
+        # display is current up to its latest repeat, not its latest new frame
+        reference_timestamp = min(latest_timestamps)
+
+        frames = list()
+
+        for frame_buffer in frame_buffers:
+            frame, skew = frame_buffer.get_closest(reference_timestamp)
+
+            if max_skew is not None and skew > max_skew:
+                return None
+
+            frames.append(frame)
+
+        return frames
+
     def get_frame_stack(self, frame_indices, stack_dimension=None):
         if stack_dimension not in ["first", "last"]:
             stack_dimension = "first"
 
+        frames = self.frame_buffer.gather(frame_indices, stack_dimension)
+
+        if frames is not None:
+            return frames
+
         frames = self.get_frames(frame_indices)
 
         return self.capture_output.stack(frames, stack_dimension)
 
-    def screenshot(self, region=None):
+    def frames(self, backpressure="drop_oldest", timeout=None):
+        # Each frame captured from now on, exactly once, until capture stops
+        timeout = self._validate_timeout(timeout)
+        stream = self._create_frame_stream(backpressure)
+
+        return self._iterate_frame_stream(stream, timeout)
+
+    def aframes(self, backpressure="drop_oldest", timeout=None):
+        timeout = self._validate_timeout(timeout)
+        stream = self._create_frame_stream(backpressure)
+
+        return self._aiterate_frame_stream(stream, timeout)
+
+    def screenshot(self, region=None, timeout=None, regions=None):
         region = self._validate_region(region)
+        timeout = self._validate_timeout(timeout)
+        regions = self._validate_regions(regions)
+
+        previous_screenshot = self.previous_screenshot
+
+        # Dicts of regions only fall back on dicts of regions and frames on frames
+        if isinstance(previous_screenshot, dict) != (regions is not None):
+            previous_screenshot = None
 
-        if self.previous_screenshot is None:
-            frame = None
+        # Without a previous screenshot to fall back on, wait for a frame for as long as it takes
+        if timeout is None and previous_screenshot is not None:
+            timeout = 0.1
 
-            while frame is None:
-                frame = self.display.capture(self.capture_output.process, region=region)
+        frame = self._wait_for_frame(region, timeout, regions=regions)
 
+        if frame is not None:
             self.previous_screenshot = frame
             return frame
-        else:
-            for _ in range(300):
-                frame = self.display.capture(self.capture_output.process, region=region)
 
-                if frame is not None:
-                    self.previous_screenshot = frame
-                    return frame
+        if previous_screenshot is None:
+            return None
 
-            return self.previous_screenshot
+        return self.frame_pool.reclaim(previous_screenshot)
+
+    @contextlib.contextmanager
+    def pooled_screenshot(self, region=None):
+        frame = self.screenshot(region=region)
+
+        try:
+            yield frame
+        finally:
+            self.release(frame)
+
+    def release(self, frame):
+        return self.frame_pool.release(frame)
 
     def screenshot_to_disk(self, directory=None, file_name=None, region=None):
         directory = self._validate_directory(directory)
@@ -129,20 +249,122 @@ class D3DShot(metaclass=Singleton):
     def frame_buffer_to_disk(self, directory=None):
         directory = self._validate_directory(directory)
 
-        # tuple cast to ensure an immutable frame buffer
-        for i, frame in enumerate(tuple(self.frame_buffer)):
+        frame_indices = list(range(len(self.frame_buffer)))
+
+        # Gathered (copied) frames or a list of frames to ensure an immutable frame buffer
+        frames = self.frame_buffer.gather(frame_indices, "first")
+
+        if frames is None:
+            frames = self.get_frames(frame_indices)
+
+        if isinstance(frames, dict):
+            frames = [
+                {key: region_frames[i] for key, region_frames in frames.items()}
+                for i in range(len(self.frame_buffer))
+            ]
+
+        for i, frame in enumerate(frames):
+            # Frames of multiple regions are saved 1 file per region
+            if isinstance(frame, dict):
+                for j, region_frame in enumerate(frame.values()):
+                    if region_frame is not None:
+                        frame_pil = self.capture_output.to_pil(region_frame)
+                        frame_pil.save(f"{directory}/{i + 1}_{j + 1}.png")
+
+                continue
+
             frame_pil = self.capture_output.to_pil(frame)
             frame_pil.save(f"{directory}/{i + 1}.png")
 
-    def capture(self, target_fps=60, region=None):
+    def capture(
+        self,
+        target_fps=60,
+        region=None,
+        memory_policy=None,
+        overrun_policy="skip",
+        conversion_workers=0,
+        lazy=False,
+        incremental=False,
+        staging_depth=1,
+        timeout=0,
+        displays=None,
+        virtual_desktop=False,
+        regions=None,
+    ):
         target_fps = self._validate_target_fps(target_fps)
+        memory_policy = self._validate_memory_policy(memory_policy)
+        scheduler = FrameScheduler(1 / target_fps, overrun_policy=overrun_policy)
+        conversion_workers = self._validate_conversion_workers(conversion_workers)
+        staging_depth = self._validate_staging_depth(staging_depth)
+        timeout = self._validate_timeout(timeout) or 0
+        displays = self._validate_displays(displays)
+        regions = self._validate_regions(regions)
+
+        if lazy and conversion_workers > 0:
+            raise AttributeError("'lazy' and 'conversion_workers' can't be used together")
+
+        if displays is not None and (lazy or conversion_workers > 0 or incremental):
+            raise AttributeError(
+                "'displays' can't be used together with 'lazy', 'conversion_workers' or 'incremental'"
+            )
+
+        if virtual_desktop:
+            self._validate_virtual_desktop_capture(lazy, conversion_workers, incremental, displays)
+
+        if regions is not None:
+            self._validate_regions_capture(
+                lazy, conversion_workers, incremental, displays, virtual_desktop
+            )
+
+        if incremental:
+            incremental_frame = self._get_incremental_frame(
+                lazy, conversion_workers, staging_depth
+            )
 
         if self.is_capturing:
             return False
 
+        self.memory_policy = memory_policy
+        self.memory_policy.reset()
+
+        self.scheduler = scheduler
+
+        self.pipeline = None
+        self.staging_pool = None
+        self.incremental_frame = None
+        self.display_workers = list()
+
+        if conversion_workers > 0:
+            self.pipeline = ConversionPipeline(
+                self.capture_output, self.frame_buffer, workers=conversion_workers
+            )
+        elif lazy:
+            # 1 raw frame per frame buffer entry + the one being staged
+            self.staging_pool = StagingPool(self.frame_buffer_size + 1)
+        elif incremental:
+            self.incremental_frame = incremental_frame
+
+        self.capture_timeout = timeout
+
+        if displays is not None:
+            self.display_workers = self._create_display_workers(
+                displays, region, timeout, target_fps, overrun_policy
+            )
+
+        if displays is None:
+            displays = self.virtual_desktop.displays if virtual_desktop else [self.display]
+
+            self._capture_thread = threading.Thread(
+                target=self._capture, args=(region, virtual_desktop, regions)
+            )
+        else:
+            self._capture_thread = threading.Thread(target=self._capture_displays)
+
+        for display in displays:
+            display.capture_session.set_staging_depth(staging_depth)
+
         self._is_capturing = True
 
-        self._capture_thread = threading.Thread(target=self._capture, args=(target_fps, region))
         self._capture_thread.start()
 
         return True
@@ -153,11 +375,11 @@ class D3DShot(metaclass=Singleton):
 
         interval = self._validate_interval(interval)
 
+        self.scheduler = FrameScheduler(interval)
+
         self._is_capturing = True
 
-        self._capture_thread = threading.Thread(
-            target=self._screenshot_every, args=(interval, region)
-        )
+        self._capture_thread = threading.Thread(target=self._screenshot_every, args=(region,))
         self._capture_thread.start()
 
         return True
@@ -169,10 +391,12 @@ class D3DShot(metaclass=Singleton):
         interval = self._validate_interval(interval)
         directory = self._validate_directory(directory)
 
+        self.scheduler = FrameScheduler(interval)
+
         self._is_capturing = True
 
         self._capture_thread = threading.Thread(
-            target=self._screenshot_to_disk_every, args=(interval, directory, region)
+            target=self._screenshot_to_disk_every, args=(directory, region)
         )
         self._capture_thread.start()
 
@@ -184,6 +408,9 @@ class D3DShot(metaclass=Singleton):
 
         self._is_capturing = False
 
+        # Producers held back by streams give up and waiting streams drain
+        self.frame_buffer.notify_streams()
+
         if self._capture_thread is not None:
             self._capture_thread.join(timeout=1)
             self._capture_thread = None
@@ -218,7 +445,7 @@ class D3DShot(metaclass=Singleton):
         self.displays = list()
 
     def _reset_frame_buffer(self):
-        self.frame_buffer = collections.deque(list(), self.frame_buffer_size)
+        self.frame_buffer.clear()
 
     def _validate_region(self, region):
         region = region or self.region or None
@@ -256,12 +483,199 @@ class D3DShot(metaclass=Singleton):
 
         return region
 
+    def _validate_regions(self, regions):
+        if regions is None:
+            return None
+
+        if not isinstance(regions, (list, tuple)) or not len(regions):
+            raise AttributeError("'regions' should be a non-empty list of 'region' tuples")
+
+        # Regions are validated 1 by one; 'self.region' doesn't stand in for any of them
+        regions = [self._validate_region(region) if region else None for region in regions]
+
+        if None in regions:
+            raise AttributeError("'regions' should be a non-empty list of 'region' tuples")
+
+        # Duplicates would share the same key in the returned dict
+        return list(dict.fromkeys(regions))
+
     def _validate_target_fps(self, target_fps):
         if not isinstance(target_fps, int) or target_fps < 1:
             raise AttributeError(f"'target_fps' should be an int greater than 0")
 
         return target_fps
 
+    def _validate_memory_policy(self, memory_policy):
+        if memory_policy is None:
+            memory_policy = "never"
+
+        if isinstance(memory_policy, str):
+            memory_policy = MemoryPolicy(mode=memory_policy)
+
+        if not isinstance(memory_policy, MemoryPolicy):
+            raise AttributeError("'memory_policy' should be a str or a MemoryPolicy instance")
+
+        return memory_policy
+
+    def _validate_conversion_workers(self, conversion_workers):
+        if not isinstance(conversion_workers, int) or conversion_workers < 0:
+            raise AttributeError("'conversion_workers' should be an int greater or equal to 0")
+
+        return conversion_workers
+
+    def _validate_staging_depth(self, staging_depth):
+        if not isinstance(staging_depth, int) or staging_depth < 1:
+            raise AttributeError("'staging_depth' should be an int greater or equal to 1")
+
+        return staging_depth
+
+    def _validate_displays(self, displays):
+        if displays is None:
+            return None
+
+        if isinstance(displays, Display):
+            displays = [displays]
+
+        if not isinstance(displays, (list, tuple)) or not len(displays):
+            raise AttributeError("'displays' should be a non-empty list of Display objects")
+
+        for display in displays:
+            if not isinstance(display, Display):
+                raise AttributeError("'displays' should be a non-empty list of Display objects")
+
+        if len(set(id(display) for display in displays)) != len(displays):
+            raise AttributeError("'displays' should not contain the same display more than once")
+
+        return list(displays)
+
+    def _create_display_workers(self, displays, region, timeout, target_fps, overrun_policy):
+        region = self._validate_region(region)
+
+        display_workers = list()
+
+        for i, display in enumerate(displays):
+            # The first display keeps using the main frame buffer
+            if i == 0:
+                frame_buffer = self.frame_buffer
+            else:
+                frame_buffer = FrameBuffer(
+                    self.frame_buffer_size, capture_output=self.capture_output
+                )
+
+            display_workers.append(
+                DisplayWorker(
+                    display,
+                    self.capture_output,
+                    frame_buffer,
+                    FrameScheduler(1 / target_fps, overrun_policy=overrun_policy),
+                    region=region,
+                    timeout=timeout,
+                )
+            )
+
+        return display_workers
+
+    def _validate_virtual_desktop_capture(self, lazy, conversion_workers, incremental, displays):
+        if lazy or conversion_workers > 0 or incremental or displays is not None:
+            raise AttributeError(
+                "'virtual_desktop' can't be used together with 'lazy', 'conversion_workers', 'incremental' or 'displays'"
+            )
+
+        if self.capture_output.resize is not None:
+            raise AttributeError("'virtual_desktop' can't be used with a resizing capture output")
+
+        if self.capture_output.layout.name != "hwc":
+            raise AttributeError("'virtual_desktop' requires the 'hwc' layout")
+
+    def _validate_regions_capture(
+        self, lazy, conversion_workers, incremental, displays, virtual_desktop
+    ):
+        if lazy or conversion_workers > 0 or incremental or displays is not None:
+            raise AttributeError(
+                "'regions' can't be used together with 'lazy', 'conversion_workers', 'incremental' or 'displays'"
+            )
+
+        if virtual_desktop:
+            raise AttributeError("'regions' can't be used together with 'virtual_desktop'")
+
+    def _get_incremental_frame(self, lazy, conversion_workers, staging_depth):
+        if lazy or conversion_workers > 0:
+            raise AttributeError(
+                "'incremental' can't be used together with 'lazy' or 'conversion_workers'"
+            )
+
+        # The changes applied have to be the ones of the frame being read back
+        if staging_depth > 1:
+            raise AttributeError("'incremental' requires a 'staging_depth' of 1")
+
+        from d3dshot.capture_outputs.numpy_capture_output import NumpyCaptureOutput
+
+        if type(self.capture_output.backend) is not NumpyCaptureOutput:
+            raise AttributeError("'incremental' is only supported by the 'numpy' capture output")
+
+        # Changed rects are applied at native resolution
+        if self.capture_output.resize is not None:
+            raise AttributeError("'incremental' can't be used with a resizing capture output")
+
+        if self.capture_output.layout.name != "hwc":
+            raise AttributeError("'incremental' requires the 'hwc' layout")
+
+        from d3dshot.incremental import IncrementalFrame
+
+        return IncrementalFrame(lambda: self.display.frame_metadata)
+
+    def _create_frame_stream(self, backpressure):
+        return FrameStream(
+            self.frame_buffer, backpressure=backpressure, is_active=lambda: self.is_capturing
+        )
+
+    def _iterate_frame_stream(self, stream, timeout):
+        try:
+            while True:
+                streamed_frame = stream.get(timeout=timeout)
+
+                if streamed_frame is None:
+                    return
+
+                yield self._resolve_streamed_frame(streamed_frame)
+        finally:
+            stream.close()
+
+    async def _aiterate_frame_stream(self, stream, timeout):
+        loop = asyncio.get_running_loop()
+
+        try:
+            while True:
+                # Waiting happens on an executor thread; The event loop is never blocked
+                streamed_frame = await loop.run_in_executor(None, stream.get, timeout)
+
+                if streamed_frame is None:
+                    return
+
+                yield self._resolve_streamed_frame(streamed_frame)
+        finally:
+            # Also wakes up a get() still waiting on the executor after a cancellation
+            stream.close()
+
+    def _resolve_streamed_frame(self, streamed_frame):
+        if isinstance(streamed_frame.frame, LazyFrame):
+            frame = streamed_frame.frame.resolve(self.capture_output.process)
+            return streamed_frame._replace(frame=frame)
+
+        return streamed_frame
+
+    def _validate_timeout(self, timeout):
+        if timeout is None:
+            return None
+
+        if isinstance(timeout, int):
+            timeout = float(timeout)
+
+        if not isinstance(timeout, float) or timeout < 0.0:
+            raise AttributeError("'timeout' should be one of (int, float) and be >= 0.0")
+
+        return timeout
+
     def _validate_directory(self, directory):
         if directory is None or not isinstance(directory, str):
             directory = "."
@@ -291,64 +705,227 @@ class D3DShot(metaclass=Singleton):
 
         return interval
 
-    def _capture(self, target_fps, region):
+    def _capture(self, region, virtual_desktop=False, regions=None):
         self._reset_frame_buffer()
 
-        frame_time = 1 / target_fps
+        if self.pipeline is not None:
+            self.pipeline.start()
+
+        self.scheduler.start()
+
+        previous_region = None
+
+        try:
+            while self.is_capturing:
+                if regions is not None:
+                    # The display is captured once for the box bounding all regions
+                    current_region = get_bounding_rect(regions)
+                else:
+                    current_region = self._validate_region(region)
+
+                # Frames whose changes don't touch the region are not processed; The latest is
+                # repeated
+                skip_unchanged = current_region == previous_region and len(self.frame_buffer) > 0
+
+                # Incremental updates need the changes of every frame
+                if self.incremental_frame is not None:
+                    skip_unchanged = False
+
+                previous_region = current_region
+
+                if self.pipeline is not None:
+                    self._capture_staged_frame(current_region, skip_unchanged)
+                elif self.staging_pool is not None:
+                    self._capture_raw_frame(current_region, skip_unchanged)
+                elif virtual_desktop:
+                    self._capture_virtual_desktop_frame(current_region)
+                else:
+                    self._capture_frame(current_region, skip_unchanged, regions=regions)
+
+                self.memory_policy.on_frame()
+                self.scheduler.wait()
+        finally:
+            try:
+                # Raises the conversion errors of the last frames
+                if self.pipeline is not None:
+                    self.pipeline.stop()
+            finally:
+                # Screenshots are always read back from the frame that was just acquired
+                for display in self.displays:
+                    display.capture_session.set_staging_depth(1)
+
+                self._is_capturing = False
+                self.frame_buffer.notify_streams()
+
+    def _capture_displays(self):
+        # The display workers and this thread all tick on the same deadlines
+        start_time = self.scheduler.clock()
+
+        for display_worker in self.display_workers:
+            display_worker.start(start_time=start_time)
+
+        self.scheduler.start(start_time=start_time)
+
+        try:
+            while self.is_capturing:
+                self.memory_policy.on_frame()
+                self.scheduler.wait()
+        finally:
+            for display_worker in self.display_workers:
+                display_worker.stop()
+                display_worker.display.capture_session.set_staging_depth(1)
+
+            self._is_capturing = False
+            self.frame_buffer.notify_streams()
+
+    def _capture_display(self, process_func, region, skip_unchanged):
+        try:
+            return self.display.capture(
+                process_func,
+                region=region,
+                skip_unchanged=skip_unchanged,
+                timeout=self.capture_timeout,
+            )
+        except DisplayAccessLostError:
+            # No frame until the display is usable again; The latest frame is repeated
+            return None
+
+    def _capture_staged_frame(self, region, skip_unchanged):
+        # Acquisition only; Conversion happens on the pipeline workers
+        raw_frame = self._capture_display(self.pipeline.stage, region, skip_unchanged)
+
+        self.pipeline.submit(
+            raw_frame,
+            timestamp=self.display.acquired_time,
+            is_current=not self.display.is_degraded,
+        )
 
-        while self.is_capturing:
-            cycle_start = time.time()
+    def _capture_raw_frame(self, region, skip_unchanged):
+        raw_frame = self._capture_display(self.staging_pool.stage, region, skip_unchanged)
 
-            frame = self.display.capture(
-                self.capture_output.process, region=self._validate_region(region)
+        if raw_frame is not None:
+            self.frame_buffer.appendleft(
+                LazyFrame(raw_frame, self.staging_pool), timestamp=self.display.acquired_time
             )
+        else:
+            self.frame_buffer.repeat_latest(is_current=not self.display.is_degraded)
 
-            if frame is not None:
-                self.frame_buffer.appendleft(frame)
-            else:
-                if len(self.frame_buffer):
-                    self.frame_buffer.appendleft(self.frame_buffer[0])
+    def _capture_frame(self, region, skip_unchanged, regions=None):
+        slot = self.frame_buffer.next_slot()
 
-            gc.collect()
+        process_func = self.capture_output.process
 
-            cycle_end = time.time()
+        if self.incremental_frame is not None:
+            process_func = self.incremental_frame.process
+        elif regions is not None:
+            process_func = functools.partial(self.capture_output.process_regions, regions)
 
-            frame_time_left = frame_time - (cycle_end - cycle_start)
+        try:
+            frame = self._capture_display(
+                functools.partial(process_func, out=slot), region, skip_unchanged
+            )
 
-            if frame_time_left > 0:
-                time.sleep(frame_time_left)
+            if frame is not None:
+                self.frame_buffer.appendleft(frame, timestamp=self.display.acquired_time)
+            else:
+                self.frame_buffer.repeat_latest(is_current=not self.display.is_degraded)
+        finally:
+            self.frame_buffer.release_slot(slot)
 
-        self._is_capturing = False
+    def _capture_virtual_desktop_frame(self, region):
+        # Displays are composed straight into the frame buffer slot when there is one
+        slot = self.frame_buffer.next_slot()
 
-    def _screenshot_every(self, interval, region):
-        self._reset_frame_buffer()
+        try:
+            frame = self.virtual_desktop.capture_frame(
+                region=region, timeout=self.capture_timeout, out=slot
+            )
 
-        while self.is_capturing:
-            cycle_start = time.time()
+            if frame is not None:
+                self.frame_buffer.appendleft(frame)
+            else:
+                self.frame_buffer.repeat_latest(is_current=not self.virtual_desktop.is_degraded)
+        finally:
+            self.frame_buffer.release_slot(slot)
+
+    def _pooled_capture(self, region, timeout=0, regions=None):
+        if regions is not None:
+            # Dicts of regions aren't pooled; The display is captured for the bounding box
+            return self.display.capture(
+                functools.partial(self.capture_output.process_regions, regions),
+                region=get_bounding_rect(regions),
+                timeout=timeout,
+            )
 
-            frame = self.screenshot(region=self._validate_region(region))
-            self.frame_buffer.appendleft(frame)
+        pooled_frame = self.frame_pool.acquire()
 
-            cycle_end = time.time()
+        frame = self.display.capture(
+            functools.partial(self.capture_output.process, out=pooled_frame),
+            region=region,
+            timeout=timeout,
+        )
 
-            time_left = interval - (cycle_end - cycle_start)
+        return self.frame_pool.track(frame, acquired_frame=pooled_frame)
 
-            if time_left > 0:
-                time.sleep(time_left)
+    def _wait_for_frame(self, region, timeout, regions=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
 
-        self._is_capturing = False
+        while True:
+            # Unbounded waits are done in 1 second slices so that the process stays interruptible
+            if deadline is None:
+                remaining = 1.0
+            else:
+                remaining = max(0.0, deadline - time.perf_counter())
 
-    def _screenshot_to_disk_every(self, interval, directory, region):
-        while self.is_capturing:
-            cycle_start = time.time()
+            try:
+                frame = self._pooled_capture(region, timeout=remaining, regions=regions)
+            except DisplayAccessLostError:
+                # The display keeps trying to recover until the deadline
+                if deadline is not None and time.perf_counter() >= deadline:
+                    raise
 
-            self.screenshot_to_disk(directory=directory, region=self._validate_region(region))
+                continue
 
-            cycle_end = time.time()
+            if frame is not None or (deadline is not None and time.perf_counter() >= deadline):
+                return frame
 
-            time_left = interval - (cycle_end - cycle_start)
+    def _screenshot_every(self, region):
+        self._reset_frame_buffer()
+        self.scheduler.start()
 
-            if time_left > 0:
-                time.sleep(time_left)
+        try:
+            while self.is_capturing:
+                try:
+                    frame = self.screenshot(region=self._validate_region(region))
+                except DisplayAccessLostError:
+                    frame = None
 
-        self._is_capturing = False
+                if frame is not None:
+                    self.frame_buffer.appendleft(frame)
+
+                    # The frame was copied into the frame buffer storage; Recycle it
+                    if self.frame_buffer.storage is not None:
+                        self.release(frame)
+                else:
+                    self.frame_buffer.repeat_latest(is_current=not self.display.is_degraded)
+
+                self.scheduler.wait()
+        finally:
+            self._is_capturing = False
+            self.frame_buffer.notify_streams()
+
+    def _screenshot_to_disk_every(self, directory, region):
+        self.scheduler.start()
+
+        try:
+            while self.is_capturing:
+                try:
+                    self.screenshot_to_disk(
+                        directory=directory, region=self._validate_region(region)
+                    )
+                except DisplayAccessLostError:
+                    pass
+
+                self.scheduler.wait()
+        finally:
+            self._is_capturing = False
@@ -1,10 +1,31 @@
+import functools
+import time
+
+import comtypes
+
 import d3dshot.dll.dxgi
 import d3dshot.dll.d3d
 import d3dshot.dll.user32
 import d3dshot.dll.shcore
 
+from d3dshot.capture_session import CaptureSession
+from d3dshot.frame_metadata import ChangeTracker
+from d3dshot.surface import get_surface_rect
+
+
+class DisplayCaptureError(BaseException):
+    pass
+
+
+class DisplayAccessLostError(DisplayCaptureError):
+    pass
+
 
 class Display:
+    # Seconds between attempts at rebuilding a lost desktop duplication. Doubles on every failure
+    minimum_recovery_backoff = 0.05
+    maximum_recovery_backoff = 2.0
+
     def __init__(
         self,
         name=None,
@@ -36,30 +57,180 @@ class Display:
         self.d3d_device = None
         self.d3d_device_context = None
 
+        self.change_tracker = ChangeTracker()
+
         self.dxgi_output_duplication = self._initialize_dxgi_output_duplication()
 
+        self.capture_session = CaptureSession(
+            self.dxgi_output_duplication, self.d3d_device, self.d3d_device_context
+        )
+
+        self.reinitializations = 0
+        self.failed_reinitializations = 0
+
+        self._degraded_since = None
+        self._degraded_time = 0.0
+
+        self._recovery_backoff = self.minimum_recovery_backoff
+        self._next_recovery_time = 0.0
+
     def __repr__(self):
         return f"<Display name={self.name} adapter={self.adapter_name} resolution={self.resolution[0]}x{self.resolution[1]} rotation={self.rotation} scale_factor={self.scale_factor} primary={self.is_primary}>"
 
-    def capture(self, process_func, region=None):
+    @property
+    def frame_number(self):
+        return self.change_tracker.frame_number
+
+    @property
+    def frame_metadata(self):
+        return self.change_tracker.frame_metadata
+
+    @property
+    def acquired_time(self):
+        # When the latest captured frame was acquired, not when it was processed
+        return self.capture_session.acquired_time
+
+    @property
+    def is_degraded(self):
+        return self._degraded_since is not None
+
+    @property
+    def degraded_time(self):
+        if self._degraded_since is None:
+            return self._degraded_time
+
+        return self._degraded_time + (time.perf_counter() - self._degraded_since)
+
+    @property
+    def stats(self):
+        return {
+            "reinitializations": self.reinitializations,
+            "failed_reinitializations": self.failed_reinitializations,
+            "degraded_time": self.degraded_time,
+            "is_degraded": self.is_degraded,
+        }
+
+    def capture(self, process_func, region=None, skip_unchanged=False, timeout=0):
+        if self.is_degraded:
+            timeout = self._recover(timeout)
+
         region = self._get_clean_region(region)
-        frame = None
+
+        frame_metadata_func = functools.partial(
+            self._track_frame_metadata,
+            get_surface_rect(self.resolution[0], self.resolution[1], region, self.rotation),
+            skip_unchanged,
+        )
 
         try:
-            frame = d3dshot.dll.dxgi.get_dxgi_output_duplication_frame(
-                self.dxgi_output_duplication,
-                self.d3d_device,
-                process_func=process_func,
+            frame = self.capture_session.capture(
+                process_func,
                 width=self.resolution[0],
                 height=self.resolution[1],
                 region=region,
                 rotation=self.rotation,
+                frame_metadata_func=frame_metadata_func,
+                timeout=timeout,
             )
-        except:
-            pass
+        except comtypes.COMError as e:
+            hresult = d3dshot.dll.dxgi.get_hresult(e)
+
+            # The output duplication is no longer usable (mode change, UAC prompt, fullscreen...)
+            if hresult in (
+                d3dshot.dll.dxgi.DXGI_ERROR_ACCESS_LOST,
+                d3dshot.dll.dxgi.DXGI_ERROR_INVALID_CALL,
+            ):
+                self._degrade()
+
+                raise DisplayAccessLostError(
+                    f"Lost access to the desktop duplication of {self.name} (HRESULT {hex(hresult)})"
+                )
+
+            raise DisplayCaptureError(f"Failed to capture {self.name} (HRESULT {hex(hresult)})")
 
         return frame
 
+    def has_changed(self, since, region=None):
+        region = self._get_clean_region(region)
+
+        return self.change_tracker.has_changed(
+            get_surface_rect(self.resolution[0], self.resolution[1], region, self.rotation), since
+        )
+
+    def _track_frame_metadata(self, surface_rect, skip_unchanged, frame_metadata_description):
+        frame_metadata = self.change_tracker.track(frame_metadata_description)
+
+        # Nothing to process when none of the changes touch the region
+        return not skip_unchanged or frame_metadata.intersects(surface_rect)
+
+    def _degrade(self):
+        if self._degraded_since is not None:
+            return
+
+        self._degraded_since = time.perf_counter()
+
+        # The first attempt at rebuilding the duplication is made right away
+        self._recovery_backoff = self.minimum_recovery_backoff
+        self._next_recovery_time = self._degraded_since
+
+    def _recover(self, timeout):
+        # Waits for up to 'timeout' seconds for the next recovery attempt. Returns what is left of
+        # 'timeout' once the desktop duplication was rebuilt
+        start_time = time.perf_counter()
+        wait_time = self._next_recovery_time - start_time
+
+        if wait_time > timeout:
+            time.sleep(timeout)
+
+            raise DisplayAccessLostError(
+                f"The desktop duplication of {self.name} is being recovered"
+            )
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+        if not self._reinitialize():
+            raise DisplayAccessLostError(
+                f"Failed to recover the desktop duplication of {self.name}"
+            )
+
+        return max(0.0, timeout - (time.perf_counter() - start_time))
+
+    def _reinitialize(self):
+        try:
+            # The display mode may have changed along with the duplication
+            dxgi_output_description = d3dshot.dll.dxgi.describe_dxgi_output(self.dxgi_output)
+
+            self.dxgi_output_duplication = self._initialize_dxgi_output_duplication()
+        except comtypes.COMError:
+            self.failed_reinitializations += 1
+
+            self._next_recovery_time = time.perf_counter() + self._recovery_backoff
+            self._recovery_backoff = min(self._recovery_backoff * 2, self.maximum_recovery_backoff)
+
+            return False
+
+        self.resolution = dxgi_output_description["resolution"]
+        self.position = dxgi_output_description["position"]
+        self.rotation = dxgi_output_description["rotation"]
+
+        self.capture_session = CaptureSession(
+            self.dxgi_output_duplication,
+            self.d3d_device,
+            self.d3d_device_context,
+            staging_depth=self.capture_session.staging_depth,
+        )
+
+        # Whatever changed while access was lost is unknown
+        self.change_tracker.invalidate()
+
+        self.reinitializations += 1
+
+        self._degraded_time += time.perf_counter() - self._degraded_since
+        self._degraded_since = None
+
+        return True
+
     def _initialize_dxgi_output_duplication(self):
         (self.d3d_device, self.d3d_device_context,) = d3dshot.dll.d3d.initialize_d3d_device(
             self.dxgi_adapter
@@ -0,0 +1,72 @@
+import functools
+import threading
+
+from d3dshot.display import DisplayAccessLostError
+
+
+class DisplayWorker:
+    def __init__(self, display, capture_output, frame_buffer, scheduler, region=None, timeout=0):
+        self.display = display
+        self.capture_output = capture_output
+        self.frame_buffer = frame_buffer
+        self.scheduler = scheduler
+
+        self.region = region
+        self.timeout = timeout
+
+        self._thread = None
+        self._is_capturing = False
+
+    @property
+    def is_capturing(self):
+        return self._is_capturing
+
+    def start(self, start_time=None):
+        self.frame_buffer.clear()
+
+        self._is_capturing = True
+
+        self._thread = threading.Thread(target=self._work, args=(start_time,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._is_capturing = False
+
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def capture(self, skip_unchanged=False):
+        slot = self.frame_buffer.next_slot()
+
+        try:
+            try:
+                frame = self.display.capture(
+                    functools.partial(self.capture_output.process, out=slot),
+                    region=self.region,
+                    skip_unchanged=skip_unchanged,
+                    timeout=self.timeout,
+                )
+            except DisplayAccessLostError:
+                # The latest frame is repeated but no longer known to be current
+                self.frame_buffer.repeat_latest(is_current=False)
+                return
+
+            # Skew between displays doesn't include conversion time
+            if frame is not None:
+                self.frame_buffer.appendleft(frame, timestamp=self.display.acquired_time)
+            else:
+                self.frame_buffer.repeat_latest()
+        finally:
+            self.frame_buffer.release_slot(slot)
+
+    def _work(self, start_time):
+        # Workers started with the same start time tick on the same deadlines
+        self.scheduler.start(start_time=start_time)
+
+        try:
+            while self.is_capturing:
+                self.capture(skip_unchanged=len(self.frame_buffer) > 0)
+                self.scheduler.wait()
+        finally:
+            self._is_capturing = False
@@ -282,6 +282,10 @@ def describe_d3d11_texture_2d(d3d11_texture_2d):
 def prepare_d3d11_texture_2d_for_cpu(d3d11_texture_2d, d3d_device):
     d3d11_texture_2d_description = describe_d3d11_texture_2d(d3d11_texture_2d)
 
+    return create_d3d11_texture_2d_for_cpu(d3d11_texture_2d_description, d3d_device)
+
+
+def create_d3d11_texture_2d_for_cpu(d3d11_texture_2d_description, d3d_device):
     d3d11_texture_2d_description_cpu = D3D11_TEXTURE2D_DESC()
 
     d3d11_texture_2d_description_cpu.Width = d3d11_texture_2d_description.Width
@@ -3,12 +3,13 @@ import ctypes.wintypes as wintypes
 
 import comtypes
 
-from d3dshot.dll.d3d import (
-    ID3D11Device,
-    ID3D11DeviceContext,
-    ID3D11Texture2D,
-    prepare_d3d11_texture_2d_for_cpu,
-)
+from d3dshot.dll.d3d import ID3D11Device, ID3D11Texture2D
+
+DXGI_ERROR_INVALID_CALL = 0x887A0001
+DXGI_ERROR_DEVICE_REMOVED = 0x887A0005
+DXGI_ERROR_ACCESS_LOST = 0x887A0026
+DXGI_ERROR_WAIT_TIMEOUT = 0x887A0027
+DXGI_ERROR_SESSION_DISCONNECTED = 0x887A0028
 
 
 class LUID(ctypes.Structure):
@@ -57,6 +58,10 @@ class DXGI_OUTDUPL_FRAME_INFO(ctypes.Structure):
     ]
 
 
+class DXGI_OUTDUPL_MOVE_RECT(ctypes.Structure):
+    _fields_ = [("SourcePoint", wintypes.POINT), ("DestinationRect", wintypes.RECT)]
+
+
 class DXGI_MAPPED_RECT(ctypes.Structure):
     _fields_ = [("Pitch", wintypes.INT), ("pBits", ctypes.POINTER(wintypes.FLOAT))]
 
@@ -112,8 +117,20 @@ class IDXGIOutputDuplication(IDXGIObject):
                 ctypes.POINTER(ctypes.POINTER(IDXGIResource)),
             ],
         ),
-        comtypes.STDMETHOD(comtypes.HRESULT, "GetFrameDirtyRects"),
-        comtypes.STDMETHOD(comtypes.HRESULT, "GetFrameMoveRects"),
+        comtypes.STDMETHOD(
+            comtypes.HRESULT,
+            "GetFrameDirtyRects",
+            [wintypes.UINT, ctypes.POINTER(wintypes.RECT), ctypes.POINTER(wintypes.UINT)],
+        ),
+        comtypes.STDMETHOD(
+            comtypes.HRESULT,
+            "GetFrameMoveRects",
+            [
+                wintypes.UINT,
+                ctypes.POINTER(DXGI_OUTDUPL_MOVE_RECT),
+                ctypes.POINTER(wintypes.UINT),
+            ],
+        ),
         comtypes.STDMETHOD(comtypes.HRESULT, "GetFramePointerShape"),
         comtypes.STDMETHOD(comtypes.HRESULT, "MapDesktopSurface"),
         comtypes.STDMETHOD(comtypes.HRESULT, "UnMapDesktopSurface"),
@@ -286,50 +303,106 @@ def initialize_dxgi_output_duplication(dxgi_output, d3d_device):
     return dxgi_output_duplication
 
 
-def get_dxgi_output_duplication_frame(
-    dxgi_output_duplication,
-    d3d_device,
-    process_func=None,
-    width=0,
-    height=0,
-    region=None,
-    rotation=0,
+def describe_dxgi_output_duplication_frame(
+    dxgi_output_duplication, dxgi_output_duplication_frame_information
 ):
+    frame_information = dxgi_output_duplication_frame_information
+
+    # None means the changed areas are unknown
+    dirty_rects = None
+    move_rects = None
+
+    buffer_size = frame_information.TotalMetadataBufferSize
+
+    if buffer_size > 0:
+        buffer = (ctypes.c_byte * buffer_size)()
+        buffer_size_required = wintypes.UINT()
+
+        try:
+            dxgi_output_duplication.GetFrameMoveRects(
+                buffer_size,
+                ctypes.cast(buffer, ctypes.POINTER(DXGI_OUTDUPL_MOVE_RECT)),
+                ctypes.byref(buffer_size_required),
+            )
+
+            move_rect_count = buffer_size_required.value // ctypes.sizeof(DXGI_OUTDUPL_MOVE_RECT)
+            move_rect_array = (DXGI_OUTDUPL_MOVE_RECT * move_rect_count).from_buffer(buffer)
+
+            move_rects = [
+                (
+                    (move_rect.SourcePoint.x, move_rect.SourcePoint.y),
+                    (
+                        move_rect.DestinationRect.left,
+                        move_rect.DestinationRect.top,
+                        move_rect.DestinationRect.right,
+                        move_rect.DestinationRect.bottom,
+                    ),
+                )
+                for move_rect in move_rect_array
+            ]
+
+            dxgi_output_duplication.GetFrameDirtyRects(
+                buffer_size,
+                ctypes.cast(buffer, ctypes.POINTER(wintypes.RECT)),
+                ctypes.byref(buffer_size_required),
+            )
+
+            dirty_rect_count = buffer_size_required.value // ctypes.sizeof(wintypes.RECT)
+            dirty_rect_array = (wintypes.RECT * dirty_rect_count).from_buffer(buffer)
+
+            dirty_rects = [
+                (dirty_rect.left, dirty_rect.top, dirty_rect.right, dirty_rect.bottom)
+                for dirty_rect in dirty_rect_array
+            ]
+        except comtypes.COMError:
+            dirty_rects = None
+            move_rects = None
+
+    return {
+        "present_time": frame_information.LastPresentTime,
+        "accumulated_frames": frame_information.AccumulatedFrames,
+        "rects_coalesced": bool(frame_information.RectsCoalesced),
+        "protected_content_masked_out": bool(frame_information.ProtectedContentMaskedOut),
+        "dirty_rects": dirty_rects,
+        "move_rects": move_rects,
+    }
+
+
+def acquire_dxgi_output_duplication_frame(dxgi_output_duplication, timeout=0):
     dxgi_output_duplication_frame_information = DXGI_OUTDUPL_FRAME_INFO()
     dxgi_resource = ctypes.POINTER(IDXGIResource)()
 
-    dxgi_output_duplication.AcquireNextFrame(
-        0, ctypes.byref(dxgi_output_duplication_frame_information), ctypes.byref(dxgi_resource),
-    )
-
-    frame = None
+    try:
+        dxgi_output_duplication.AcquireNextFrame(
+            timeout,
+            ctypes.byref(dxgi_output_duplication_frame_information),
+            ctypes.byref(dxgi_resource),
+        )
+    except comtypes.COMError as e:
+        # No new frame within 'timeout' milliseconds. There is no frame to release either
+        if get_hresult(e) == DXGI_ERROR_WAIT_TIMEOUT:
+            return None
 
-    if dxgi_output_duplication_frame_information.LastPresentTime > 0:
-        id3d11_texture_2d = dxgi_resource.QueryInterface(ID3D11Texture2D)
-        id3d11_texture_2d_cpu = prepare_d3d11_texture_2d_for_cpu(id3d11_texture_2d, d3d_device)
+        raise
 
-        d3d_device_context = ctypes.POINTER(ID3D11DeviceContext)()
-        d3d_device.GetImmediateContext(ctypes.byref(d3d_device_context))
+    return dxgi_output_duplication_frame_information, dxgi_resource
 
-        d3d_device_context.CopyResource(id3d11_texture_2d_cpu, id3d11_texture_2d)
 
-        id3d11_surface = id3d11_texture_2d_cpu.QueryInterface(IDXGISurface)
-        dxgi_mapped_rect = DXGI_MAPPED_RECT()
+def get_d3d11_texture_2d(dxgi_resource):
+    return dxgi_resource.QueryInterface(ID3D11Texture2D)
 
-        id3d11_surface.Map(ctypes.byref(dxgi_mapped_rect), 1)
 
-        pointer = dxgi_mapped_rect.pBits
-        pitch = int(dxgi_mapped_rect.Pitch)
+def get_dxgi_surface(d3d11_texture_2d):
+    return d3d11_texture_2d.QueryInterface(IDXGISurface)
 
-        if rotation in (0, 180):
-            size = pitch * height
-        else:
-            size = pitch * width
 
-        frame = process_func(pointer, pitch, size, width, height, region, rotation)
+def map_dxgi_surface(dxgi_surface):
+    dxgi_mapped_rect = DXGI_MAPPED_RECT()
+    dxgi_surface.Map(ctypes.byref(dxgi_mapped_rect), 1)
 
-        id3d11_surface.Unmap()
+    return dxgi_mapped_rect.pBits, int(dxgi_mapped_rect.Pitch)
 
-    dxgi_output_duplication.ReleaseFrame()
 
-    return frame
+def get_hresult(com_error):
+    # COMError.hresult is signed
+    return com_error.hresult & 0xFFFFFFFF
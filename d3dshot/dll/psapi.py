@@ -0,0 +1,40 @@
+import ctypes
+import ctypes.wintypes as wintypes
+
+
+class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+    _fields_ = [
+        ("cb", wintypes.DWORD),
+        ("PageFaultCount", wintypes.DWORD),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+
+def get_working_set_size():
+    get_current_process_func = ctypes.windll.kernel32.GetCurrentProcess
+    get_current_process_func.restype = wintypes.HANDLE
+
+    get_process_memory_info_func = ctypes.windll.psapi.GetProcessMemoryInfo
+    get_process_memory_info_func.argtypes = (
+        wintypes.HANDLE,
+        ctypes.POINTER(PROCESS_MEMORY_COUNTERS),
+        wintypes.DWORD,
+    )
+
+    process_memory_counters = PROCESS_MEMORY_COUNTERS()
+    process_memory_counters.cb = ctypes.sizeof(process_memory_counters)
+
+    get_process_memory_info_func(
+        get_current_process_func(),
+        ctypes.byref(process_memory_counters),
+        process_memory_counters.cb,
+    )
+
+    return process_memory_counters.WorkingSetSize
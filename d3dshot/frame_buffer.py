@@ -0,0 +1,391 @@
+import collections
+import itertools
+import threading
+import time
+import weakref
+
+from d3dshot.frame_stream import StreamedFrame
+from d3dshot.pipeline import LazyFrame
+
+
+class FrameBuffer:
+    def __init__(self, size, capture_output=None):
+        self.size = size
+        self.capture_output = capture_output
+
+        # Contiguous (size, ...) array / tensor when the capture output supports it. A dict of
+        # them, keyed by region, when frames are dicts of regions
+        self.storage = None
+
+        # Newest first. Storage slot indices when preallocated, the frames themselves otherwise
+        self._entries = collections.deque(list(), self.size)
+
+        # time.perf_counter() acquisition time of every entry, in the same order
+        self._timestamps = collections.deque(list(), self.size)
+
+        # Latest time every entry was known to still be the current frame, in the same order.
+        # Repeats move it forward; A static display stays current
+        self._valid_untils = collections.deque(list(), self.size)
+
+        # Sequence number of every entry, in the same order. Repeated entries share theirs
+        self._sequences = collections.deque(list(), self.size)
+
+        # Sequence number of the latest new frame, dropped or not. Never reset by clear()
+        self.sequence = 0
+
+        # Slots handed out by next_slot() that have not been appended / released yet
+        self._reservations = dict()
+
+        self._lock = threading.RLock()
+
+        # Notified on every new frame and every frame released by a stream
+        self.condition = threading.Condition(self._lock)
+
+        # Weak so that streams of abandoned iterators stop holding frames back
+        self._streams = weakref.WeakSet()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        with self._lock:
+            entry = self._entries[index]
+            return entry if self.storage is None else self._get_slot(entry)
+
+    def __iter__(self):
+        with self._lock:
+            return iter([self[i] for i in range(len(self._entries))])
+
+    def next_slot(self):
+        with self._lock:
+            # At least 1 slot is always kept out of reservations for frames that need copying
+            if self.storage is None or len(self._reservations) >= self.size - 1:
+                return None
+
+            slot = self._find_free_slot(len(self._reservations) + 1)
+
+            # Every slot holds a frame streams haven't released yet
+            if slot is None:
+                return None
+
+            frame = self._get_slot(slot)
+
+            self._reservations[id(frame)] = (slot, frame)
+
+            return frame
+
+    def release_slot(self, frame):
+        with self._lock:
+            if frame is not None:
+                self._reservations.pop(id(frame), None)
+
+    def appendleft(self, frame, timestamp=None):
+        if timestamp is None:
+            timestamp = time.perf_counter()
+
+        with self._lock:
+            self.sequence += 1
+            sequence = self.sequence
+
+            reservation = self._reservations.get(id(frame))
+
+            if reservation is not None and reservation[1] is frame:
+                del self._reservations[id(frame)]
+
+            if not self._wait_for_room():
+                # Dropped by the backpressure of a stream
+                if isinstance(frame, LazyFrame):
+                    frame.release()
+
+                return
+
+            if isinstance(frame, LazyFrame):
+                # Raw frames are converted on access; There is nothing to store them into
+                if self.storage is not None:
+                    self.clear()
+                    self.storage = None
+
+                self._append_entry(frame, timestamp, sequence)
+                return
+            elif reservation is not None and reservation[1] is frame:
+                slot = reservation[0]
+            else:
+                if self.storage is None:
+                    if not len(self._entries):
+                        self._allocate(frame)
+                elif not self._is_compatible(frame):
+                    self._allocate(frame)
+
+                if self.storage is None:
+                    self._append_entry(frame, timestamp, sequence)
+                    return
+
+                slot = self._make_room(len(self._reservations) + 1)
+
+                # Every slot holds a frame streams haven't released yet
+                if slot is None:
+                    return
+
+                self._copy_to_slot(frame, slot)
+
+            self._append_entry(slot, timestamp, sequence)
+
+    def repeat_latest(self, is_current=True):
+        # 'is_current' is False when the display image is unknown, e.g. while access is lost
+        valid_until = time.perf_counter()
+
+        with self._lock:
+            if not len(self._entries):
+                return
+
+            if not is_current:
+                valid_until = self._valid_untils[0]
+
+            # Repeats carry no new frame; They are never waited for
+            if self._has_room():
+                # The repeated frame keeps the timestamp of its acquisition
+                self._append_entry(
+                    self._entries[0], self._timestamps[0], self._sequences[0], valid_until
+                )
+            else:
+                self._valid_untils[0] = valid_until
+
+    def get_timestamp(self, index):
+        with self._lock:
+            if not 0 <= index < len(self._timestamps):
+                return None
+
+            return self._timestamps[index]
+
+    def get_valid_until(self, index):
+        with self._lock:
+            if not 0 <= index < len(self._valid_untils):
+                return None
+
+            return self._valid_untils[index]
+
+    def get_closest(self, timestamp):
+        # The frame that was current the closest to 'timestamp' along with how far from it it was
+        with self._lock:
+            if not len(self._entries):
+                return None, None
+
+            skews = [
+                max(acquired_time - timestamp, timestamp - valid_until, 0.0)
+                for acquired_time, valid_until in zip(self._timestamps, self._valid_untils)
+            ]
+
+            # Newest first on ties
+            index = min(range(len(skews)), key=lambda i: skews[i])
+
+            return self[index], skews[index]
+
+    def get_next(self, sequence):
+        # (entry, StreamedFrame) of the oldest buffered frame captured after 'sequence', if any
+        with self._lock:
+            for index in reversed(range(len(self._entries))):
+                if self._sequences[index] > sequence:
+                    return self._entries[index], StreamedFrame(
+                        self._sequences[index], self._timestamps[index], self[index]
+                    )
+
+            return None
+
+    def add_stream(self, stream):
+        with self._lock:
+            self._streams.add(stream)
+
+    def remove_stream(self, stream):
+        with self._lock:
+            self._streams.discard(stream)
+            self.condition.notify_all()
+
+    def notify_streams(self):
+        # Wakes up streams and producers waiting on them, e.g. when capture stops
+        with self._lock:
+            self.condition.notify_all()
+
+    def gather(self, frame_indices, stack_dimension):
+        with self._lock:
+            if self.storage is None:
+                return None
+
+            slots = [self._entries[i] for i in frame_indices if 0 <= i < len(self._entries)]
+
+            if isinstance(self.storage, dict):
+                return {
+                    key: self.capture_output.gather(storage, slots, stack_dimension)
+                    for key, storage in self.storage.items()
+                }
+
+            return self.capture_output.gather(self.storage, slots, stack_dimension)
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries:
+                if isinstance(entry, LazyFrame):
+                    entry.release()
+
+            self._entries.clear()
+            self._timestamps.clear()
+            self._valid_untils.clear()
+            self._sequences.clear()
+            self._reservations.clear()
+
+    def _append_entry(self, entry, timestamp, sequence, valid_until=None):
+        if isinstance(entry, LazyFrame):
+            entry.retain()
+
+        if len(self._entries) == self.size:
+            evicted_entry = self._entries.pop()
+
+            if isinstance(evicted_entry, LazyFrame):
+                evicted_entry.release()
+
+        self._entries.appendleft(entry)
+        self._timestamps.appendleft(timestamp)
+        self._valid_untils.appendleft(timestamp if valid_until is None else valid_until)
+        self._sequences.appendleft(sequence)
+
+        self.condition.notify_all()
+
+    def _make_room(self, pending):
+        slot = self._find_free_slot(pending)
+
+        protected_sequence = self._get_protected_sequence()
+
+        # Frames in use by streams keep their slot once evicted. The oldest entries give up theirs
+        # for the new frame, unless a stream still has to get them
+        while slot is None and len(self._entries):
+            if protected_sequence is not None and self._sequences[-1] >= protected_sequence:
+                break
+
+            self._pop_entry()
+
+            slot = self._find_free_slot(pending)
+
+        return slot
+
+    def _pop_entry(self):
+        entry = self._entries.pop()
+
+        self._timestamps.pop()
+        self._valid_untils.pop()
+        self._sequences.pop()
+
+        if isinstance(entry, LazyFrame):
+            entry.release()
+
+    def _get_protected_sequence(self):
+        # Frames from this sequence number on are held by streams with backpressure
+        sequences = [
+            stream.protected_sequence
+            for stream in self._streams
+            if stream.protected_sequence is not None
+        ]
+
+        return min(sequences) if len(sequences) else None
+
+    def _has_room(self):
+        # Appending evicts the oldest entry once full
+        if len(self._entries) < self.size:
+            return True
+
+        protected_sequence = self._get_protected_sequence()
+
+        return protected_sequence is None or self._sequences[-1] < protected_sequence
+
+    def _wait_for_room(self):
+        while not self._has_room():
+            holding_streams = [
+                stream
+                for stream in self._streams
+                if stream.protected_sequence is not None
+                and stream.protected_sequence <= self._sequences[-1]
+            ]
+
+            # Only active "block" streams make the producer wait; Others drop the new frame
+            if not all(
+                stream.backpressure == "block" and stream.is_active() for stream in holding_streams
+            ):
+                return False
+
+            self.condition.wait()
+
+        return True
+
+    def _allocate(self, frame):
+        self.clear()
+        self.storage = None
+
+        if self.capture_output is None:
+            return
+
+        if isinstance(frame, dict):
+            storage = {
+                key: self.capture_output.allocate(self.size, region_frame)
+                for key, region_frame in frame.items()
+                if region_frame is not None
+            }
+
+            # Every region has to be storable for the frames to be
+            if len(storage) == len(frame) and all(s is not None for s in storage.values()):
+                self.storage = storage
+        else:
+            self.storage = self.capture_output.allocate(self.size, frame)
+
+    def _is_compatible(self, frame):
+        if isinstance(self.storage, dict):
+            return (
+                isinstance(frame, dict)
+                and frame.keys() == self.storage.keys()
+                and all(_fits(self.storage[key], frame[key]) for key in frame)
+            )
+
+        return not isinstance(frame, dict) and _fits(self.storage, frame)
+
+    def _get_slot(self, slot):
+        if isinstance(self.storage, dict):
+            return {key: storage[slot] for key, storage in self.storage.items()}
+
+        return self.storage[slot]
+
+    def _copy_to_slot(self, frame, slot):
+        if isinstance(self.storage, dict):
+            for key, storage in self.storage.items():
+                storage[slot][...] = frame[key]
+        else:
+            self.storage[slot][...] = frame
+
+    def _find_free_slot(self, pending):
+        # Entries that will still be in the buffer once all pending frames are appended
+        retained = max(0, min(len(self._entries), self.size - pending))
+
+        referenced = set(itertools.islice(self._entries, retained))
+        referenced.update(slot for slot, _ in self._reservations.values())
+
+        # Frames in use by streams are never overwritten, nor are those held by backpressure
+        referenced.update(
+            stream.held_entry for stream in self._streams if isinstance(stream.held_entry, int)
+        )
+
+        protected_sequence = self._get_protected_sequence()
+
+        if protected_sequence is not None:
+            referenced.update(
+                entry
+                for entry, sequence in zip(self._entries, self._sequences)
+                if sequence >= protected_sequence
+            )
+
+        for slot in range(self.size):
+            if slot not in referenced:
+                return slot
+
+
+def _fits(storage, frame):
+    return (
+        frame is not None
+        and tuple(storage.shape[1:]) == tuple(frame.shape)
+        and storage.dtype == frame.dtype
+    )
@@ -0,0 +1,96 @@
+import collections
+import threading
+
+from d3dshot.surface import intersect_rects
+
+
+class FrameMetadata:
+    def __init__(
+        self,
+        frame_number=0,
+        present_time=0,
+        accumulated_frames=0,
+        rects_coalesced=False,
+        protected_content_masked_out=False,
+        dirty_rects=None,
+        move_rects=None,
+    ):
+        self.frame_number = frame_number
+
+        self.present_time = present_time
+        self.accumulated_frames = accumulated_frames
+
+        self.rects_coalesced = rects_coalesced
+        self.protected_content_masked_out = protected_content_masked_out
+
+        # Surface coordinates. None when the changed areas are unknown
+        self.dirty_rects = dirty_rects
+        self.move_rects = move_rects
+
+    def __repr__(self):
+        return f"<FrameMetadata frame_number={self.frame_number} present_time={self.present_time} accumulated_frames={self.accumulated_frames} dirty_rects={self.dirty_rect_count} move_rects={self.move_rect_count}>"
+
+    @property
+    def dirty_rect_count(self):
+        return len(self.dirty_rects) if self.dirty_rects is not None else None
+
+    @property
+    def move_rect_count(self):
+        return len(self.move_rects) if self.move_rects is not None else None
+
+    def intersects(self, rect):
+        if self.dirty_rects is None or self.move_rects is None:
+            return True
+
+        for dirty_rect in self.dirty_rects:
+            if intersect_rects(dirty_rect, rect) is not None:
+                return True
+
+        for _, destination_rect in self.move_rects:
+            if intersect_rects(destination_rect, rect) is not None:
+                return True
+
+        return False
+
+
+class ChangeTracker:
+    def __init__(self, history_size=600):
+        self.frame_number = 0
+        self.frame_metadata = None
+
+        self._history = collections.deque(list(), history_size)
+        self._lock = threading.Lock()
+
+    def track(self, frame_metadata_description):
+        with self._lock:
+            self.frame_number += 1
+
+            self.frame_metadata = FrameMetadata(
+                frame_number=self.frame_number, **frame_metadata_description
+            )
+
+            self._history.append(self.frame_metadata)
+
+            return self.frame_metadata
+
+    def invalidate(self):
+        # Records a frame whose changes are unknown
+        self.track(dict(dirty_rects=None, move_rects=None))
+
+    def has_changed(self, rect, since):
+        with self._lock:
+            if since >= self.frame_number:
+                return False
+
+            # Frames newer than 'since' are no longer in the history; Assume a change
+            if not len(self._history) or self._history[0].frame_number > since + 1:
+                return True
+
+            for frame_metadata in reversed(self._history):
+                if frame_metadata.frame_number <= since:
+                    break
+
+                if frame_metadata.intersects(rect):
+                    return True
+
+            return False
@@ -0,0 +1,101 @@
+import threading
+import weakref
+
+
+class FramePool:
+    def __init__(self, size=10):
+        self.size = size
+
+        self.hits = 0
+        self.misses = 0
+
+        # Free frames all share the shape and dtype of the most recent frame
+        self._key = None
+        self._available = list()
+
+        # Weak so that frames consumers never release can still be garbage collected
+        self._outstanding = weakref.WeakValueDictionary()
+
+        self._lock = threading.Lock()
+
+    @property
+    def outstanding(self):
+        return len(self._outstanding)
+
+    @property
+    def available(self):
+        return len(self._available)
+
+    @property
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "outstanding": self.outstanding,
+            "available": self.available,
+        }
+
+    def acquire(self):
+        with self._lock:
+            return self._available.pop() if len(self._available) else None
+
+    def track(self, frame, acquired_frame=None):
+        with self._lock:
+            # The capture output could not write into the acquired frame (or nothing was captured)
+            if acquired_frame is not None and frame is not acquired_frame:
+                self._make_available(acquired_frame)
+
+            if frame is None or self._get_key(frame) is None:
+                return frame
+
+            if acquired_frame is not None and frame is acquired_frame:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+            self._outstanding[id(frame)] = frame
+
+        return frame
+
+    def reclaim(self, frame):
+        # A frame handed out again (e.g. a repeated screenshot) is no longer free
+        with self._lock:
+            if self._get_key(frame) is None:
+                return frame
+
+            self._available = [f for f in self._available if f is not frame]
+            self._outstanding[id(frame)] = frame
+
+        return frame
+
+    def release(self, frame):
+        with self._lock:
+            if self._outstanding.get(id(frame)) is not frame:
+                return False
+
+            del self._outstanding[id(frame)]
+            self._make_available(frame)
+
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._key = None
+            self._available = list()
+
+    def _make_available(self, frame):
+        key = self._get_key(frame)
+
+        if key != self._key:
+            self._key = key
+            self._available = list()
+
+        if len(self._available) < self.size:
+            self._available.append(frame)
+
+    def _get_key(self, frame):
+        # Only arrays and tensors can be written into by the capture outputs
+        if not hasattr(frame, "shape") or not hasattr(frame, "dtype"):
+            return None
+
+        return (tuple(frame.shape), str(frame.dtype), str(getattr(frame, "device", "cpu")))
@@ -0,0 +1,110 @@
+import collections
+import time
+
+from d3dshot.pipeline import LazyFrame
+
+# A newly captured frame, its capture sequence number and its time.perf_counter() timestamp
+StreamedFrame = collections.namedtuple("StreamedFrame", ["sequence", "timestamp", "frame"])
+
+
+class FrameStream:
+    backpressures = ["drop_oldest", "drop_newest", "block"]
+
+    def __init__(self, frame_buffer, backpressure="drop_oldest", is_active=None):
+        if backpressure not in self.backpressures:
+            raise AttributeError(
+                f"Invalid Backpressure '{backpressure}'. Available Options: {', '.join(self.backpressures)}"
+            )
+
+        self.frame_buffer = frame_buffer
+        self.backpressure = backpressure
+
+        # Whether new frames can still be captured. Once it is not, get() returns None when drained
+        self.is_active = is_active or (lambda: True)
+
+        # Sequence number of the latest frame returned. Only frames captured from now on are
+        # streamed
+        self.sequence = frame_buffer.sequence
+
+        # Frames captured since subscribing that were never returned
+        self.dropped = 0
+
+        self.is_closed = False
+
+        # Frame buffer entry of the latest frame returned. It is in use, and never overwritten,
+        # until the next frame is requested
+        self.held_entry = None
+
+        self._held_frame = None
+
+        frame_buffer.add_stream(self)
+
+    def __repr__(self):
+        return f"<FrameStream backpressure={self.backpressure} sequence={self.sequence} dropped={self.dropped}>"
+
+    @property
+    def protected_sequence(self):
+        # Frames from this sequence number on can't be evicted or overwritten. None if any can
+        if self.backpressure == "drop_oldest" or self.is_closed:
+            return None
+
+        return self.sequence if self.held_entry is not None else self.sequence + 1
+
+    def get(self, timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+
+        with self.frame_buffer.condition:
+            self._release()
+
+            while not self.is_closed:
+                next_frame = self.frame_buffer.get_next(self.sequence)
+
+                if next_frame is not None:
+                    entry, streamed_frame = next_frame
+
+                    # Gaps are frames evicted before being streamed or dropped by backpressure
+                    self.dropped += streamed_frame.sequence - self.sequence - 1
+
+                    self.sequence = streamed_frame.sequence
+                    self._hold(entry, streamed_frame.frame)
+
+                    return streamed_frame
+
+                if not self.is_active():
+                    return None
+
+                # Woken up by the frame buffer on every new frame and when capture stops
+                if deadline is None:
+                    self.frame_buffer.condition.wait()
+                elif not self.frame_buffer.condition.wait(deadline - time.perf_counter()):
+                    return None
+
+            return None
+
+    def close(self):
+        with self.frame_buffer.condition:
+            self.is_closed = True
+
+            self._release()
+            self.frame_buffer.remove_stream(self)
+
+    def _hold(self, entry, frame):
+        # Raw frames stay staged until the frame is released, even if evicted meanwhile
+        if isinstance(frame, LazyFrame):
+            frame.retain()
+
+        self.held_entry = entry
+        self._held_frame = frame
+
+    def _release(self):
+        if self.held_entry is None:
+            return
+
+        if isinstance(self._held_frame, LazyFrame):
+            self._held_frame.release()
+
+        self.held_entry = None
+        self._held_frame = None
+
+        # Producers held back by the frame can go on
+        self.frame_buffer.condition.notify_all()
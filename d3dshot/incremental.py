@@ -0,0 +1,119 @@
+import numpy as np
+
+from d3dshot.conversion import bgra_to_rgb
+from d3dshot.surface import get_display_rect, intersect_rects, contains_rect
+
+
+class IncrementalFrame:
+    def __init__(self, get_frame_metadata):
+        # Returns the FrameMetadata of the frame being processed
+        self.get_frame_metadata = get_frame_metadata
+
+        # Persistent, converted frame of the capture region
+        self.frame = None
+
+        self.full_updates = 0
+        self.incremental_updates = 0
+
+        self._key = None
+        self._frame_number = None
+
+    def reset(self):
+        self.frame = None
+
+        self._key = None
+        self._frame_number = None
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        frame_metadata = self.get_frame_metadata()
+        key = (width, height, region, rotation)
+
+        if self._needs_full_update(frame_metadata, key):
+            self.frame = bgra_to_rgb(
+                pointer, pitch, width, height, region, rotation, out=self.frame
+            )
+            self._key = key
+
+            self.full_updates += 1
+        else:
+            apply_move_rects(
+                self.frame,
+                frame_metadata.move_rects,
+                width,
+                height,
+                region,
+                rotation,
+                fallback_func=lambda rect: self._update_rect(
+                    pointer, pitch, width, height, rect, rotation
+                ),
+            )
+
+            for dirty_rect in frame_metadata.dirty_rects:
+                display_rect = get_display_rect(width, height, dirty_rect, rotation)
+                self._update_rect(pointer, pitch, width, height, display_rect, rotation)
+
+            self.incremental_updates += 1
+
+        self._frame_number = frame_metadata.frame_number if frame_metadata is not None else None
+
+        if out is not None and out.shape == self.frame.shape and out.dtype == self.frame.dtype:
+            np.copyto(out, self.frame)
+            return out
+
+        return self.frame.copy()
+
+    def _needs_full_update(self, frame_metadata, key):
+        if self.frame is None or key != self._key:
+            return True
+
+        if frame_metadata is None or frame_metadata.dirty_rects is None:
+            return True
+
+        if frame_metadata.move_rects is None:
+            return True
+
+        # A frame was acquired without being applied; Its changes are unknown
+        return self._frame_number is None or frame_metadata.frame_number != self._frame_number + 1
+
+    def _update_rect(self, pointer, pitch, width, height, display_rect, rotation):
+        region = self._key[2]
+        rect = intersect_rects(display_rect, region)
+
+        if rect is None:
+            return
+
+        bgra_to_rgb(
+            pointer, pitch, width, height, rect, rotation, out=self.frame[_to_slice(rect, region)]
+        )
+
+
+def apply_move_rects(frame, move_rects, width, height, region, rotation, fallback_func=None):
+    # Move rects are in surface coordinates, 'frame' holds 'region' in display coordinates.
+    # Blits are done in place when the moved content is known, 'fallback_func' gets the
+    # destination display rect to refresh otherwise
+    for source_point, destination_rect in move_rects:
+        source_rect = (
+            source_point[0],
+            source_point[1],
+            source_point[0] + destination_rect[2] - destination_rect[0],
+            source_point[1] + destination_rect[3] - destination_rect[1],
+        )
+
+        source_rect = get_display_rect(width, height, source_rect, rotation)
+        destination_rect = get_display_rect(width, height, destination_rect, rotation)
+
+        if intersect_rects(destination_rect, region) is None:
+            continue
+
+        if contains_rect(region, source_rect) and contains_rect(region, destination_rect):
+            # NumPy handles the overlap between source and destination
+            frame[_to_slice(destination_rect, region)] = frame[_to_slice(source_rect, region)]
+        elif fallback_func is not None:
+            fallback_func(destination_rect)
+
+
+def _to_slice(rect, region):
+    return (
+        slice(rect[1] - region[1], rect[3] - region[1]),
+        slice(rect[0] - region[0], rect[2] - region[0]),
+    )
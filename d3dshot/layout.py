@@ -0,0 +1,53 @@
+class Layout:
+    layouts = ["hwc", "chw", "nchw"]
+
+    def __init__(self, name="hwc"):
+        if name not in self.layouts:
+            raise AttributeError(
+                f"Invalid Layout '{name}'. Available Options: {', '.join(self.layouts)}"
+            )
+
+        # Order of the frame dimensions. "nchw" frames are batches of 1 and stack into 1 batch
+        self.name = name
+
+    def __repr__(self):
+        return f"<Layout name={self.name}>"
+
+    @property
+    def is_batched(self):
+        return self.name == "nchw"
+
+    def get_shape(self, region, resize=None, channels=3):
+        # Shape of the frames of a (clean) region, in display orientation
+        width = region[2] - region[0]
+        height = region[3] - region[1]
+
+        if resize is not None:
+            width, height = resize.get_size(width, height)
+
+        if self.name == "hwc":
+            return (height, width, channels)
+        elif self.name == "chw":
+            return (channels, height, width)
+        elif self.name == "nchw":
+            return (1, channels, height, width)
+
+    def to_channels_last(self, frame):
+        # (height, width, channels) view of a NumPy frame in this layout; What kernels write into
+        if self.is_batched:
+            frame = frame[0]
+
+        if self.name != "hwc":
+            frame = frame.transpose(1, 2, 0)
+
+        return frame
+
+    def from_channels_last(self, image):
+        # View of a (height, width, channels) tensor in this layout
+        if self.name != "hwc":
+            image = image.permute(2, 0, 1)
+
+        if self.is_batched:
+            image = image[None]
+
+        return image
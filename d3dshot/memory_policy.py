@@ -0,0 +1,104 @@
+import gc
+import time
+
+import d3dshot.dll.psapi
+
+
+class MemoryPolicy:
+    modes = ["never", "every", "rss", "generation_0"]
+
+    def __init__(
+        self,
+        mode="never",
+        every=60,
+        rss_threshold=256 * 1024 * 1024,
+        rss_interval=0.5,
+        get_rss=None,
+        clock=None,
+    ):
+        if mode not in self.modes:
+            raise AttributeError(
+                f"Invalid Memory Policy '{mode}'. Available Options: {', '.join(self.modes)}"
+            )
+
+        if not isinstance(every, int) or every < 1:
+            raise AttributeError("'every' should be an int greater than 0")
+
+        if not isinstance(rss_interval, (int, float)) or rss_interval < 0:
+            raise AttributeError("'rss_interval' should be a number greater than or equal to 0")
+
+        self.mode = mode
+
+        # "every": Full collection every N frames
+        self.every = every
+
+        # "rss": Full collection when the working set grew by this many bytes since the last one
+        self.rss_threshold = rss_threshold
+        self.get_rss = get_rss or d3dshot.dll.psapi.get_working_set_size
+
+        # Seconds between working set samples. Sampling is a syscall; It isn't made every frame
+        self.rss_interval = rss_interval
+        self.clock = clock or time.perf_counter
+
+        self.reset()
+
+    def __repr__(self):
+        return f"<MemoryPolicy mode={self.mode} collections={self.collections} gc_time={round(self.gc_time, 6)}>"
+
+    @property
+    def stats(self):
+        return {
+            "frames": self.frame_count,
+            "collections": self.collections,
+            "collected": self.collected,
+            "gc_time": self.gc_time,
+        }
+
+    def reset(self):
+        self.frame_count = 0
+
+        self.collections = 0
+        self.collected = 0
+        self.gc_time = 0.0
+
+        self._rss_baseline = None
+        self._next_rss_sample_time = None
+
+    def on_frame(self):
+        self.frame_count += 1
+
+        generation = self._get_generation()
+
+        if generation is None:
+            return
+
+        start_time = time.perf_counter()
+        self.collected += gc.collect(generation)
+        self.gc_time += time.perf_counter() - start_time
+
+        self.collections += 1
+
+        if self.mode == "rss":
+            self._rss_baseline = self.get_rss()
+
+    def _get_generation(self):
+        if self.mode == "generation_0":
+            return 0
+        elif self.mode == "every":
+            return 2 if self.frame_count % self.every == 0 else None
+        elif self.mode == "rss":
+            now = self.clock()
+
+            if self._next_rss_sample_time is not None and now < self._next_rss_sample_time:
+                return None
+
+            self._next_rss_sample_time = now + self.rss_interval
+
+            rss = self.get_rss()
+
+            if self._rss_baseline is None:
+                self._rss_baseline = rss
+
+            return 2 if rss - self._rss_baseline > self.rss_threshold else None
+
+        return None
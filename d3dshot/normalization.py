@@ -0,0 +1,43 @@
+class Normalization:
+    dtypes = ["float32", "float16", "float64"]
+
+    def __init__(self, dtype="float32", mean=None, std=None):
+        if dtype not in self.dtypes:
+            raise AttributeError(
+                f"Invalid Float Dtype '{dtype}'. Available Options: {', '.join(self.dtypes)}"
+            )
+
+        self.dtype = dtype
+
+        # Per channel (R, G, B) statistics of the [0.0, 1.0] values, as used by ML preprocessing
+        self.mean = self._validate_statistic("mean", 0.0 if mean is None else mean)
+        self.std = self._validate_statistic("std", 1.0 if std is None else std)
+
+        if not all(value > 0.0 for value in self.std):
+            raise AttributeError("'std' values should be > 0.0")
+
+    def __repr__(self):
+        return f"<Normalization dtype={self.dtype} mean={self.mean} std={self.std}>"
+
+    @property
+    def coefficients(self):
+        # Per channel (scale, offset) turning a byte into ((byte / 255) - mean) / std
+        return [(1.0 / (255.0 * std), -mean / std) for mean, std in zip(self.mean, self.std)]
+
+    def _validate_statistic(self, name, value):
+        if isinstance(value, (int, float)):
+            value = (value, value, value)
+
+        if isinstance(value, list):
+            value = tuple(value)
+
+        if (
+            not isinstance(value, tuple)
+            or len(value) != 3
+            or not all(isinstance(v, (int, float)) for v in value)
+        ):
+            raise AttributeError(
+                f"'{name}' should be one of (int, float) or a 3-length tuple of them"
+            )
+
+        return tuple(float(v) for v in value)
@@ -0,0 +1,245 @@
+import ctypes
+import queue
+import threading
+import time
+
+from d3dshot.surface import get_address, get_surface_span
+
+
+class RawFrame:
+    def __init__(self, buffer, pointer, pitch, size, width, height, region, rotation):
+        # Keeps the staging memory alive for as long as the raw frame is around
+        self.buffer = buffer
+
+        self.pointer = pointer
+        self.pitch = pitch
+        self.size = size
+        self.width = width
+        self.height = height
+        self.region = region
+        self.rotation = rotation
+
+    def convert(self, process_func, out=None):
+        return process_func(
+            self.pointer,
+            self.pitch,
+            self.size,
+            self.width,
+            self.height,
+            self.region,
+            self.rotation,
+            out=out,
+        )
+
+
+class LazyFrame:
+    def __init__(self, raw_frame, staging_pool):
+        self.raw_frame = raw_frame
+        self.staging_pool = staging_pool
+
+        # Memoized result of the conversion
+        self.frame = None
+
+        self._references = 0
+        self._lock = threading.Lock()
+
+    def resolve(self, process_func):
+        with self._lock:
+            if self.frame is None and self.raw_frame is not None:
+                self.frame = self.raw_frame.convert(process_func)
+
+                # The raw bytes are never needed again
+                self._release_raw_frame()
+
+            return self.frame
+
+    def retain(self):
+        with self._lock:
+            self._references += 1
+
+    def release(self):
+        with self._lock:
+            self._references -= 1
+
+            if self._references <= 0:
+                self._release_raw_frame()
+                self.frame = None
+
+    def _release_raw_frame(self):
+        if self.raw_frame is not None:
+            self.staging_pool.release(self.raw_frame)
+            self.raw_frame = None
+
+
+class StagingPool:
+    def __init__(self, size):
+        self.size = size
+
+        self.dropped = 0
+
+        self._buffers = list()
+        self._buffer_count = 0
+
+        self._lock = threading.Lock()
+
+    def stage(self, pointer, pitch, size, width, height, region, rotation):
+        span = get_surface_span(pitch, width, height, region, rotation)
+
+        buffer = self._acquire(span.size)
+
+        if buffer is None:
+            self.dropped += 1
+            return None
+
+        # Only the surface rows covering the region are staged
+        ctypes.memmove(ctypes.addressof(buffer), get_address(pointer) + span.offset, span.size)
+
+        # Offset so that the capture outputs can address the staged rows exactly like they would
+        # address the mapped surface. Nothing outside of the span is ever dereferenced
+        staged_pointer = ctypes.addressof(buffer) - span.offset
+
+        return RawFrame(buffer, staged_pointer, pitch, size, width, height, region, rotation)
+
+    def release(self, raw_frame):
+        with self._lock:
+            self._buffers.append(raw_frame.buffer)
+
+    def _acquire(self, size):
+        with self._lock:
+            for i, buffer in enumerate(self._buffers):
+                if ctypes.sizeof(buffer) >= size:
+                    return self._buffers.pop(i)
+
+            if len(self._buffers) and self._buffer_count >= self.size:
+                # Every free buffer is too small (the region grew); Replace one
+                self._buffers.pop()
+                self._buffer_count -= 1
+
+            if self._buffer_count >= self.size:
+                return None
+
+            self._buffer_count += 1
+
+        return (ctypes.c_uint8 * size)()
+
+
+class ConversionPipeline:
+    def __init__(self, capture_output, frame_buffer, workers=2, max_in_flight=None):
+        self.capture_output = capture_output
+        self.frame_buffer = frame_buffer
+
+        self.workers = workers
+        self.max_in_flight = max_in_flight or workers * 2
+
+        self.staging_pool = StagingPool(self.max_in_flight)
+
+        self._queue = queue.Queue()
+        self._threads = list()
+
+        # Frames can finish converting in any order but are published in sequence order
+        self._completed = dict()
+        self._next_sequence = 0
+        self._next_published_sequence = 0
+
+        # Frames whose conversion raised. The first error not raised yet is kept for the capture
+        # thread
+        self.failed = 0
+        self._error = None
+
+        self._lock = threading.Lock()
+
+    @property
+    def dropped(self):
+        return self.staging_pool.dropped
+
+    def start(self):
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+
+            self._threads.append(thread)
+
+    def stop(self):
+        for _ in self._threads:
+            self._queue.put(None)
+
+        for thread in self._threads:
+            thread.join()
+
+        self._threads = list()
+
+        # Errors of the last frames converted are not left behind
+        self._raise_error()
+
+    def stage(self, pointer, pitch, size, width, height, region, rotation):
+        # Acquisition stage. Used as the process function of Display.capture
+        return self.staging_pool.stage(pointer, pitch, size, width, height, region, rotation)
+
+    def submit(self, raw_frame, timestamp=None, is_current=True):
+        # Conversion failures stop the capture thread, like they do without a pipeline
+        self._raise_error()
+
+        sequence = self._next_sequence
+        self._next_sequence += 1
+
+        # Frames are timestamped on acquisition, not on publication
+        if timestamp is None:
+            timestamp = time.perf_counter()
+
+        if raw_frame is None:
+            # 'is_current' is False when the display image is unknown, e.g. while access is lost
+            self._complete(sequence, None, None, timestamp, is_current=is_current)
+        else:
+            self._queue.put((sequence, raw_frame, self.frame_buffer.next_slot(), timestamp))
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+
+            if item is None:
+                break
+
+            sequence, raw_frame, slot, timestamp = item
+            frame = None
+            error = None
+
+            try:
+                frame = raw_frame.convert(self.capture_output.process, out=slot)
+            except Exception as e:
+                error = e
+            finally:
+                self.staging_pool.release(raw_frame)
+
+            self._complete(sequence, frame, slot, timestamp, error=error)
+
+    def _complete(self, sequence, frame, slot, timestamp, is_current=True, error=None):
+        with self._lock:
+            if error is not None:
+                self.failed += 1
+
+                if self._error is None:
+                    self._error = error
+
+            self._completed[sequence] = (frame, slot, timestamp, is_current)
+
+            while self._next_published_sequence in self._completed:
+                frame, slot, timestamp, is_current = self._completed.pop(
+                    self._next_published_sequence
+                )
+
+                if frame is not None:
+                    self.frame_buffer.appendleft(frame, timestamp=timestamp)
+                else:
+                    self.frame_buffer.repeat_latest(is_current=is_current)
+
+                self.frame_buffer.release_slot(slot)
+
+                self._next_published_sequence += 1
+
+    def _raise_error(self):
+        with self._lock:
+            error = self._error
+            self._error = None
+
+        if error is not None:
+            raise error
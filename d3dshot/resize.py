@@ -0,0 +1,49 @@
+class Resize:
+    methods = ["nearest", "area", "bilinear"]
+
+    def __init__(self, size=None, scale=None, method="area"):
+        if (size is None) == (scale is None):
+            raise AttributeError("Exactly one of 'size' and 'scale' should be set")
+
+        if size is not None:
+            if isinstance(size, list):
+                size = tuple(size)
+
+            if (
+                not isinstance(size, tuple)
+                or len(size) != 2
+                or not all(isinstance(value, int) and value > 0 for value in size)
+            ):
+                raise AttributeError(
+                    "'size' is expected to be a (width, height) tuple of ints > 0"
+                )
+
+        if scale is not None:
+            if isinstance(scale, int):
+                scale = float(scale)
+
+            if not isinstance(scale, float) or scale <= 0.0:
+                raise AttributeError("'scale' should be one of (int, float) and be > 0.0")
+
+        if method not in self.methods:
+            raise AttributeError(
+                f"Invalid Resize Method '{method}'. Available Options: {', '.join(self.methods)}"
+            )
+
+        # Fixed (width, height) of every frame, or a factor applied to the size of the region
+        self.size = size
+        self.scale = scale
+
+        self.method = method
+
+    def __repr__(self):
+        if self.size is not None:
+            return f"<Resize size={self.size[0]}x{self.size[1]} method={self.method}>"
+
+        return f"<Resize scale={self.scale} method={self.method}>"
+
+    def get_size(self, width, height):
+        if self.size is not None:
+            return self.size
+
+        return (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
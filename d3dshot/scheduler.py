@@ -0,0 +1,137 @@
+import collections
+import time
+
+
+class FrameScheduler:
+    overrun_policies = ["skip", "catch_up"]
+
+    def __init__(
+        self,
+        interval,
+        overrun_policy="skip",
+        spin_duration=0.0005,
+        catch_up_limit=10,
+        sample_size=1000,
+        clock=time.perf_counter_ns,
+        sleep=time.sleep,
+    ):
+        if overrun_policy not in self.overrun_policies:
+            raise AttributeError(
+                f"Invalid Overrun Policy '{overrun_policy}'. Available Options: {', '.join(self.overrun_policies)}"
+            )
+
+        self.interval = int(interval * 1e9)
+        self.overrun_policy = overrun_policy
+
+        # The last stretch before a deadline is busy-waited since OS sleeps tend to overshoot
+        self.spin_duration = int(spin_duration * 1e9)
+        self.catch_up_limit = catch_up_limit
+
+        self.clock = clock
+        self.sleep = sleep
+
+        self.frame_count = 0
+        self.missed_deadlines = 0
+        self.skipped_frames = 0
+
+        self._lateness = collections.deque(list(), sample_size)
+        self._oversleep = 0
+
+        self._start_time = None
+        self._deadline = None
+
+    def __repr__(self):
+        return f"<FrameScheduler fps={round(self.fps, 3)} missed_deadlines={self.missed_deadlines} skipped_frames={self.skipped_frames}>"
+
+    @property
+    def fps(self):
+        if self._start_time is None or self.frame_count == 0:
+            return 0.0
+
+        elapsed = self.clock() - self._start_time
+
+        return self.frame_count / (elapsed / 1e9) if elapsed > 0 else 0.0
+
+    @property
+    def stats(self):
+        return {
+            "fps": self.fps,
+            "frames": self.frame_count,
+            "missed_deadlines": self.missed_deadlines,
+            "skipped_frames": self.skipped_frames,
+            "jitter_p50_ms": self._get_jitter_percentile(50),
+            "jitter_p90_ms": self._get_jitter_percentile(90),
+            "jitter_p99_ms": self._get_jitter_percentile(99),
+        }
+
+    def start(self, start_time=None):
+        self.frame_count = 0
+        self.missed_deadlines = 0
+        self.skipped_frames = 0
+
+        self._lateness.clear()
+
+        # Deadlines are absolute so timing error never accumulates. Schedulers sharing a start time
+        # share their deadlines
+        self._start_time = self.clock() if start_time is None else start_time
+        self._deadline = self._start_time + self.interval
+
+    def wait(self):
+        if self._deadline is None:
+            self.start()
+
+        now = self.clock()
+
+        if now < self._deadline:
+            now = self._wait_until(self._deadline)
+        else:
+            self.missed_deadlines += 1
+
+        self.frame_count += 1
+        self._lateness.append(now - self._deadline)
+
+        self._advance(now)
+
+    def _wait_until(self, deadline):
+        remaining = deadline - self.clock()
+        sleep_duration = remaining - max(self.spin_duration, self._oversleep)
+
+        if sleep_duration > 0:
+            wake_time = self.clock() + sleep_duration
+            self.sleep(sleep_duration / 1e9)
+
+            # Moving estimate of how late sleeps return
+            oversleep = self.clock() - wake_time
+            self._oversleep = max(0, int(self._oversleep * 0.9 + oversleep * 0.1))
+
+        now = self.clock()
+
+        while now < deadline:
+            now = self.clock()
+
+        return now
+
+    def _advance(self, now):
+        self._deadline += self.interval
+
+        if self._deadline > now:
+            return
+
+        missed_intervals = (now - self._deadline) // self.interval + 1
+
+        if self.overrun_policy == "catch_up" and missed_intervals <= self.catch_up_limit:
+            # Frames that are due are run back-to-back until the schedule is caught up
+            return
+
+        # Drop the frames that were due and resume on the next deadline of the original grid
+        self.skipped_frames += missed_intervals
+        self._deadline += missed_intervals * self.interval
+
+    def _get_jitter_percentile(self, percentile):
+        if not len(self._lateness):
+            return 0.0
+
+        lateness = sorted(self._lateness)
+        index = min(len(lateness) - 1, int(round(percentile / 100 * (len(lateness) - 1))))
+
+        return lateness[index] / 1e6
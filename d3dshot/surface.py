@@ -0,0 +1,86 @@
+import collections
+import ctypes
+
+# Portion of a mapped surface covering a region. 'offset' and 'size' are in bytes and always
+# cover whole surface rows; 'column' and 'columns' are in pixels, within those rows
+SurfaceSpan = collections.namedtuple(
+    "SurfaceSpan", ["offset", "size", "row", "rows", "column", "columns"]
+)
+
+
+def get_surface_rect(width, height, region, rotation):
+    left, top, right, bottom = region
+
+    # The surface is laid out in the unrotated orientation of the display
+    if rotation == 0:
+        return (left, top, right, bottom)
+    elif rotation == 90:
+        return (top, width - right, bottom, width - left)
+    elif rotation == 180:
+        return (width - right, height - bottom, width - left, height - top)
+    elif rotation == 270:
+        return (height - bottom, left, height - top, right)
+
+
+def get_display_rect(width, height, surface_rect, rotation):
+    left, top, right, bottom = surface_rect
+
+    # Inverse of get_surface_rect
+    if rotation == 0:
+        return (left, top, right, bottom)
+    elif rotation == 90:
+        return (width - bottom, left, width - top, right)
+    elif rotation == 180:
+        return (width - right, height - bottom, width - left, height - top)
+    elif rotation == 270:
+        return (top, height - right, bottom, height - left)
+
+
+def get_surface_span(pitch, width, height, region, rotation):
+    left, top, right, bottom = get_surface_rect(width, height, region, rotation)
+
+    return SurfaceSpan(
+        offset=top * pitch,
+        size=(bottom - top) * pitch,
+        row=top,
+        rows=bottom - top,
+        column=left,
+        columns=right - left,
+    )
+
+
+def intersect_rects(rect, other_rect):
+    left = max(rect[0], other_rect[0])
+    top = max(rect[1], other_rect[1])
+    right = min(rect[2], other_rect[2])
+    bottom = min(rect[3], other_rect[3])
+
+    if left >= right or top >= bottom:
+        return None
+
+    return (left, top, right, bottom)
+
+
+def contains_rect(rect, other_rect):
+    return (
+        rect[0] <= other_rect[0]
+        and rect[1] <= other_rect[1]
+        and rect[2] >= other_rect[2]
+        and rect[3] >= other_rect[3]
+    )
+
+
+def get_bounding_rect(rects):
+    return (
+        min(rect[0] for rect in rects),
+        min(rect[1] for rect in rects),
+        max(rect[2] for rect in rects),
+        max(rect[3] for rect in rects),
+    )
+
+
+def get_address(pointer):
+    if isinstance(pointer, int):
+        return pointer
+
+    return ctypes.cast(pointer, ctypes.c_void_p).value
@@ -0,0 +1,87 @@
+import ctypes
+import threading
+
+import torch
+
+
+class PinnedUploader:
+    def __init__(self, device, pool_size=2):
+        self.device = torch.device(device)
+        self.pool_size = pool_size
+
+        # Without CUDA, staging buffers are pageable and uploads are plain synchronous copies
+        self.is_async = self.device.type == "cuda" and torch.cuda.is_available()
+
+        # Uploads run on their own stream so they overlap with work queued on the current one
+        self.stream = torch.cuda.Stream(device=self.device) if self.is_async else None
+
+        # Host staging buffers, used in turn, and the events of their latest upload
+        self.buffers = [None] * self.pool_size
+        self.events = [None] * self.pool_size
+
+        self.uploads = 0
+        self.allocations = 0
+
+        self._next_buffer = 0
+
+        # Conversion workers may upload concurrently
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<PinnedUploader device={self.device} pool_size={self.pool_size} async={self.is_async}>"
+
+    @property
+    def stats(self):
+        return {"uploads": self.uploads, "allocations": self.allocations}
+
+    def upload(self, address, size):
+        # 'size' bytes at 'address' as a 1D uint8 tensor on the device
+        with self._lock:
+            return self._upload(address, size)
+
+    def upload_tensor(self, tensor):
+        tensor = tensor.contiguous()
+
+        uploaded = self.upload(tensor.data_ptr(), tensor.numel() * tensor.element_size())
+
+        return uploaded.view(tensor.dtype).view(tensor.shape)
+
+    def _upload(self, address, size):
+        index = self._next_buffer
+        self._next_buffer = (index + 1) % self.pool_size
+
+        staged = self._get_buffer(index, size)[:size]
+        ctypes.memmove(staged.data_ptr(), address, size)
+
+        self.uploads += 1
+
+        if not self.is_async:
+            # The staging buffer is reused; The frame can't be a view of it
+            return staged.to(self.device, copy=True)
+
+        with torch.cuda.stream(self.stream):
+            tensor = staged.to(self.device, non_blocking=True)
+
+            if self.events[index] is None:
+                self.events[index] = torch.cuda.Event()
+
+            self.events[index].record(self.stream)
+
+        # Work queued on the current stream waits for the upload; The host doesn't
+        current_stream = torch.cuda.current_stream(self.device)
+        current_stream.wait_stream(self.stream)
+
+        tensor.record_stream(current_stream)
+
+        return tensor
+
+    def _get_buffer(self, index, size):
+        # The previous upload out of this buffer has to be done before it is overwritten
+        if self.events[index] is not None:
+            self.events[index].synchronize()
+
+        if self.buffers[index] is None or self.buffers[index].numel() < size:
+            self.buffers[index] = torch.empty((size,), dtype=torch.uint8, pin_memory=self.is_async)
+            self.allocations += 1
+
+        return self.buffers[index]
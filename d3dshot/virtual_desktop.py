@@ -0,0 +1,221 @@
+import functools
+
+from d3dshot.display import DisplayAccessLostError
+
+
+class VirtualDesktop:
+    def __init__(self, displays, capture_output):
+        self.displays = displays
+        self.capture_output = capture_output
+
+        # Preallocated frame the displays are composed into. Reallocated on region size changes
+        self.canvas = None
+
+        self._canvas_region = None
+
+        # Latest frame composed by capture_frame() and its region
+        self._frame = None
+        self._frame_region = None
+
+    def __repr__(self):
+        return f"<VirtualDesktop displays={len(self.displays)} resolution={self.resolution[0]}x{self.resolution[1]}>"
+
+    @property
+    def position(self):
+        # Bounding box of all displays in desktop coordinates
+        return {
+            "left": min(display.position["left"] for display in self.displays),
+            "top": min(display.position["top"] for display in self.displays),
+            "right": max(display.position["right"] for display in self.displays),
+            "bottom": max(display.position["bottom"] for display in self.displays),
+        }
+
+    @property
+    def resolution(self):
+        position = self.position
+
+        return (position["right"] - position["left"], position["bottom"] - position["top"])
+
+    @property
+    def is_degraded(self):
+        # Areas of degraded displays hold their latest frame until access is recovered
+        return any(display.is_degraded for display in self.displays)
+
+    def capture(self, region=None, timeout=0):
+        region = self._validate_region(region)
+
+        if region != self._canvas_region:
+            self.canvas = None
+            self._canvas_region = region
+
+        # Displays without a new frame keep their latest content in the canvas
+        canvas = self._compose(region, timeout, self.canvas, self.canvas)
+
+        if canvas is not None:
+            self.canvas = canvas
+
+        return self.canvas
+
+    def capture_frame(self, region=None, timeout=0, out=None):
+        # Composes a new frame into 'out', e.g. a frame buffer slot, or into a new canvas. Areas of
+        # displays without a new frame are copied from the previous one. None when no display has
+        # a new frame
+        region = self._validate_region(region)
+
+        if region != self._frame_region:
+            self._frame = None
+            self._frame_region = region
+
+        frame = self._compose(region, timeout, out, self._frame)
+
+        if frame is not None:
+            self._frame = frame
+
+        return frame
+
+    def _validate_region(self, region):
+        # Displays are composed pixel for pixel
+        if self.capture_output.resize is not None:
+            raise AttributeError(
+                "The virtual desktop can't be captured with a resizing capture output"
+            )
+
+        # Canvases are composed in (height, width, channels) frames
+        if self.capture_output.layout.name != "hwc":
+            raise AttributeError("The virtual desktop can only be captured in the 'hwc' layout")
+
+        return self._get_clean_region(region)
+
+    def _compose(self, region, timeout, canvas, previous):
+        width = region[2] - region[0]
+        height = region[3] - region[1]
+
+        # 'canvas' may hold anything until composed; A new canvas is blank
+        is_blank = canvas is None
+
+        display_regions = self._get_display_regions(region)
+        stale_rects = list()
+
+        for display, display_region, canvas_rect in display_regions:
+            view = None
+
+            if canvas is not None:
+                view = self.capture_output.get_canvas_view(canvas, canvas_rect)
+
+            try:
+                frame = display.capture(
+                    functools.partial(self.capture_output.process, out=view),
+                    region=display_region,
+                    timeout=timeout,
+                )
+            except DisplayAccessLostError:
+                frame = None
+
+            if frame is None:
+                stale_rects.append(canvas_rect)
+                continue
+
+            if canvas is None:
+                canvas = self.capture_output.allocate_canvas(frame, width, height)
+
+            if view is None or frame is not view:
+                canvas = self.capture_output.paste(canvas, frame, canvas_rect[0], canvas_rect[1])
+
+        if len(stale_rects) == len(display_regions) or canvas is previous:
+            return canvas if len(stale_rects) < len(display_regions) else None
+
+        # Only the areas of displays without a new frame are copied, never the whole canvas
+        for rect in stale_rects:
+            if previous is not None:
+                canvas = self.capture_output.paste(
+                    canvas, self.capture_output.crop(previous, rect), rect[0], rect[1]
+                )
+            elif not is_blank:
+                self.capture_output.get_canvas_view(canvas, rect)[...] = 0
+
+        # Areas not covered by any display are black
+        if not is_blank:
+            for rect in _get_uncovered_rects(
+                width, height, [canvas_rect for _, _, canvas_rect in display_regions]
+            ):
+                self.capture_output.get_canvas_view(canvas, rect)[...] = 0
+
+        return canvas
+
+    def _get_display_regions(self, region):
+        position = self.position
+
+        # Region in desktop coordinates
+        left = region[0] + position["left"]
+        top = region[1] + position["top"]
+        right = region[2] + position["left"]
+        bottom = region[3] + position["top"]
+
+        display_regions = list()
+
+        for display in self.displays:
+            intersection = (
+                max(left, display.position["left"]),
+                max(top, display.position["top"]),
+                min(right, display.position["right"]),
+                min(bottom, display.position["bottom"]),
+            )
+
+            # Displays outside of the region are never captured
+            if intersection[0] >= intersection[2] or intersection[1] >= intersection[3]:
+                continue
+
+            display_region = (
+                intersection[0] - display.position["left"],
+                intersection[1] - display.position["top"],
+                intersection[2] - display.position["left"],
+                intersection[3] - display.position["top"],
+            )
+
+            canvas_rect = (
+                intersection[0] - left,
+                intersection[1] - top,
+                intersection[2] - left,
+                intersection[3] - top,
+            )
+
+            display_regions.append((display, display_region, canvas_rect))
+
+        return display_regions
+
+    def _get_clean_region(self, region):
+        width, height = self.resolution
+
+        if region is None:
+            return (0, 0, width, height)
+
+        return (
+            max(0, min(region[0], width)),
+            max(0, min(region[1], height)),
+            max(0, min(region[2], width)),
+            max(0, min(region[3], height)),
+        )
+
+
+def _get_uncovered_rects(width, height, rects):
+    # Rects of a (width, height) area that none of 'rects' cover, band by band
+    uncovered_rects = list()
+
+    edges = sorted({0, height} | {rect[1] for rect in rects} | {rect[3] for rect in rects})
+
+    for top, bottom in zip(edges, edges[1:]):
+        if top < 0 or bottom > height:
+            continue
+
+        left = 0
+
+        for rect in sorted(rect for rect in rects if rect[1] <= top and rect[3] >= bottom):
+            if rect[0] > left:
+                uncovered_rects.append((left, top, rect[0], bottom))
+
+            left = max(left, rect[2])
+
+        if left < width:
+            uncovered_rects.append((left, top, width, bottom))
+
+    return uncovered_rects
@@ -0,0 +1,20 @@
+import pytest
+
+from tests.shims import install_comtypes
+
+install_comtypes()
+
+from tests.fakes import FakeClock, FakeDesktop
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def desktop(monkeypatch):
+    desktop = FakeDesktop()
+    desktop.patch(monkeypatch)
+
+    return desktop
@@ -0,0 +1,279 @@
+import collections
+import ctypes
+import types
+
+import comtypes
+
+import d3dshot.dll.dxgi
+import d3dshot.dll.d3d
+
+
+class FakeClock:
+    # Stands in for time.perf_counter(_ns) and time.sleep. Time only moves when slept through or
+    # advanced, plus 'tick' nanoseconds per reading so that busy-waits end
+    def __init__(self, tick=1, oversleep=0):
+        self.now = 0
+        self.tick = tick
+
+        # How late every sleep returns, in seconds
+        self.oversleep = oversleep
+
+        self.sleeps = list()
+
+    def perf_counter_ns(self):
+        self.now += self.tick
+        return self.now
+
+    def perf_counter(self):
+        return self.perf_counter_ns() / 1e9
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.advance(seconds + self.oversleep)
+
+    def advance(self, seconds):
+        self.now += int(round(seconds * 1e9))
+
+
+class FakeSurface:
+    # Mapped BGRA surface of a 'width' x 'height' display, laid out unrotated with a padded pitch
+    # and filled with random pixels
+    def __init__(self, width, height, rotation=0, padding=16, seed=0):
+        import numpy as np
+
+        self.width = width
+        self.height = height
+        self.rotation = rotation
+
+        if rotation in (0, 180):
+            self.surface_width, self.surface_height = width, height
+        else:
+            self.surface_width, self.surface_height = height, width
+
+        self.pitch = self.surface_width * 4 + padding
+
+        self.pixels = np.random.RandomState(seed).randint(
+            0, 256, (self.surface_height, self.pitch), dtype=np.uint8
+        )
+
+        self.pointer = ctypes.cast(self.pixels.ctypes.data, ctypes.POINTER(ctypes.c_float))
+
+    @property
+    def surface_image(self):
+        # Writable (surface_height, surface_width, 4) BGRA view of the surface, unrotated
+        return self.pixels[:, : self.surface_width * 4].reshape(
+            (self.surface_height, self.surface_width, 4)
+        )
+
+    @property
+    def image(self):
+        # The (height, width, 4) BGRA image in display orientation
+        import numpy as np
+
+        return np.rot90(self.surface_image, -self.rotation // 90)
+
+    def get_rgb(self, region=None):
+        left, top, right, bottom = region or (0, 0, self.width, self.height)
+
+        return self.image[top:bottom, left:right, [2, 1, 0]]
+
+    def process(self, process_func, region=None, **kwargs):
+        region = region or (0, 0, self.width, self.height)
+
+        return process_func(
+            self.pointer,
+            self.pitch,
+            self.pixels.size,
+            self.width,
+            self.height,
+            region,
+            self.rotation,
+            **kwargs,
+        )
+
+
+class FakeTexture:
+    # Desktop image or staging texture holding pitch-padded BGRA pixels, all set to one value
+    def __init__(self, width, height, format=87, value=0, padding=16):
+        self.description = types.SimpleNamespace(Width=width, Height=height, Format=format)
+
+        self.pitch = width * 4 + padding
+        self.pixels = (ctypes.c_ubyte * (self.pitch * height))()
+
+        ctypes.memset(self.pixels, value, len(self.pixels))
+
+        self.is_mapped = False
+
+    @property
+    def value(self):
+        return self.pixels[0]
+
+    def Unmap(self):
+        self.is_mapped = False
+
+
+class FakeDevice:
+    def __init__(self, desktop):
+        self.desktop = desktop
+
+
+class FakeDeviceContext:
+    def __init__(self, desktop):
+        self.desktop = desktop
+
+    def CopyResource(self, destination, source):
+        ctypes.memmove(destination.pixels, source.pixels, len(source.pixels))
+        self.desktop.copies.append(destination)
+
+
+class FakeDuplication:
+    def __init__(self, desktop):
+        self.desktop = desktop
+
+    def ReleaseFrame(self):
+        self.desktop.released_frames += 1
+
+
+class FakeDesktop:
+    # Stands in for the DXGI and Direct3D helpers of d3dshot.dll. AcquireNextFrame results are
+    # scripted: a pixel value for a new frame, None for a timeout or a COMError to raise.
+    #
+    # Only the patched desktop replaces the helpers; Other desktops act as extra outputs when
+    # passed as the 'dxgi_output' and 'dxgi_adapter' of a display
+    def __init__(self, width=64, height=48, rotation=0, name="DISPLAY1"):
+        self.width = width
+        self.height = height
+        self.rotation = rotation
+        self.name = name
+        self.format = 87
+
+        self.frames = collections.deque()
+
+        # Result of AcquireNextFrame once the script runs out
+        self.default_frame = None
+
+        self.copies = list()
+        self.staging_textures = list()
+        self.duplications = list()
+        self.released_frames = 0
+
+        # Upcoming output duplication creations that fail
+        self.failing_duplications = 0
+
+    @property
+    def resolution(self):
+        if self.rotation in (0, 180):
+            return (self.width, self.height)
+
+        return (self.height, self.width)
+
+    def patch(self, monkeypatch):
+        for name in [
+            "initialize_dxgi_output_duplication",
+            "describe_dxgi_output",
+            "acquire_dxgi_output_duplication_frame",
+            "describe_dxgi_output_duplication_frame",
+            "get_d3d11_texture_2d",
+            "get_dxgi_surface",
+            "map_dxgi_surface",
+        ]:
+            monkeypatch.setattr(d3dshot.dll.dxgi, name, getattr(self, name))
+
+        for name in [
+            "initialize_d3d_device",
+            "describe_d3d11_texture_2d",
+            "create_d3d11_texture_2d_for_cpu",
+        ]:
+            monkeypatch.setattr(d3dshot.dll.d3d, name, getattr(self, name))
+
+    def initialize_d3d_device(self, dxgi_adapter):
+        desktop = self._get_desktop(dxgi_adapter)
+
+        return FakeDevice(desktop), FakeDeviceContext(desktop)
+
+    def initialize_dxgi_output_duplication(self, dxgi_output, d3d_device):
+        desktop = self._get_desktop(dxgi_output)
+
+        if desktop.failing_duplications:
+            desktop.failing_duplications -= 1
+            raise make_com_error(d3dshot.dll.dxgi.DXGI_ERROR_SESSION_DISCONNECTED)
+
+        desktop.duplications.append(FakeDuplication(desktop))
+
+        return desktop.duplications[-1]
+
+    def describe_dxgi_output(self, dxgi_output):
+        desktop = self._get_desktop(dxgi_output)
+        width, height = desktop.resolution
+
+        return {
+            "name": desktop.name,
+            "position": {"left": 0, "top": 0, "right": width, "bottom": height},
+            "resolution": (width, height),
+            "rotation": desktop.rotation,
+            "is_attached_to_desktop": True,
+        }
+
+    def acquire_dxgi_output_duplication_frame(self, dxgi_output_duplication, timeout=0):
+        desktop = dxgi_output_duplication.desktop
+        frame = desktop.frames.popleft() if len(desktop.frames) else desktop.default_frame
+
+        if isinstance(frame, Exception):
+            raise frame
+
+        if frame is None:
+            return None
+
+        frame_information = types.SimpleNamespace(LastPresentTime=1)
+
+        return frame_information, FakeTexture(desktop.width, desktop.height, desktop.format, frame)
+
+    def describe_dxgi_output_duplication_frame(
+        self, dxgi_output_duplication, dxgi_output_duplication_frame_information
+    ):
+        return {
+            "present_time": dxgi_output_duplication_frame_information.LastPresentTime,
+            "accumulated_frames": 1,
+            "rects_coalesced": False,
+            "protected_content_masked_out": False,
+            "dirty_rects": None,
+            "move_rects": None,
+        }
+
+    def get_d3d11_texture_2d(self, dxgi_resource):
+        return dxgi_resource
+
+    def get_dxgi_surface(self, d3d11_texture_2d):
+        return d3d11_texture_2d
+
+    def map_dxgi_surface(self, dxgi_surface):
+        dxgi_surface.is_mapped = True
+
+        return ctypes.cast(dxgi_surface.pixels, ctypes.POINTER(ctypes.c_float)), dxgi_surface.pitch
+
+    def describe_d3d11_texture_2d(self, d3d11_texture_2d):
+        return d3d11_texture_2d.description
+
+    def create_d3d11_texture_2d_for_cpu(self, d3d11_texture_2d_description, d3d_device):
+        staging_textures = d3d_device.desktop.staging_textures
+
+        staging_textures.append(
+            FakeTexture(
+                d3d11_texture_2d_description.Width,
+                d3d11_texture_2d_description.Height,
+                d3d11_texture_2d_description.Format,
+            )
+        )
+
+        return staging_textures[-1]
+
+    def _get_desktop(self, dxgi_handle):
+        if isinstance(dxgi_handle, FakeDesktop):
+            return dxgi_handle
+
+        return self
+
+
+def make_com_error(hresult):
+    # COMError.hresult is signed
+    return comtypes.COMError(hresult - (1 << 32), None, None)
@@ -0,0 +1,35 @@
+import ctypes
+import sys
+import types
+
+
+def install_comtypes():
+    # d3dshot.dll only needs comtypes to declare its COM interfaces and the tests never call into
+    # COM. Without it (e.g. off Windows), a minimal stand-in is installed instead
+    try:
+        import comtypes
+    except ImportError:
+        sys.modules["comtypes"] = _make_comtypes()
+
+
+def _make_comtypes():
+    comtypes = types.ModuleType("comtypes")
+
+    class IUnknown(ctypes.Structure):
+        _fields_ = [("lpVtbl", ctypes.c_void_p)]
+
+    class COMError(Exception):
+        def __init__(self, hresult, text, details):
+            super().__init__(hresult, text, details)
+
+            self.hresult = hresult
+            self.text = text
+            self.details = details
+
+    comtypes.IUnknown = IUnknown
+    comtypes.COMError = COMError
+    comtypes.GUID = str
+    comtypes.HRESULT = ctypes.c_long
+    comtypes.STDMETHOD = lambda restype, name, argtypes=(): (restype, name, argtypes)
+
+    return comtypes
@@ -0,0 +1,136 @@
+import ctypes
+
+from d3dshot.capture_session import CaptureSession
+
+
+def read_value(pointer, pitch, size, width, height, region, rotation):
+    return ctypes.cast(pointer, ctypes.POINTER(ctypes.c_ubyte))[0]
+
+
+def make_capture_session(desktop, staging_depth=1):
+    d3d_device, d3d_device_context = desktop.initialize_d3d_device(None)
+    dxgi_output_duplication = desktop.initialize_dxgi_output_duplication(None, d3d_device)
+
+    return CaptureSession(
+        dxgi_output_duplication, d3d_device, d3d_device_context, staging_depth=staging_depth
+    )
+
+
+def capture(capture_session, desktop):
+    return capture_session.capture(
+        read_value, desktop.width, desktop.height, (0, 0, desktop.width, desktop.height), 0
+    )
+
+
+def test_staging_texture_is_created_once(desktop):
+    capture_session = make_capture_session(desktop)
+
+    desktop.frames.extend([1, 2, 3])
+    frames = [capture(capture_session, desktop) for _ in range(3)]
+
+    assert frames == [1, 2, 3]
+    assert len(desktop.staging_textures) == 1
+    assert capture_session.staging_texture_count == 1
+    assert desktop.copies == desktop.staging_textures * 3
+    assert desktop.released_frames == 3
+    assert not desktop.staging_textures[0].is_mapped
+
+
+def test_timeouts_leave_staging_texture_alone(desktop):
+    capture_session = make_capture_session(desktop)
+
+    desktop.frames.extend([1, None, None, 2])
+    frames = [capture(capture_session, desktop) for _ in range(4)]
+
+    assert frames == [1, None, None, 2]
+    assert len(desktop.staging_textures) == 1
+    assert desktop.released_frames == 2
+
+
+def test_staging_texture_is_recreated_on_resolution_change(desktop):
+    capture_session = make_capture_session(desktop)
+
+    desktop.frames.append(1)
+    capture(capture_session, desktop)
+
+    desktop.width, desktop.height = 32, 24
+    desktop.frames.append(2)
+
+    assert capture(capture_session, desktop) == 2
+    assert len(desktop.staging_textures) == 2
+    assert desktop.staging_textures[-1].description.Width == 32
+
+
+def test_staging_texture_is_recreated_on_format_change(desktop):
+    capture_session = make_capture_session(desktop)
+
+    desktop.frames.append(1)
+    capture(capture_session, desktop)
+
+    # A new display key makes the desktop image be described again
+    desktop.format = 24
+    desktop.frames.append(2)
+
+    region = (0, 0, desktop.width, desktop.height)
+
+    assert capture_session.capture(read_value, desktop.width, desktop.height, region, 180) == 2
+    assert len(desktop.staging_textures) == 2
+    assert desktop.staging_textures[-1].description.Format == 24
+
+
+def test_invalidate_drops_staging_textures(desktop):
+    capture_session = make_capture_session(desktop)
+
+    desktop.frames.extend([1, 2])
+    capture(capture_session, desktop)
+
+    capture_session.invalidate()
+
+    assert capture(capture_session, desktop) == 2
+    assert len(desktop.staging_textures) == 2
+    assert capture_session.staging_texture_count == 2
+
+
+def test_frames_rotate_through_staging_textures(desktop):
+    capture_session = make_capture_session(desktop, staging_depth=3)
+
+    desktop.frames.extend(range(1, 8))
+    frames = [capture(capture_session, desktop) for _ in range(7)]
+
+    # Frame k is read back staging_depth - 1 captures after being copied, oldest first
+    assert capture_session.latency_frames == 2
+    assert frames == [None, None, 1, 2, 3, 4, 5]
+
+    assert len(desktop.staging_textures) == 3
+    assert desktop.copies == desktop.staging_textures * 2 + desktop.staging_textures[:1]
+    assert not any(staging_texture.is_mapped for staging_texture in desktop.staging_textures)
+
+
+def test_timeouts_drain_pending_copies(desktop):
+    capture_session = make_capture_session(desktop, staging_depth=3)
+
+    desktop.frames.extend([1, 2, None, None, None, 3])
+    frames = [capture(capture_session, desktop) for _ in range(6)]
+
+    assert frames == [None, None, 1, 2, None, None]
+
+    desktop.frames.append(4)
+
+    assert capture(capture_session, desktop) is None
+    assert capture(capture_session, desktop) == 3
+    assert capture(capture_session, desktop) == 4
+
+
+def test_staging_depth_change_recreates_staging_textures(desktop):
+    capture_session = make_capture_session(desktop, staging_depth=2)
+
+    desktop.frames.extend([1, 2])
+    capture(capture_session, desktop)
+
+    # Pending copies are lost along with their staging textures
+    capture_session.set_staging_depth(3)
+
+    assert capture(capture_session, desktop) is None
+    assert len(desktop.staging_textures) == 5
+    assert capture_session.staging_texture_count == 5
+    assert capture_session.latency_frames == 2
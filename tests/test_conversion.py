@@ -0,0 +1,41 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from d3dshot.capture_outputs.numpy_capture_output import NumpyCaptureOutput
+
+from tests.fakes import FakeSurface
+
+rotations = [0, 90, 180, 270]
+regions = [None, (3, 5, 40, 29), (0, 0, 1, 1), (63, 47, 64, 48)]
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("region", regions)
+def test_numpy_matches_reference(rotation, region):
+    surface = FakeSurface(64, 48, rotation=rotation)
+
+    frame = surface.process(NumpyCaptureOutput().process, region=region)
+
+    assert frame.dtype == np.uint8
+    assert frame.flags.c_contiguous
+    assert np.array_equal(frame, surface.get_rgb(region))
+
+
+@pytest.mark.parametrize("padding", [0, 4, 64])
+def test_pitch_padding_is_skipped(padding):
+    surface = FakeSurface(64, 48, padding=padding)
+
+    frame = surface.process(NumpyCaptureOutput().process, region=(60, 0, 64, 48))
+
+    assert np.array_equal(frame, surface.get_rgb((60, 0, 64, 48)))
+
+
+def test_frames_are_written_into_out():
+    surface = FakeSurface(64, 48, rotation=90)
+    out = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    frame = surface.process(NumpyCaptureOutput().process, out=out)
+
+    assert frame is out
+    assert np.array_equal(out, surface.get_rgb())
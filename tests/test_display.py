@@ -0,0 +1,134 @@
+import ctypes
+import types
+
+import pytest
+
+import d3dshot.display
+import d3dshot.dll.dxgi
+
+from d3dshot.display import Display, DisplayAccessLostError, DisplayCaptureError
+
+from tests.fakes import make_com_error
+
+
+def read_value(pointer, pitch, size, width, height, region, rotation):
+    return ctypes.cast(pointer, ctypes.POINTER(ctypes.c_ubyte))[0]
+
+
+@pytest.fixture
+def display(desktop, clock, monkeypatch):
+    monkeypatch.setattr(
+        d3dshot.display,
+        "time",
+        types.SimpleNamespace(perf_counter=clock.perf_counter, sleep=clock.sleep),
+    )
+
+    return Display(name="DISPLAY1", resolution=desktop.resolution, rotation=desktop.rotation)
+
+
+@pytest.mark.parametrize(
+    "hresult",
+    [d3dshot.dll.dxgi.DXGI_ERROR_ACCESS_LOST, d3dshot.dll.dxgi.DXGI_ERROR_INVALID_CALL],
+)
+def test_access_lost_is_recovered(display, desktop, clock, hresult):
+    desktop.frames.extend([1, make_com_error(hresult), 2])
+
+    assert display.capture(read_value) == 1
+
+    with pytest.raises(DisplayAccessLostError):
+        display.capture(read_value)
+
+    assert display.is_degraded
+
+    clock.advance(0.25)
+
+    # The first attempt at rebuilding the duplication is made right away
+    assert display.capture(read_value) == 2
+    assert len(desktop.duplications) == 2
+    assert display.capture_session.dxgi_output_duplication is desktop.duplications[-1]
+
+    assert display.stats["reinitializations"] == 1
+    assert display.stats["failed_reinitializations"] == 0
+    assert display.stats["is_degraded"] is False
+    assert display.stats["degraded_time"] == pytest.approx(0.25, abs=1e-6)
+
+
+def test_other_errors_are_not_recovered(display, desktop):
+    desktop.frames.append(make_com_error(d3dshot.dll.dxgi.DXGI_ERROR_DEVICE_REMOVED))
+
+    with pytest.raises(DisplayCaptureError) as error_info:
+        display.capture(read_value)
+
+    assert not isinstance(error_info.value, DisplayAccessLostError)
+    assert not display.is_degraded
+    assert len(desktop.duplications) == 1
+
+
+def test_recovery_picks_up_display_mode_changes(display, desktop):
+    desktop.frames.extend([1, make_com_error(d3dshot.dll.dxgi.DXGI_ERROR_ACCESS_LOST)])
+
+    display.capture(read_value)
+    frame_number = display.frame_number
+
+    with pytest.raises(DisplayAccessLostError):
+        display.capture(read_value)
+
+    desktop.width, desktop.height, desktop.rotation = 32, 24, 90
+    desktop.frames.append(2)
+
+    assert display.capture(read_value) == 2
+    assert display.resolution == (24, 32)
+    assert display.rotation == 90
+    assert display.position["right"] == 24
+
+    # Changes missed while access was lost are unknown
+    assert display.has_changed(frame_number)
+
+
+def test_recovery_backs_off_exponentially(display, desktop, clock):
+    desktop.frames.append(make_com_error(d3dshot.dll.dxgi.DXGI_ERROR_ACCESS_LOST))
+
+    with pytest.raises(DisplayAccessLostError):
+        display.capture(read_value)
+
+    desktop.failing_duplications = 9
+    desktop.frames.append(1)
+
+    for _ in range(9):
+        with pytest.raises(DisplayAccessLostError):
+            display.capture(read_value, timeout=10)
+
+    assert display.capture(read_value, timeout=10) == 1
+
+    # Waits before the 2nd to 10th attempts, doubling from the minimum up to the maximum
+    assert clock.sleeps == pytest.approx([0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 2.0, 2.0, 2.0], abs=1e-6)
+
+    assert display.stats["reinitializations"] == 1
+    assert display.stats["failed_reinitializations"] == 9
+    assert display.stats["degraded_time"] == pytest.approx(sum(clock.sleeps), abs=1e-6)
+
+
+def test_recovery_waits_within_the_capture_timeout(display, desktop, clock):
+    desktop.frames.append(make_com_error(d3dshot.dll.dxgi.DXGI_ERROR_ACCESS_LOST))
+
+    with pytest.raises(DisplayAccessLostError):
+        display.capture(read_value)
+
+    desktop.failing_duplications = 1
+
+    with pytest.raises(DisplayAccessLostError):
+        display.capture(read_value)
+
+    # The next attempt is 50ms away: a 10ms timeout only waits out the timeout
+    with pytest.raises(DisplayAccessLostError):
+        display.capture(read_value, timeout=0.01)
+
+    assert clock.sleeps == [0.01]
+    assert display.failed_reinitializations == 1
+    assert display.is_degraded
+
+    clock.advance(0.1)
+    desktop.frames.append(1)
+
+    assert display.capture(read_value) == 1
+    assert not display.is_degraded
@@ -0,0 +1,221 @@
+import asyncio
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import d3dshot
+
+from d3dshot.capture_outputs.numpy_capture_output import NumpyCaptureOutput
+from d3dshot.d3dshot import Singleton
+from d3dshot.display import Display
+from d3dshot.frame_buffer import FrameBuffer
+from d3dshot.frame_stream import FrameStream
+
+
+def make_frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def get_value(streamed_frame):
+    return int(streamed_frame.frame[0, 0, 0])
+
+
+@pytest.fixture
+def frame_buffer():
+    return FrameBuffer(4, capture_output=NumpyCaptureOutput())
+
+
+@pytest.fixture
+def shot(desktop, monkeypatch):
+    display = Display(name="DISPLAY1", resolution=desktop.resolution, is_primary=True)
+
+    monkeypatch.setattr(Singleton, "_instances", dict())
+    monkeypatch.setattr(Display, "discover_displays", classmethod(lambda cls: [display]))
+
+    shot = d3dshot.create(capture_output="numpy", frame_buffer_size=4)
+
+    yield shot
+
+    shot.stop()
+
+
+def test_invalid_backpressure(frame_buffer):
+    with pytest.raises(AttributeError):
+        FrameStream(frame_buffer, backpressure="drop-oldest")
+
+
+def test_frames_are_streamed_once_in_order(frame_buffer):
+    frame_buffer.appendleft(make_frame(1))
+
+    # Only frames captured after subscribing are streamed
+    stream = FrameStream(frame_buffer)
+
+    for value in [2, 3, 4]:
+        frame_buffer.appendleft(make_frame(value), timestamp=value / 10)
+
+    streamed_frames = [stream.get(timeout=0) for _ in range(3)]
+
+    assert [streamed_frame.sequence for streamed_frame in streamed_frames] == [2, 3, 4]
+    assert [streamed_frame.timestamp for streamed_frame in streamed_frames] == [0.2, 0.3, 0.4]
+    assert [get_value(streamed_frame) for streamed_frame in streamed_frames] == [2, 3, 4]
+
+    # Repeats carry no new frame
+    frame_buffer.repeat_latest()
+
+    assert stream.get(timeout=0) is None
+    assert stream.dropped == 0
+
+
+def test_get_is_woken_up_by_new_frames(frame_buffer):
+    stream = FrameStream(frame_buffer)
+
+    threading.Timer(0.05, frame_buffer.appendleft, args=(make_frame(1),)).start()
+
+    assert get_value(stream.get(timeout=5)) == 1
+
+
+def test_drop_oldest_skips_evicted_frames(frame_buffer):
+    stream = FrameStream(frame_buffer, backpressure="drop_oldest")
+
+    frame_buffer.appendleft(make_frame(1))
+    held_frame = stream.get(timeout=0)
+
+    for value in range(2, 8):
+        frame_buffer.appendleft(make_frame(value))
+
+    # The frame in use is never overwritten, even once evicted
+    assert get_value(held_frame) == 1
+
+    # Evicted along with the oldest entries to make room for the newest frames
+    assert get_value(stream.get(timeout=0)) == 5
+    assert stream.dropped == 3
+    assert len(frame_buffer) == 3
+
+
+def test_drop_newest_keeps_unstreamed_frames(frame_buffer):
+    stream = FrameStream(frame_buffer, backpressure="drop_newest")
+
+    frame_buffer.appendleft(make_frame(1))
+    held_frame = stream.get(timeout=0)
+
+    for value in range(2, 8):
+        frame_buffer.appendleft(make_frame(value))
+
+    assert frame_buffer.sequence == 7
+    assert get_value(held_frame) == 1
+
+    values = [get_value(stream.get(timeout=0)) for _ in range(3)]
+
+    assert values == [2, 3, 4]
+    assert stream.dropped == 0
+
+    frame_buffer.appendleft(make_frame(8))
+
+    assert get_value(stream.get(timeout=0)) == 8
+    assert stream.dropped == 3
+
+
+def test_block_holds_the_producer_back(frame_buffer):
+    stream = FrameStream(frame_buffer, backpressure="block")
+
+    producer = threading.Thread(
+        target=lambda: [frame_buffer.appendleft(make_frame(value)) for value in range(1, 11)]
+    )
+    producer.start()
+
+    streamed_frames = list()
+
+    for _ in range(10):
+        streamed_frame = stream.get(timeout=5)
+
+        # Producers wait for the frame to be released before overwriting it
+        assert get_value(streamed_frame) == streamed_frame.sequence
+
+        streamed_frames.append(streamed_frame.sequence)
+
+        if len(streamed_frames) == 1:
+            producer.join(timeout=0.1)
+
+            assert producer.is_alive()
+            assert len(frame_buffer) == 4
+
+    producer.join(timeout=5)
+
+    assert streamed_frames == list(range(1, 11))
+    assert stream.dropped == 0
+
+
+def test_inactive_block_stream_drops_new_frames(frame_buffer):
+    is_active = threading.Event()
+    is_active.set()
+
+    stream = FrameStream(frame_buffer, backpressure="block", is_active=is_active.is_set)
+
+    frame_buffer.appendleft(make_frame(1))
+    stream.get(timeout=0)
+
+    is_active.clear()
+
+    for value in range(2, 8):
+        frame_buffer.appendleft(make_frame(value))
+
+    assert frame_buffer.sequence == 7
+
+    # Drained, then done
+    assert [stream.get().sequence for _ in range(3)] == [2, 3, 4]
+    assert stream.get() is None
+
+
+def test_closed_streams_hold_nothing_back(frame_buffer):
+    stream = FrameStream(frame_buffer, backpressure="block")
+
+    frame_buffer.appendleft(make_frame(1))
+    stream.get(timeout=0)
+
+    stream.close()
+
+    for value in range(2, 8):
+        frame_buffer.appendleft(make_frame(value))
+
+    assert frame_buffer[0][0, 0, 0] == 7
+    assert stream.get(timeout=0) is None
+
+
+def test_frames_yields_every_captured_frame(shot, desktop):
+    desktop.frames.extend(range(1, 21))
+
+    frames = shot.frames(backpressure="block", timeout=5)
+    shot.capture(target_fps=1000)
+
+    values = list()
+
+    for streamed_frame in frames:
+        values.append(int(streamed_frame.frame[0, 0, 0]))
+
+        if len(values) == 20:
+            shot.stop()
+
+    assert values == list(range(1, 21))
+
+
+def test_aframes_yields_every_captured_frame(shot, desktop):
+    desktop.frames.extend(range(1, 21))
+
+    frames = shot.aframes(backpressure="block", timeout=5)
+
+    async def stream_frames():
+        values = list()
+
+        async for streamed_frame in frames:
+            values.append(int(streamed_frame.frame[0, 0, 0]))
+
+            if len(values) == 20:
+                break
+
+        return values
+
+    shot.capture(target_fps=1000)
+
+    assert asyncio.run(stream_frames()) == list(range(1, 21))
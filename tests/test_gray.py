@@ -0,0 +1,93 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from d3dshot.capture_outputs.numpy_gray_capture_output import NumpyGrayCaptureOutput
+from d3dshot.resize import Resize
+
+from tests.fakes import FakeSurface
+
+rotations = [0, 90, 180, 270]
+regions = [None, (3, 5, 40, 29)]
+
+
+def get_reference_luma(surface, region, dtype):
+    left, top, right, bottom = region or (0, 0, surface.width, surface.height)
+    image = surface.image[top:bottom, left:right].astype(np.uint32)
+
+    # ITU-R 601-2 weights in 1/256ths, applied to the B, G and R channels
+    luma = 29 * image[..., 0] + 150 * image[..., 1] + 77 * image[..., 2]
+
+    if dtype == "uint8":
+        return ((luma + 128) // 256).astype(np.uint8)
+
+    return (luma / (256 * 255)).astype(np.float32)
+
+
+def assert_luma_equal(frame, reference):
+    assert frame.dtype == reference.dtype
+    assert frame.shape == reference.shape
+
+    if reference.dtype == np.uint8:
+        assert np.array_equal(frame, reference)
+    else:
+        assert np.allclose(frame, reference, rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("region", regions)
+@pytest.mark.parametrize("dtype", ["uint8", "float32"])
+def test_numpy_gray_matches_reference(rotation, region, dtype):
+    surface = FakeSurface(64, 48, rotation=rotation)
+
+    frame = surface.process(NumpyGrayCaptureOutput(dtype=dtype).process, region=region)
+
+    assert_luma_equal(frame, get_reference_luma(surface, region, dtype))
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("region", regions)
+@pytest.mark.parametrize("dtype", ["uint8", "float32"])
+def test_pytorch_gray_matches_reference(rotation, region, dtype):
+    pytorch_gray_capture_output = pytest.importorskip(
+        "d3dshot.capture_outputs.pytorch_gray_capture_output"
+    )
+
+    surface = FakeSurface(64, 48, rotation=rotation)
+
+    frame = surface.process(
+        pytorch_gray_capture_output.PytorchGrayCaptureOutput(dtype=dtype).process, region=region
+    )
+
+    assert_luma_equal(frame.numpy(), get_reference_luma(surface, region, dtype))
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("region", regions)
+def test_pil_gray_matches_reference(rotation, region):
+    pil_gray_capture_output = pytest.importorskip(
+        "d3dshot.capture_outputs.pil_gray_capture_output"
+    )
+
+    surface = FakeSurface(64, 48, rotation=rotation)
+
+    image = surface.process(pil_gray_capture_output.PILGrayCaptureOutput().process, region=region)
+
+    assert image.mode == "L"
+    assert_luma_equal(np.asarray(image), get_reference_luma(surface, region, "uint8"))
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("method", Resize.methods)
+def test_resized_gray_frames_match_across_capture_outputs(rotation, method):
+    pil_gray_capture_output = pytest.importorskip(
+        "d3dshot.capture_outputs.pil_gray_capture_output"
+    )
+
+    surface = FakeSurface(64, 48, rotation=rotation)
+    resize = Resize(size=(24, 18), method=method)
+
+    frame = surface.process(NumpyGrayCaptureOutput(resize=resize).process)
+    image = surface.process(pil_gray_capture_output.PILGrayCaptureOutput(resize=resize).process)
+
+    assert np.array_equal(np.asarray(image), frame)
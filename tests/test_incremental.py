@@ -0,0 +1,135 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from d3dshot.frame_metadata import FrameMetadata
+from d3dshot.incremental import IncrementalFrame, apply_move_rects
+
+from tests.fakes import FakeSurface
+
+rotations = [0, 90, 180, 270]
+
+# Surface coordinates; Valid in every orientation of a 64x48 display
+updates = [
+    dict(dirty_rects=[(0, 0, 10, 10), (20, 5, 30, 40)], move_rects=[]),
+    # Source and destination overlap
+    dict(dirty_rects=[(40, 40, 48, 48)], move_rects=[((0, 0), (5, 5, 25, 25))]),
+    dict(dirty_rects=[], move_rects=[((10, 10), (12, 10, 42, 30)), ((30, 0), (28, 2, 46, 20))]),
+    # Content moved in from the display edge
+    dict(dirty_rects=[(2, 30, 8, 36)], move_rects=[((0, 20), (3, 20, 43, 47))]),
+    dict(dirty_rects=[], move_rects=[]),
+]
+
+
+def apply_update(surface, dirty_rects, move_rects, random_state):
+    image = surface.surface_image
+
+    # Blits first, in order, then repaints
+    for (x, y), (left, top, right, bottom) in move_rects:
+        image[top:bottom, left:right] = image[y : y + bottom - top, x : x + right - left].copy()
+
+    for left, top, right, bottom in dirty_rects:
+        image[top:bottom, left:right] = random_state.randint(
+            0, 256, (bottom - top, right - left, 4), dtype=np.uint8
+        )
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("region", [(0, 0, 64, 48), (6, 4, 50, 40)])
+def test_updates_match_full_conversions(rotation, region):
+    surface = FakeSurface(64, 48, rotation=rotation)
+    random_state = np.random.RandomState(1)
+
+    frame_metadata = FrameMetadata(frame_number=1)
+    incremental_frame = IncrementalFrame(lambda: frame_metadata)
+
+    frame = surface.process(incremental_frame.process, region=region)
+
+    assert np.array_equal(frame, surface.get_rgb(region))
+
+    for frame_number, update in enumerate(updates, 2):
+        apply_update(surface, random_state=random_state, **update)
+        frame_metadata = FrameMetadata(frame_number=frame_number, **update)
+
+        out = np.zeros_like(frame)
+        frame = surface.process(incremental_frame.process, region=region, out=out)
+
+        assert frame is out
+        assert np.array_equal(frame, surface.get_rgb(region))
+
+    assert incremental_frame.full_updates == 1
+    assert incremental_frame.incremental_updates == len(updates)
+
+
+def test_unknown_changes_trigger_full_updates():
+    surface = FakeSurface(64, 48)
+    random_state = np.random.RandomState(1)
+
+    frame_metadata = FrameMetadata(frame_number=1)
+    incremental_frame = IncrementalFrame(lambda: frame_metadata)
+
+    surface.process(incremental_frame.process)
+
+    # A frame was skipped, then changes are unknown
+    apply_update(surface, [(0, 0, 10, 10)], [], random_state)
+    frame_metadata = FrameMetadata(frame_number=3, dirty_rects=[], move_rects=[])
+
+    assert np.array_equal(surface.process(incremental_frame.process), surface.get_rgb())
+
+    apply_update(surface, [(5, 5, 20, 20)], [], random_state)
+    frame_metadata = FrameMetadata(frame_number=4)
+
+    assert np.array_equal(surface.process(incremental_frame.process), surface.get_rgb())
+
+    # The region changed
+    frame_metadata = FrameMetadata(frame_number=5, dirty_rects=[], move_rects=[])
+    region = (1, 1, 9, 9)
+
+    frame = surface.process(incremental_frame.process, region=region)
+
+    assert np.array_equal(frame, surface.get_rgb(region))
+
+    assert incremental_frame.full_updates == 4
+    assert incremental_frame.incremental_updates == 0
+
+
+@pytest.mark.parametrize("rotation", rotations)
+def test_apply_move_rects_blits_in_place(rotation):
+    surface = FakeSurface(64, 48, rotation=rotation)
+    move_rects = [((0, 0), (5, 5, 25, 25)), ((25, 20), (20, 22, 40, 42))]
+
+    frame = np.array(surface.get_rgb())
+
+    apply_update(surface, [], move_rects, None)
+    apply_move_rects(frame, move_rects, 64, 48, (0, 0, 64, 48), rotation)
+
+    assert np.array_equal(frame, surface.get_rgb())
+
+
+def test_apply_move_rects_falls_back_outside_of_the_region():
+    region = (10, 10, 30, 30)
+    frame = np.arange(20 * 20 * 3, dtype=np.int32).reshape((20, 20, 3))
+
+    expected = frame.copy()
+    expected[10:18, 10:18] = frame[5:13, 5:13]
+
+    refreshed_rects = list()
+
+    apply_move_rects(
+        frame,
+        [
+            # Content moved in from outside of the region is refreshed instead
+            ((0, 0), (12, 12, 22, 22)),
+            ((15, 15), (20, 20, 28, 28)),
+            # Not in the region
+            ((0, 0), (40, 40, 50, 50)),
+        ],
+        64,
+        48,
+        region,
+        0,
+        fallback_func=refreshed_rects.append,
+    )
+
+    assert refreshed_rects == [(12, 12, 22, 22)]
+    assert np.array_equal(frame, expected)
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from d3dshot.frame_buffer import FrameBuffer
+from d3dshot.pipeline import ConversionPipeline, RawFrame
+
+
+class FakeCaptureOutput:
+    # Frames are the width of their raw frame. Conversions finish out of order
+    def __init__(self, failing_width=None):
+        self.failing_width = failing_width
+
+    def process(self, pointer, pitch, size, width, height, region, rotation, out=None):
+        time.sleep(0.001 * (width % 3))
+
+        if width == self.failing_width:
+            raise ValueError(f"Failed to convert frame {width}")
+
+        return width
+
+
+def make_raw_frame(width):
+    return RawFrame(None, 0, 0, 0, width, 1, (0, 0, width, 1), 0)
+
+
+def test_frames_are_published_in_order():
+    frame_buffer = FrameBuffer(20)
+
+    pipeline = ConversionPipeline(FakeCaptureOutput(), frame_buffer, workers=3)
+    pipeline.start()
+
+    for width in range(1, 11):
+        pipeline.submit(make_raw_frame(width), timestamp=width)
+
+    pipeline.stop()
+
+    assert list(frame_buffer) == list(range(10, 0, -1))
+    assert [frame_buffer.get_timestamp(i) for i in range(10)] == list(range(10, 0, -1))
+    assert pipeline.failed == 0
+
+
+def test_conversion_errors_are_raised_on_submit():
+    pipeline = ConversionPipeline(FakeCaptureOutput(failing_width=2), FrameBuffer(20), workers=1)
+    pipeline.start()
+
+    pipeline.submit(make_raw_frame(2))
+
+    deadline = time.perf_counter() + 5
+
+    while not pipeline.failed and time.perf_counter() < deadline:
+        time.sleep(0.001)
+
+    with pytest.raises(ValueError):
+        pipeline.submit(make_raw_frame(3))
+
+    pipeline.stop()
+
+    assert pipeline.failed == 1
+
+
+def test_conversion_errors_are_raised_on_stop():
+    frame_buffer = FrameBuffer(20)
+
+    pipeline = ConversionPipeline(FakeCaptureOutput(failing_width=5), frame_buffer, workers=2)
+    pipeline.start()
+
+    for width in range(1, 6):
+        pipeline.submit(make_raw_frame(width))
+
+    with pytest.raises(ValueError):
+        pipeline.stop()
+
+    assert pipeline.failed == 1
+    assert list(frame_buffer)[0] == 4
+
+
+def test_frames_missed_while_access_is_lost_are_not_current():
+    frame_buffer = FrameBuffer(20)
+
+    pipeline = ConversionPipeline(FakeCaptureOutput(), frame_buffer, workers=2)
+    pipeline.start()
+
+    pipeline.submit(make_raw_frame(1), timestamp=1)
+    pipeline.submit(None, timestamp=2, is_current=False)
+
+    pipeline.stop()
+
+    # The frame is repeated in sequence, still only known to be current when it was acquired
+    assert list(frame_buffer) == [1, 1]
+    assert frame_buffer.get_valid_until(0) == 1
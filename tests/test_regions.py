@@ -0,0 +1,102 @@
+import functools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import d3dshot
+
+from d3dshot.capture_output import CaptureOutput, CaptureOutputs
+from d3dshot.d3dshot import Singleton
+from d3dshot.display import Display
+from d3dshot.surface import get_bounding_rect
+
+from tests.fakes import FakeSurface
+
+rotations = [0, 90, 180, 270]
+
+# The last two regions are partly and fully outside of the 64 x 48 display
+regions = [(0, 0, 10, 10), (20, 5, 50, 30), (3, 3, 4, 4), (60, 40, 80, 60), (70, 50, 90, 60)]
+
+
+@pytest.fixture
+def shot(desktop, monkeypatch):
+    display = Display(name="DISPLAY1", resolution=desktop.resolution, is_primary=True)
+
+    monkeypatch.setattr(Singleton, "_instances", dict())
+    monkeypatch.setattr(Display, "discover_displays", classmethod(lambda cls: [display]))
+
+    shot = d3dshot.create(capture_output="numpy", frame_buffer_size=4)
+
+    yield shot
+
+    shot.stop()
+
+
+@pytest.mark.parametrize("rotation", rotations)
+def test_regions_match_reference_crops(rotation):
+    surface = FakeSurface(64, 48, rotation=rotation, padding=20)
+    capture_output = CaptureOutput(backend=CaptureOutputs.NUMPY)
+
+    frames = surface.process(functools.partial(capture_output.process_regions, regions))
+
+    assert list(frames) == regions
+
+    for region in regions[:3]:
+        assert np.array_equal(frames[region], surface.get_rgb(region))
+
+    # Regions are clipped to the display
+    assert np.array_equal(frames[regions[3]], surface.get_rgb((60, 40, 64, 48)))
+    assert frames[regions[4]] is None
+
+
+def test_regions_are_written_into_out():
+    surface = FakeSurface(64, 48, rotation=90)
+    capture_output = CaptureOutput(backend=CaptureOutputs.NUMPY)
+
+    out = {
+        region: np.zeros((region[3] - region[1], region[2] - region[0], 3), dtype=np.uint8)
+        for region in regions[:3]
+    }
+
+    frames = surface.process(
+        functools.partial(capture_output.process_regions, regions[:3]), out=out
+    )
+
+    assert frames is out
+
+    for region in regions[:3]:
+        assert np.array_equal(out[region], surface.get_rgb(region))
+
+
+def test_screenshot_of_regions(shot, desktop):
+    desktop.frames.append(7)
+
+    frames = shot.screenshot(regions=regions)
+
+    assert list(frames) == regions
+
+    for region in regions[:3]:
+        assert frames[region].shape == (region[3] - region[1], region[2] - region[0], 3)
+        assert np.all(frames[region] == 7)
+
+    assert frames[regions[3]].shape == (8, 4, 3)
+    assert frames[regions[4]] is None
+
+
+def test_frame_stacks_of_regions(shot, desktop):
+    desktop.frames.extend([1, 2, 3])
+
+    for _ in range(3):
+        shot._capture_frame(get_bounding_rect(regions[:3]), False, regions=regions[:3])
+
+    # Frames of every region are kept in 1 preallocated storage per region
+    assert isinstance(shot.frame_buffer.storage, dict)
+
+    stacks = shot.get_frame_stack([0, 1, 2], stack_dimension="first")
+
+    assert list(stacks) == regions[:3]
+
+    for region in regions[:3]:
+        assert stacks[region].shape == (3, region[3] - region[1], region[2] - region[0], 3)
+        assert [int(frame[0, 0, 0]) for frame in stacks[region]] == [3, 2, 1]
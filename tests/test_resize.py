@@ -0,0 +1,97 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from d3dshot.capture_outputs.numpy_capture_output import NumpyCaptureOutput
+from d3dshot.resize import Resize
+
+from tests.fakes import FakeSurface
+
+rotations = [0, 90, 180, 270]
+region = (2, 3, 62, 47)
+
+# Integer factors, non-integer factors and an upscale of the 60 x 44 region
+resize_arguments = [{"scale": 0.5}, {"scale": 0.25}, {"size": (24, 18)}, {"scale": 1.5}]
+
+
+def get_nearest_reference(image, size):
+    width, height = size
+
+    rows = np.floor((np.arange(height) + 0.5) * image.shape[0] / height).astype(int)
+    columns = np.floor((np.arange(width) + 0.5) * image.shape[1] / width).astype(int)
+
+    return image[rows[:, None], columns]
+
+
+def get_area_reference(image, factor):
+    height, width = image.shape[0] // factor, image.shape[1] // factor
+    boxes = image.reshape(height, factor, width, factor, 3).astype(int)
+
+    count = factor * factor
+
+    return ((boxes.sum(axis=(1, 3)) + count // 2) // count).astype(np.uint8)
+
+
+def resize_frame(capture_output_class, surface, resize):
+    return np.asarray(surface.process(capture_output_class(resize=resize).process, region=region))
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("arguments", resize_arguments)
+def test_nearest_matches_reference(rotation, arguments):
+    surface = FakeSurface(64, 48, rotation=rotation, padding=12)
+    resize = Resize(method="nearest", **arguments)
+
+    frame = resize_frame(NumpyCaptureOutput, surface, resize)
+    size = resize.get_size(region[2] - region[0], region[3] - region[1])
+
+    assert np.array_equal(frame, get_nearest_reference(surface.get_rgb(region), size))
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("scale", [0.5, 0.25])
+def test_integer_factor_area_matches_reference(rotation, scale):
+    surface = FakeSurface(64, 48, rotation=rotation, padding=12)
+
+    frame = resize_frame(NumpyCaptureOutput, surface, Resize(scale=scale, method="area"))
+
+    assert np.array_equal(frame, get_area_reference(surface.get_rgb(region), int(1 / scale)))
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("method", Resize.methods)
+@pytest.mark.parametrize("arguments", resize_arguments)
+def test_pil_matches_numpy(rotation, method, arguments):
+    pil_capture_output = pytest.importorskip("d3dshot.capture_outputs.pil_capture_output")
+
+    surface = FakeSurface(64, 48, rotation=rotation, padding=12)
+    resize = Resize(method=method, **arguments)
+
+    frame = resize_frame(NumpyCaptureOutput, surface, resize)
+    pil_frame = resize_frame(pil_capture_output.PILCaptureOutput, surface, resize)
+
+    assert pil_frame.shape == frame.shape
+
+    # Non-integer area factors are box filtered differently by PIL; Only their shape matches
+    differences = np.abs(pil_frame.astype(int) - frame)
+
+    if method == "bilinear":
+        assert differences.max() <= 1
+    elif method == "nearest" or arguments.get("scale", 1) < 1:
+        assert differences.max() == 0
+
+
+@pytest.mark.parametrize("rotation", rotations)
+@pytest.mark.parametrize("method", Resize.methods)
+def test_pytorch_matches_numpy(rotation, method):
+    pytorch_capture_output = pytest.importorskip("d3dshot.capture_outputs.pytorch_capture_output")
+
+    surface = FakeSurface(64, 48, rotation=rotation, padding=12)
+    resize = Resize(size=(24, 18), method=method)
+
+    frame = resize_frame(NumpyCaptureOutput, surface, resize)
+    pytorch_frame = surface.process(
+        pytorch_capture_output.PytorchCaptureOutput(resize=resize).process, region=region
+    )
+
+    assert np.array_equal(pytorch_frame.numpy(), frame)
@@ -0,0 +1,133 @@
+import pytest
+
+from d3dshot.scheduler import FrameScheduler
+
+from tests.fakes import FakeClock
+
+
+def make_scheduler(clock, interval=0.01, **kwargs):
+    return FrameScheduler(interval, clock=clock.perf_counter_ns, sleep=clock.sleep, **kwargs)
+
+
+def test_invalid_overrun_policy():
+    with pytest.raises(AttributeError):
+        FrameScheduler(0.01, overrun_policy="drop")
+
+
+def test_deadlines_are_absolute(clock):
+    scheduler = make_scheduler(clock, spin_duration=0)
+    scheduler.start()
+
+    start_time = clock.now
+
+    # Uneven capture durations never shift the schedule
+    for i in range(1, 101):
+        clock.advance(0.001 if i % 2 else 0.009)
+        scheduler.wait()
+
+        assert abs(clock.now - (start_time + i * 10_000_000)) < 1000
+
+    assert scheduler.missed_deadlines == 0
+    assert scheduler.skipped_frames == 0
+    assert scheduler.frame_count == 100
+    assert scheduler.fps == pytest.approx(100, rel=1e-3)
+
+
+def test_shared_start_time(clock):
+    schedulers = [make_scheduler(clock, spin_duration=0) for _ in range(2)]
+
+    for scheduler in schedulers:
+        scheduler.start(start_time=0)
+
+    clock.advance(0.003)
+    schedulers[0].wait()
+
+    woken_at = clock.now
+
+    # The second scheduler's deadline already passed, at the same time
+    schedulers[1].wait()
+
+    assert abs(woken_at - 10_000_000) < 1000
+    assert schedulers[1].missed_deadlines == 1
+    assert schedulers[1].stats["jitter_p50_ms"] < 0.001
+
+
+def test_skip_resumes_on_original_grid(clock):
+    scheduler = make_scheduler(clock, spin_duration=0)
+    scheduler.start(start_time=0)
+
+    clock.advance(0.035)
+    scheduler.wait()
+
+    assert scheduler.missed_deadlines == 1
+    assert scheduler.skipped_frames == 2
+
+    scheduler.wait()
+
+    assert abs(clock.now - 40_000_000) < 1000
+    assert scheduler.missed_deadlines == 1
+
+
+def test_catch_up_runs_due_frames_back_to_back(clock):
+    scheduler = make_scheduler(clock, overrun_policy="catch_up", spin_duration=0)
+    scheduler.start(start_time=0)
+
+    clock.advance(0.035)
+    scheduler.wait()
+
+    # Deadlines at 20 and 30 ms are due and run without sleeping
+    sleeps = len(clock.sleeps)
+
+    scheduler.wait()
+    scheduler.wait()
+
+    assert len(clock.sleeps) == sleeps
+    assert scheduler.missed_deadlines == 3
+    assert scheduler.skipped_frames == 0
+
+    scheduler.wait()
+
+    assert abs(clock.now - 40_000_000) < 1000
+    assert scheduler.frame_count == 4
+
+
+def test_catch_up_limit_falls_back_to_skip(clock):
+    scheduler = make_scheduler(clock, overrun_policy="catch_up", catch_up_limit=2, spin_duration=0)
+    scheduler.start(start_time=0)
+
+    clock.advance(0.055)
+    scheduler.wait()
+
+    assert scheduler.skipped_frames == 4
+
+    scheduler.wait()
+
+    assert abs(clock.now - 60_000_000) < 1000
+
+
+def test_spins_through_the_end_of_the_interval(clock):
+    scheduler = make_scheduler(clock, spin_duration=0.002)
+    scheduler.start(start_time=0)
+
+    scheduler.wait()
+
+    assert clock.sleeps[0] == pytest.approx(0.008, abs=1e-6)
+    assert 10_000_000 <= clock.now < 10_001_000
+
+
+def test_sleeps_shorten_to_absorb_oversleeping():
+    clock = FakeClock(oversleep=0.001)
+
+    scheduler = make_scheduler(clock, spin_duration=0)
+    scheduler.start(start_time=0)
+
+    lateness = list()
+
+    for i in range(1, 201):
+        scheduler.wait()
+        lateness.append(clock.now - i * 10_000_000)
+
+    assert clock.sleeps[-1] < clock.sleeps[0]
+    assert lateness[-1] < lateness[0] / 10
+    assert scheduler.missed_deadlines == 0
+    assert scheduler.stats["jitter_p50_ms"] < 0.1
@@ -0,0 +1,194 @@
+import time
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import d3dshot
+import d3dshot.capture_session
+import d3dshot.display
+import d3dshot.dll.dxgi
+import d3dshot.frame_buffer
+
+from d3dshot.d3dshot import Singleton
+from d3dshot.display import Display
+
+from tests.fakes import FakeDesktop, make_com_error
+
+INTERVAL = 0.01
+
+
+def get_values(frames):
+    return [int(frame[0, 0, 0]) for frame in frames]
+
+
+@pytest.fixture
+def desktops(desktop):
+    return [desktop, FakeDesktop(name="DISPLAY2"), FakeDesktop(name="DISPLAY3")]
+
+
+@pytest.fixture
+def shot(desktops, monkeypatch):
+    displays = list()
+
+    for i, desktop in enumerate(desktops):
+        width, height = desktop.resolution
+
+        displays.append(
+            Display(
+                name=desktop.name,
+                resolution=desktop.resolution,
+                position={"left": i * width, "top": 0, "right": (i + 1) * width, "bottom": height},
+                is_primary=i == 0,
+                dxgi_output=desktop,
+                dxgi_adapter=desktop,
+            )
+        )
+
+    monkeypatch.setattr(Singleton, "_instances", dict())
+    monkeypatch.setattr(Display, "discover_displays", classmethod(lambda cls: displays))
+
+    shot = d3dshot.create(capture_output="numpy", frame_buffer_size=4)
+
+    yield shot
+
+    shot.stop()
+
+
+@pytest.fixture
+def stepped_shot(shot, clock, monkeypatch):
+    # Display workers are stepped by hand, one tick of the shared deadlines at a time
+    fake_time = types.SimpleNamespace(perf_counter=clock.perf_counter, sleep=clock.sleep)
+
+    for module in [d3dshot.capture_session, d3dshot.display, d3dshot.frame_buffer]:
+        monkeypatch.setattr(module, "time", fake_time)
+
+    shot.display_workers = shot._create_display_workers(shot.displays, None, 0, 100, "skip")
+
+    return shot
+
+
+def tick(shot, clock, display_workers=None):
+    for display_worker in display_workers or shot.display_workers:
+        display_worker.capture()
+
+    clock.advance(INTERVAL)
+
+
+def test_static_displays_stay_current_until_their_latest_capture(stepped_shot, desktops, clock):
+    desktops[0].frames.extend([1, 2, 3])
+    desktops[1].frames.append(10)
+    desktops[2].default_frame = 20
+
+    for _ in range(3):
+        tick(stepped_shot, clock)
+
+    frame_buffers = stepped_shot.frame_buffers
+
+    # The second display only timed out after its first frame
+    assert frame_buffers[1].get_timestamp(0) == pytest.approx(0, abs=1e-6)
+    assert frame_buffers[1].get_valid_until(0) == pytest.approx(2 * INTERVAL, abs=1e-6)
+
+    frames = stepped_shot.get_synchronized_frames(max_skew=0.001)
+
+    assert get_values(frames) == [3, 10, 20]
+
+
+def test_frames_further_apart_than_max_skew_are_rejected(stepped_shot, desktops, clock):
+    desktops[0].default_frame = 1
+    desktops[1].frames.append(10)
+    desktops[2].default_frame = 20
+
+    tick(stepped_shot, clock)
+
+    # The second display falls behind while the others fill their frame buffers
+    display_workers = [stepped_shot.display_workers[0], stepped_shot.display_workers[2]]
+
+    for _ in range(5):
+        tick(stepped_shot, clock, display_workers=display_workers)
+
+    assert stepped_shot.get_synchronized_frames(max_skew=INTERVAL) is None
+
+    # Closest frames are still returned without a skew limit
+    assert get_values(stepped_shot.get_synchronized_frames()) == [1, 10, 20]
+
+
+def test_access_lost_displays_are_not_current(stepped_shot, desktops, clock):
+    desktops[0].default_frame = 1
+    desktops[1].frames.extend([10, make_com_error(d3dshot.dll.dxgi.DXGI_ERROR_ACCESS_LOST)])
+    desktops[1].failing_duplications = 100
+    desktops[2].default_frame = 20
+
+    for _ in range(6):
+        tick(stepped_shot, clock)
+
+    assert stepped_shot.displays[1].is_degraded
+
+    # The latest frame of the second display is repeated but only known to be current when it was
+    # acquired
+    assert stepped_shot.frame_buffers[1].get_valid_until(0) == pytest.approx(0, abs=1e-6)
+    assert stepped_shot.get_synchronized_frames(max_skew=INTERVAL) is None
+
+
+def test_no_frames_until_every_display_has_one(stepped_shot, desktops, clock):
+    desktops[0].default_frame = 1
+    desktops[2].default_frame = 20
+
+    for _ in range(3):
+        tick(stepped_shot, clock)
+
+    assert stepped_shot.get_synchronized_frames() is None
+
+    desktops[1].frames.append(10)
+    tick(stepped_shot, clock)
+
+    assert get_values(stepped_shot.get_synchronized_frames(max_skew=0.001)) == [1, 10, 20]
+
+
+def test_display_workers_tick_on_shared_deadlines(shot, desktops):
+    for i, desktop in enumerate(desktops):
+        desktop.default_frame = i + 1
+
+    shot.capture(target_fps=100, displays=shot.displays)
+
+    deadline = time.perf_counter() + 5
+
+    while not all(len(frame_buffer) for frame_buffer in shot.frame_buffers):
+        assert time.perf_counter() < deadline
+        time.sleep(0.01)
+
+    start_times = [display_worker.scheduler._start_time for display_worker in shot.display_workers]
+
+    assert len(set(start_times)) == 1
+    assert start_times[0] == shot.scheduler._start_time
+
+    assert get_values(shot.get_synchronized_frames()) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("is_access_lost", [False, True])
+def test_repeats_of_access_lost_displays_are_not_current(
+    stepped_shot, desktop, clock, is_access_lost
+):
+    # Single display capture, without display workers
+    stepped_shot.display_workers = list()
+    region = stepped_shot._validate_region(None)
+
+    desktop.frames.append(1)
+
+    if is_access_lost:
+        desktop.frames.append(make_com_error(d3dshot.dll.dxgi.DXGI_ERROR_ACCESS_LOST))
+        desktop.failing_duplications = 100
+
+    for _ in range(4):
+        stepped_shot._capture_frame(region, False)
+        clock.advance(INTERVAL)
+
+    assert stepped_shot.display.is_degraded is is_access_lost
+
+    valid_until = stepped_shot.frame_buffer.get_valid_until(0)
+
+    if is_access_lost:
+        assert valid_until == pytest.approx(0, abs=1e-6)
+    else:
+        assert valid_until == pytest.approx(3 * INTERVAL, abs=1e-6)
@@ -0,0 +1,85 @@
+import ctypes
+
+import pytest
+
+torch = pytest.importorskip("torch")
+np = pytest.importorskip("numpy")
+
+from d3dshot.capture_outputs.numpy_capture_output import NumpyCaptureOutput
+from d3dshot.capture_outputs.pytorch_gpu_capture_output import PytorchGPUCaptureOutput
+from d3dshot.resize import Resize
+from d3dshot.upload import PinnedUploader
+
+
+def make_bytes(size, value):
+    return (ctypes.c_ubyte * size)(*([value] * size))
+
+
+def test_cpu_uploads_are_synchronous_copies():
+    uploader = PinnedUploader("cpu")
+
+    assert not uploader.is_async
+    assert uploader.stream is None
+
+    source = make_bytes(64, 1)
+    uploaded = uploader.upload(ctypes.addressof(source), 48)
+
+    assert uploaded.device.type == "cpu"
+    assert uploaded.dtype == torch.uint8
+    assert uploaded.tolist() == [1] * 48
+
+    # Neither the source nor the reused staging buffers back the uploaded frame
+    ctypes.memset(source, 2, 64)
+
+    for _ in range(uploader.pool_size):
+        uploader.upload(ctypes.addressof(source), 48)
+
+    assert uploaded.tolist() == [1] * 48
+
+
+def test_staging_buffers_are_reused_in_turn():
+    uploader = PinnedUploader("cpu", pool_size=2)
+    source = make_bytes(128, 3)
+
+    for _ in range(5):
+        uploader.upload(ctypes.addressof(source), 64)
+
+    assert uploader.stats == {"uploads": 5, "allocations": 2}
+
+    # Smaller uploads fit in the existing buffers; Larger ones grow the buffer in turn
+    uploader.upload(ctypes.addressof(source), 32)
+    uploader.upload(ctypes.addressof(source), 128)
+
+    assert uploader.stats == {"uploads": 7, "allocations": 3}
+    assert [buffer.numel() for buffer in uploader.buffers] == [128, 64]
+
+
+def test_upload_tensor_keeps_dtype_and_shape():
+    uploader = PinnedUploader("cpu")
+    tensor = torch.arange(24, dtype=torch.float32).view(2, 3, 4).transpose(0, 1)
+
+    uploaded = uploader.upload_tensor(tensor)
+
+    assert uploaded.dtype == torch.float32
+    assert uploaded.shape == tensor.shape
+    assert torch.equal(uploaded, tensor)
+
+
+@pytest.mark.parametrize("rotation", [0, 90, 180, 270])
+@pytest.mark.parametrize("resize", [None, Resize(scale=0.5)])
+def test_gpu_capture_output_on_cpu_matches_numpy(rotation, resize):
+    width, height = (64, 48) if rotation in (0, 180) else (48, 64)
+    surface_width, surface_height = 64, 48
+    pitch = surface_width * 4 + 16
+
+    pixels = np.random.RandomState(0).randint(0, 256, (surface_height, pitch), dtype=np.uint8)
+    pointer = ctypes.cast(pixels.ctypes.data, ctypes.POINTER(ctypes.c_float))
+
+    region = (4, 2, 36, 30)
+    arguments = (pointer, pitch, pixels.size, width, height, region, rotation)
+
+    expected = NumpyCaptureOutput(resize=resize).process(*arguments)
+    frame = PytorchGPUCaptureOutput(resize=resize, device="cpu").process(*arguments)
+
+    assert frame.dtype == torch.uint8
+    assert np.array_equal(frame.numpy(), expected)